@@ -0,0 +1,51 @@
+# benchmarks/bench_address_search.py
+"""Бенчмарк триграммного поиска по адресу.
+
+Запуск: python -m benchmarks.bench_address_search --size 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+from rental_service.indexes import AddressIndex
+from benchmarks.datagen import make_properties
+
+
+def run(size: int, queries: int = 1000, limit: int = 20) -> dict:
+    index = AddressIndex()
+    started = time.perf_counter()
+    properties = []
+    for prop in make_properties(size):
+        index.add(prop)
+        properties.append(prop)
+    build_seconds = time.perf_counter() - started
+
+    rnd = random.Random(7)
+    samples = []
+    for _ in range(queries):
+        address = rnd.choice(properties).address
+        # Запрос — название улицы с номером дома, как при наборе с клавиатуры.
+        query = address.split(" ", 1)[1][: rnd.randint(8, 20)]
+        started = time.perf_counter()
+        index.search(query, limit=limit)
+        samples.append(time.perf_counter() - started)
+
+    samples.sort()
+    return {
+        "size": size,
+        "build_seconds": round(build_seconds, 3),
+        "query_p50_ms": round(statistics.median(samples) * 1000, 4),
+        "query_p99_ms": round(samples[int(len(samples) * 0.99) - 1] * 1000, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+    print(run(args.size, args.queries))
+
+
+if __name__ == "__main__":
+    main()
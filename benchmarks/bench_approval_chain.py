@@ -0,0 +1,60 @@
+# benchmarks/bench_approval_chain.py
+"""Маршрутизация запросов: обход связанной цепочки против скомпилированной таблицы.
+
+Цепочка из --handlers звеньев с разными типами запросов и Director в конце.
+Запросы распределены равномерно по всем типам плюс доля неизвестных (их одобряет Director).
+
+Запуск: python -m benchmarks.bench_approval_chain --handlers 100 500 --requests 200000
+"""
+import argparse
+import random
+import time
+from rental_service.approval_chain import Director, Handler
+
+
+def make_chain(handlers: int) -> Handler:
+    chain = Director()
+    for i in reversed(range(handlers)):
+        cls = type(f"Desk{i}", (Handler,), {
+            "request_type": f"type-{i}",
+            "approve": lambda self, request: "Одобрено.",
+        })
+        chain = cls(chain)
+    return chain
+
+
+def run(handlers: int, requests: int, seed: int = 42) -> dict:
+    chain = make_chain(handlers)
+    rng = random.Random(seed)
+    batch = [{"type": f"type-{rng.randrange(int(handlers * 1.1))}"} for _ in range(requests)]
+
+    started = time.perf_counter()
+    linked = [chain.handle_request(r) for r in batch]
+    linked_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compiled = chain.compile()
+    compiled_results = compiled.handle_requests(batch)
+    compiled_seconds = time.perf_counter() - started  # включая компиляцию
+
+    assert linked == compiled_results
+    return {
+        "handlers": handlers,
+        "requests": requests,
+        "linked_per_sec": round(requests / linked_seconds),
+        "compiled_per_sec": round(requests / compiled_seconds),
+        "speedup": round(linked_seconds / compiled_seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--handlers", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+    for handlers in args.handlers:
+        print(run(handlers, args.requests))
+
+
+if __name__ == "__main__":
+    main()
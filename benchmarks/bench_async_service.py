@@ -0,0 +1,79 @@
+# benchmarks/bench_async_service.py
+"""Нагрузочный генератор для AsyncRentalService: задержки p50/p99 и запросов в секунду
+для онлайн- и оффлайн-процессов аренды.
+
+Каждый запрос — бронирование объекта, расчет стоимости договора и запрос в цепочку
+одобрения. Нагрузка замкнутая: concurrency клиентов, каждый отправляет следующий
+запрос после ответа на предыдущий.
+
+Запуск: python -m benchmarks.bench_async_service --requests 20000 --concurrency 64
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+from statistics import quantiles
+from rental_service.async_service import AsyncRentalService
+from rental_service.client_base import Tenant
+from rental_service.mixins import audit_disabled, configure_logging
+from rental_service.notifications import MemorySink, NotificationDispatcher, set_dispatcher
+from rental_service.property_base import Apartment
+from rental_service.rental_agreement import RentalAgreement
+from rental_service.rental_process import OfflineRentalProcess, OnlineRentalProcess
+
+PROCESSES = {"online": OnlineRentalProcess, "offline": OfflineRentalProcess}
+REQUEST_TYPES = ("minor", "financial", "major")
+
+
+async def _load(kind: str, requests: int, concurrency: int, workers: int) -> dict:
+    process = PROCESSES[kind]()
+    process.user_role = "manager"
+    tenant = Tenant(1, "Иван", "ivan@example.com", "+79991234567")
+    units = [Apartment(i, f"ул. Ленина, {i}", 40, 30000, 1) for i in range(requests)]
+    agreements = [RentalAgreement(i, tenant, u, date(2025, 1, 1), date(2026, 1, 1)) for i, u in enumerate(units)]
+    latencies = []
+
+    async with AsyncRentalService(max_concurrency=concurrency, max_workers=workers, timeout=30) as service:
+        async def client(ids):
+            for i in ids:
+                started = time.perf_counter()
+                await service.rent_property(process, units[i], tenant)
+                await service.calculate_total(agreements[i], 12)
+                await service.handle_request({"type": REQUEST_TYPES[i % 3]})
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client(range(c, requests, concurrency)) for c in range(concurrency)))
+        seconds = time.perf_counter() - started
+
+    cuts = quantiles(latencies, n=100)
+    return {
+        "process": kind,
+        "requests": requests,
+        "concurrency": concurrency,
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "requests_per_sec": round(requests / seconds),
+    }
+
+
+def run(kind: str, requests: int, concurrency: int, workers: int) -> dict:
+    with audit_disabled():
+        # Договоры для нагрузки создаются без записи в журнал аудита
+        return asyncio.run(_load(kind, requests, concurrency, workers))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    configure_logging(filename=None, console=False)
+    set_dispatcher(NotificationDispatcher(MemorySink(), max_queue=0))
+    for kind in PROCESSES:
+        print(run(kind, args.requests, args.concurrency, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_booking.py
+"""Пропускная способность параллельного бронирования через OnlineRentalProcess.
+
+Запуск: python -m benchmarks.bench_booking --calls 100000 --units 1000 --threads 1 8 32
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from rental_service.client_base import Tenant
+from rental_service.mixins import configure_logging
+from rental_service.notifications import MemorySink, NotificationDispatcher, set_dispatcher
+from rental_service.property_base import Apartment
+from rental_service.rental_process import OnlineRentalProcess
+
+
+def run(calls: int, units: int, threads: int) -> dict:
+    properties = [Apartment(i, f"ул. Ленина, {i}", 40, 30000, 1) for i in range(units)]
+    tenant = Tenant(1, "Иван", "ivan@example.com", "+79991234567")
+    process = OnlineRentalProcess()
+    process.user_role = "manager"
+    per_unit = max(calls // units, 1)
+
+    def book(call):
+        return process.rent_property(properties[(call // per_unit) % units], tenant)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(book, range(calls), chunksize=256))
+    seconds = time.perf_counter() - started
+    booked = sum(1 for message in results if message == "Аренда успешно оформлена.")
+    return {
+        "threads": threads,
+        "calls": calls,
+        "booked": booked,
+        "calls_per_sec": round(calls / seconds),
+        "double_booked": booked - units,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--units", type=int, default=1000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+    configure_logging(filename=None, console=False)
+    set_dispatcher(NotificationDispatcher(MemorySink(), max_queue=0))
+    for threads in args.threads:
+        print(run(args.calls, args.units, threads))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/bench_journal.py
+"""Журнал операций: скорость записи с групповой фиксацией и время восстановления
+после ops операций — полный повтор журнала против последнего снимка и хвоста.
+
+Запуск: python -m benchmarks.bench_journal --ops 1000000
+"""
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Iterator, Tuple
+from console_app import RentalApp
+from rental_service.journal import Journal
+from rental_service.mixins import audit_disabled, configure_logging, notifications_disabled
+from benchmarks.datagen import make_properties
+
+
+def operations(count: int, seed: int = 42) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Смесь операций: на каждые 10 — 2 новых объекта, 6 изменений ставки или площади,
+    1 арендатор и 1 договор на последний добавленный объект."""
+    rnd = random.Random(seed)
+    source = make_properties(count, seed)
+    properties = tenants = 0
+    for number in range(count):
+        step = number % 10
+        if step < 2:
+            data = next(source).to_dict()
+            data["property_id"] = properties = properties + 1
+            yield "add_property", {"property_type": data.pop("type"), **data}
+        elif step < 8:
+            pid = rnd.randint(1, properties)
+            if step % 2:
+                yield "update_property", {"property_id": pid, "monthly_rate": float(rnd.randrange(10_000, 500_000, 500))}
+            else:
+                yield "update_property", {"property_id": pid, "area": round(rnd.uniform(20, 300), 1)}
+        elif step == 8:
+            tenants += 1
+            yield "add_tenant", {
+                "name": f"Арендатор {tenants}", "email": f"t{tenants}@example.com",
+                "phone": f"+7{tenants:010d}", "tenant_id": tenants,
+            }
+        else:
+            yield "add_agreement", {
+                "property_id": properties, "tenant_id": rnd.randint(1, tenants),
+                "start_date": "2025-01-01", "end_date": "2025-12-31",
+            }
+
+
+def write(directory: str, ops: int, group_size: int, fsync: bool, snapshot_every: int) -> float:
+    """Выполняет ops операций с журналом (снимки — как в RentalApp.checkpoint); возвращает секунды."""
+    app = RentalApp(journal=Journal(directory, group_size, fsync, snapshot_every))
+    started = time.perf_counter()
+    with audit_disabled(), notifications_disabled():
+        for number, (op, args) in enumerate(operations(ops), 1):
+            app.apply(op, args)
+            if number % group_size == 0:
+                app.checkpoint()
+    app.close()
+    return time.perf_counter() - started
+
+
+def recover(directory: str) -> Tuple[float, RentalApp]:
+    started = time.perf_counter()
+    app = RentalApp(journal=Journal(directory, fsync=False))
+    return time.perf_counter() - started, app
+
+
+def run(ops: int, group_size: int = 256, fsync: bool = True, snapshot_every: int = 100_000) -> dict:
+    full_dir, snap_dir, group_dir = tempfile.mkdtemp(), tempfile.mkdtemp(), tempfile.mkdtemp()
+    try:
+        # Цена fsync на каждую операцию против групповой фиксации — на небольшом числе операций
+        sample = min(ops, 5_000)
+        single_seconds = write(group_dir, sample, 1, fsync, ops + 1)
+        shutil.rmtree(group_dir)
+
+        full_write = write(full_dir, ops, group_size, fsync, ops + 1)  # без снимков
+        snap_write = write(snap_dir, ops, group_size, fsync, snapshot_every)
+
+        full_seconds, full_app = recover(full_dir)
+        full_report = full_app.recovery
+        del full_app
+        snap_seconds, snap_app = recover(snap_dir)
+        snap_report = snap_app.recovery
+        del snap_app
+    finally:
+        for directory in (full_dir, snap_dir, group_dir):
+            shutil.rmtree(directory, ignore_errors=True)
+    return {
+        "ops": ops,
+        "group_size": group_size,
+        "fsync": fsync,
+        "append_ops_per_sec_fsync_each": round(sample / single_seconds),
+        "append_ops_per_sec_group_commit": round(ops / full_write),
+        "append_ops_per_sec_with_snapshots": round(ops / snap_write),
+        "recovery_full_replay_s": round(full_seconds, 2),
+        "recovery_full_replayed": full_report.replayed,
+        "recovery_snapshot_tail_s": round(snap_seconds, 2),
+        "recovery_snapshot_records": snap_report.loaded,
+        "recovery_tail_replayed": snap_report.replayed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=1_000_000)
+    parser.add_argument("--group-size", type=int, default=256)
+    parser.add_argument("--snapshot-every", type=int, default=100_000)
+    parser.add_argument("--no-fsync", action="store_true")
+    args = parser.parse_args()
+    configure_logging(filename=None, console=False)
+    print(run(args.ops, args.group_size, not args.no_fsync, args.snapshot_every))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_memory.py
+"""Память на объект: раскладка в __slots__ против прежней раскладки в __dict__.
+
+Запуск: python -m benchmarks.bench_memory --size 1000000
+"""
+import argparse
+import gc
+import tracemalloc
+from rental_service.property_base import Apartment
+
+
+class LegacyApartment:
+    """Прежняя раскладка Apartment: те же манглированные атрибуты в __dict__."""
+
+    def __init__(self, property_id, address, area, monthly_rate, number_of_rooms, is_available=True):
+        self._Property__property_id = property_id
+        self._Property__address = address
+        self._Property__area = area
+        self._Property__monthly_rate = monthly_rate
+        self._Property__is_available = is_available
+        self._Property__observers = ()
+        self._Apartment__number_of_rooms = number_of_rooms
+
+
+def bytes_per_object(cls, size: int) -> float:
+    address = "ул. Ленина, 10"  # общая строка: измеряем только сами объекты
+    gc.collect()
+    tracemalloc.start()
+    objects = [cls(i, address, 45.0, 30000.0, 2) for i in range(size)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Вычитаем список ссылок и сами int-идентификаторы — они одинаковы для обоих классов.
+    shared = size * 8 + sum(1 for i in range(size) if i > 256) * 28
+    del objects
+    return (current - shared) / size
+
+
+def run(size: int) -> dict:
+    legacy = bytes_per_object(LegacyApartment, size)
+    slotted = bytes_per_object(Apartment, size)
+    return {
+        "size": size,
+        "dict_bytes_per_object": round(legacy, 1),
+        "slots_bytes_per_object": round(slotted, 1),
+        "saved_percent": round((1 - slotted / legacy) * 100, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+    print(run(args.size))
+
+
+if __name__ == "__main__":
+    main()
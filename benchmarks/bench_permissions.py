@@ -0,0 +1,90 @@
+# benchmarks/bench_permissions.py
+"""Накладные расходы проверки прав: без проверки, прежняя проверка (точное сравнение
+строк и f-строка при отказе) и check_permissions с политикой ролей.
+
+Запуск: python -m benchmarks.bench_permissions --calls 1000000
+"""
+import argparse
+import timeit
+from functools import wraps
+from rental_service.decorators import DenialAudit, check_permissions
+from rental_service.exceptions import PermissionDeniedError
+from rental_service.mixins import configure_logging
+
+
+def legacy_check_permissions(required_role: str):
+    """Прежняя реализация декоратора — для сравнения."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            user_role = getattr(self, "user_role", "guest")
+            if user_role != required_role:
+                raise PermissionDeniedError(
+                    f"Недостаточно прав: требуется '{required_role}', а у пользователя '{user_role}'."
+                )
+            return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_audit = DenialAudit(batch_size=10_000)
+
+
+class Worker:
+    user_role = "manager"
+
+    def unguarded(self):
+        return 1
+
+    @legacy_check_permissions("manager")
+    def legacy(self):
+        return 1
+
+    @check_permissions("manager", audit=_audit)
+    def policy(self):
+        return 1
+
+    @check_permissions("manager", "agent", audit=_audit)
+    def policy_multi(self):
+        return 1
+
+
+def _denied(method):
+    def call():
+        try:
+            method()
+        except PermissionDeniedError:
+            pass
+    return call
+
+
+def run(calls: int) -> dict:
+    allowed, denied = Worker(), Worker()
+    denied.user_role = "guest"
+
+    def ns(func) -> float:
+        return round(min(timeit.repeat(func, number=calls, repeat=5)) / calls * 1e9, 1)
+
+    result = {
+        "calls": calls,
+        "unguarded_ns": ns(allowed.unguarded),
+        "legacy_allowed_ns": ns(allowed.legacy),
+        "policy_allowed_ns": ns(allowed.policy),
+        "policy_multi_role_allowed_ns": ns(allowed.policy_multi),
+        "legacy_denied_ns": ns(_denied(denied.legacy)),
+        "policy_denied_ns": ns(_denied(denied.policy)),
+    }
+    _audit.flush()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+    configure_logging(filename=None, console=False)
+    print(run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
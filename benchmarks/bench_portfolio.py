@@ -0,0 +1,62 @@
+# benchmarks/bench_portfolio.py
+"""Масштабирование PortfolioPricer по числу процессов.
+
+Портфель кодируется в компактные колонки один раз (PropertyTable) и
+переоценивается на --horizons сроков с разным числом исполнителей.
+Для сравнения приводится поштучный цикл по calculate_rental_cost.
+Ускорение ограничено числом ядер машины (os.cpu_count() в выводе).
+
+Запуск: python -m benchmarks.bench_portfolio --size 1000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import time
+from rental_service.mixins import audit_disabled, configure_logging
+from rental_service.portfolio import PortfolioPricer
+from rental_service.property_table import PropertyTable
+from benchmarks.datagen import make_properties
+
+
+def run(size: int, workers, horizons) -> dict:
+    properties = list(make_properties(size))
+    horizons = tuple(horizons)
+
+    started = time.perf_counter()
+    with audit_disabled():
+        for prop in properties:
+            for months in horizons:
+                prop.calculate_rental_cost(months)
+    loop_seconds = time.perf_counter() - started
+
+    table = PropertyTable.from_properties(properties)
+    timings = {}
+    for count in workers:
+        pricer = PortfolioPricer(max_workers=count)
+        started = time.perf_counter()
+        pricer.reprice(table, horizons)
+        timings[count] = time.perf_counter() - started
+
+    base = timings[workers[0]]
+    return {
+        "size": size,
+        "horizons": len(horizons),
+        "cpu_count": os.cpu_count(),
+        "loop_seconds": round(loop_seconds, 3),
+        "seconds_by_workers": {k: round(v, 3) for k, v in timings.items()},
+        "speedup_by_workers": {k: round(base / v, 2) for k, v in timings.items()},
+        "units_per_sec_best": round(size * len(horizons) / min(timings.values())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--horizons", type=int, nargs="+", default=[1, 3, 6, 12, 24, 36])
+    args = parser.parse_args()
+    configure_logging(filename=None, console=False)
+    print(run(args.size, args.workers, args.horizons))
+
+
+if __name__ == "__main__":
+    main()
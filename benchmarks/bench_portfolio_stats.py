@@ -0,0 +1,62 @@
+# benchmarks/bench_portfolio_stats.py
+"""Агрегаты портфеля: запрос к PortfolioStats против полного пересчета
+и цена поддержки агрегатов при изменении ставки.
+
+Запуск: python -m benchmarks.bench_portfolio_stats --size 1000000
+"""
+import argparse
+import random
+import time
+from rental_service.indexes import PortfolioStats
+from rental_service.mixins import configure_logging
+from rental_service.repository import PropertyRepository
+from benchmarks.datagen import make_properties
+
+
+def _update_ns(repo: PropertyRepository, updates: int) -> float:
+    rng = random.Random(7)
+    properties = rng.sample(list(repo), updates)
+    rates = [float(rng.randrange(10_000, 500_000, 500)) for _ in properties]
+    started = time.perf_counter()
+    for prop, rate in zip(properties, rates):
+        prop.monthly_rate = rate
+    return (time.perf_counter() - started) / updates * 1e9
+
+
+def run(size: int, updates: int = 100_000) -> dict:
+    repo = PropertyRepository()
+    for prop in make_properties(size):
+        repo.add(prop)
+    plain_ns = _update_ns(repo, updates)
+    stats = repo.add_index(PortfolioStats())
+    indexed_ns = _update_ns(repo, updates)
+
+    started = time.perf_counter()
+    for property_type in (None, "apartment", "house", "commercialspace"):
+        stats.totals(property_type)
+    query_us = (time.perf_counter() - started) / 4 * 1e6
+
+    started = time.perf_counter()
+    for property_type in (None, "apartment", "house", "commercialspace"):
+        PortfolioStats.recompute(repo, property_type)
+    recompute_ms = (time.perf_counter() - started) / 4 * 1e3
+    return {
+        "size": size,
+        "query_us": round(query_us, 2),
+        "full_recompute_ms": round(recompute_ms, 1),
+        "rate_update_ns_without_stats": round(plain_ns),
+        "rate_update_ns_with_stats": round(indexed_ns),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--updates", type=int, default=100_000)
+    args = parser.parse_args()
+    configure_logging(filename=None, console=False)
+    print(run(args.size, min(args.updates, args.size)))
+
+
+if __name__ == "__main__":
+    main()
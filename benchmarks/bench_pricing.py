@@ -0,0 +1,59 @@
+# benchmarks/bench_pricing.py
+"""Котировки с PricingCache и без него на повторяющихся запросах (ID объекта, срок).
+
+Запросы идут по «горячему» подмножеству портфеля, как у API котировок:
+одни и те же пары запрашиваются многократно. Журнал аудита включен, как в
+рабочем режиме (каждый расчет пишет запись), но вывод логов отключен.
+
+Запуск: python -m benchmarks.bench_pricing --size 100000 --quotes 1000000
+"""
+import argparse
+import random
+import time
+from rental_service.mixins import configure_logging
+from rental_service.pricing import DEFAULT_HORIZONS, PricingCache
+from benchmarks.datagen import make_properties
+
+
+def run(size: int, quotes: int, hot: float = 0.1, seed: int = 7) -> dict:
+    properties = list(make_properties(size))
+    rng = random.Random(seed)
+    hot_set = properties[: max(int(size * hot), 1)]
+    requests = [(rng.choice(hot_set), rng.choice(DEFAULT_HORIZONS)) for _ in range(quotes)]
+    cache = PricingCache(maxsize=len(hot_set) * len(DEFAULT_HORIZONS))
+
+    started = time.perf_counter()
+    uncached = [prop.calculate_rental_cost(months) for prop, months in requests]
+    uncached_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cache.warm(hot_set)
+    warm_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cached = [cache.quote(prop, months) for prop, months in requests]
+    cached_seconds = time.perf_counter() - started
+
+    assert cached == uncached
+    stats = cache.stats()
+    return {
+        "size": size,
+        "quotes": quotes,
+        "uncached_per_sec": round(quotes / uncached_seconds),
+        "cached_per_sec": round(quotes / cached_seconds),
+        "warm_seconds": round(warm_seconds, 4),
+        "hit_rate": round(stats.hit_rate, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--quotes", type=int, default=1_000_000)
+    args = parser.parse_args()
+    configure_logging(filename=None, console=False)
+    print(run(args.size, args.quotes))
+
+
+if __name__ == "__main__":
+    main()
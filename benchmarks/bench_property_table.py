@@ -0,0 +1,46 @@
+# benchmarks/bench_property_table.py
+"""Сравнение поштучного и векторного расчета стоимости аренды.
+
+Запуск: python -m benchmarks.bench_property_table --size 1000000
+"""
+import argparse
+import time
+from rental_service.mixins import audit_disabled
+from rental_service.property_table import PropertyTable
+from benchmarks.datagen import make_properties
+
+
+def run(size: int, months: int = 36) -> dict:
+    properties = list(make_properties(size))
+
+    started = time.perf_counter()
+    with audit_disabled():  # сравниваем только расчет, без записи логов
+        for prop in properties:
+            prop.calculate_rental_cost(months)
+    per_object = time.perf_counter() - started
+
+    started = time.perf_counter()
+    table = PropertyTable.from_properties(properties)
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    table.calculate_rental_cost(months)
+    vectorized = time.perf_counter() - started
+    return {
+        "size": size,
+        "per_object_seconds": round(per_object, 4),
+        "table_build_seconds": round(build, 4),
+        "vectorized_seconds": round(vectorized, 4),
+        "speedup": round(per_object / vectorized, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+    print(run(args.size))
+
+
+if __name__ == "__main__":
+    main()
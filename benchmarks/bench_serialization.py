@@ -0,0 +1,44 @@
+# benchmarks/bench_serialization.py
+"""Скорость потоковой выгрузки/загрузки JSON Lines.
+
+Запуск: python -m benchmarks.bench_serialization --size 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from rental_service.serialization import dump_jsonl, load_jsonl
+from benchmarks.datagen import make_properties
+
+
+def run(size: int) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        with open(path, "w", encoding="utf-8") as fp:
+            dump_jsonl(fp, make_properties(size))
+        dump_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with open(path, encoding="utf-8") as fp:
+            loaded = sum(1 for _ in load_jsonl(fp, properties={}))
+        load_seconds = time.perf_counter() - started
+    finally:
+        os.remove(path)
+    return {
+        "size": size,
+        "dump_records_per_sec": round(size / dump_seconds),
+        "load_records_per_sec": round(loaded / load_seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+    print(run(args.size))
+
+
+if __name__ == "__main__":
+    main()
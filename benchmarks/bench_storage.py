@@ -0,0 +1,57 @@
+# benchmarks/bench_storage.py
+"""Запись и загрузка 1M строк в SQLiteStorage.
+
+Запуск: python -m benchmarks.bench_storage --size 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+from rental_service.repository import PropertyRepository, TenantRepository, AgreementRepository
+from rental_service.storage import SQLiteStorage
+from benchmarks.datagen import make_properties
+
+
+def run(size: int, batch_size: int = 10_000) -> dict:
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "bench.db")
+    try:
+        properties = list(make_properties(size))
+        storage = SQLiteStorage(path, batch_size=batch_size)
+        started = time.perf_counter()
+        storage.save_properties(properties)
+        save_seconds = time.perf_counter() - started
+        del properties
+
+        started = time.perf_counter()
+        storage.find_properties("house", is_available=True, min_rate=100_000, max_rate=101_000)
+        query_ms = (time.perf_counter() - started) * 1000
+        storage.close()
+
+        storage = SQLiteStorage(path, batch_size=batch_size)
+        repos = PropertyRepository(), TenantRepository(), AgreementRepository()
+        started = time.perf_counter()
+        storage.attach(*repos)
+        load_seconds = time.perf_counter() - started
+        storage.close()
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    return {
+        "size": size,
+        "save_rows_per_sec": round(size / save_seconds),
+        "load_rows_per_sec": round(len(repos[0]) / load_seconds),
+        "indexed_query_ms": round(query_ms, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+    print(run(args.size))
+
+
+if __name__ == "__main__":
+    main()
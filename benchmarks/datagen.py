@@ -0,0 +1,37 @@
+# benchmarks/datagen.py
+"""Генераторы синтетических данных для бенчмарков."""
+import random
+from typing import Iterator, List
+from rental_service.property_base import Apartment, House, CommercialSpace, Property
+
+SYLLABLES = ["ле", "ни", "на", "са", "до", "ва", "мир", "тве", "ско", "го", "ро", "дская",
+             "пуш", "кин", "ая", "бе", "рё", "зо", "вая", "ок", "тяб", "рь", "ска", "ль"]
+STREET_KINDS = ["ул.", "пр.", "пер.", "наб.", "ш."]
+BUSINESS_TYPES = ["retail", "office", "warehouse", "cafe"]
+
+
+def street_names(count: int, seed: int = 1) -> List[str]:
+    rnd = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        word = "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4)))
+        names.add(word.capitalize())
+    return sorted(names)
+
+
+def make_properties(count: int, seed: int = 42, streets: int = 10_000) -> Iterator[Property]:
+    """Генерирует count объектов недвижимости трёх типов с реалистичными адресами."""
+    rnd = random.Random(seed)
+    names = street_names(streets, seed)
+    for pid in range(1, count + 1):
+        address = f"{rnd.choice(STREET_KINDS)} {rnd.choice(names)}, д. {rnd.randint(1, 200)}"
+        area = round(rnd.uniform(20, 300), 1)
+        rate = float(rnd.randrange(10_000, 500_000, 500))
+        available = rnd.random() < 0.7
+        kind = pid % 3
+        if kind == 0:
+            yield Apartment(pid, address, area, rate, rnd.randint(1, 5), available)
+        elif kind == 1:
+            yield House(pid, address, area, rate, rnd.random() < 0.5, available)
+        else:
+            yield CommercialSpace(pid, address, area, rate, rnd.choice(BUSINESS_TYPES), available)
@@ -0,0 +1,327 @@
+# benchmarks/suite.py
+"""Набор бенчмарков горячих путей rental_service с JSON-отчетом и сравнением с базовой линией.
+
+Каждый сценарий выполняется на синтетических данных размера --sizes и дает
+ops_per_sec (лучший из --repeat прогонов). Результаты пишутся в JSON; при
+--baseline сценарий считается регрессией, если ops_per_sec упал больше чем на
+порог (--threshold или --case-threshold для отдельных сценариев), и код
+возврата будет 1. Базовая линия зависит от машины: ее нужно записывать
+(--save-baseline) на той же машине, где выполняется сравнение.
+
+Запуск:
+  python -m benchmarks.suite --sizes 10000 100000 1000000 --output results.json
+  python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+  python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 0.2 --case-threshold app.=0.4
+"""
+import argparse
+import builtins
+import io
+import json
+import platform
+import random
+import sys
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Tuple
+from console_app import RentalApp
+from rental_service.approval_chain import Director, FinanceDepartment, RentalManager
+from rental_service.client_base import Tenant
+from rental_service.mixins import configure_logging
+from rental_service.notifications import NotificationDispatcher, NotificationSink, set_dispatcher
+from rental_service.property_base import Property
+from rental_service.property_factory import PropertyFactory
+from rental_service.rental_agreement import RentalAgreement
+from benchmarks.datagen import make_properties
+
+# Сценарий: size -> (число операций, секунды)
+Case = Callable[[int], Tuple[int, float]]
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str):
+    def register(func: Case) -> Case:
+        CASES[name] = func
+        return func
+    return register
+
+
+def timed(func: Callable[[], object], ops: int) -> Tuple[int, float]:
+    started = time.perf_counter()
+    func()
+    return ops, time.perf_counter() - started
+
+
+class _NullSink(NotificationSink):
+    def send_batch(self, notifications):
+        pass
+
+
+@contextmanager
+def scripted_input(answers: Iterable[str]):
+    """Подставляет ответы вместо input() и глушит вывод консольного приложения."""
+    answers = iter(answers)
+    original = builtins.input
+    builtins.input = lambda prompt="": next(answers)
+    try:
+        with redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = original
+
+
+# --- Фабрика и расчет стоимости ---
+@case("factory.create_property")
+def bench_factory(size: int):
+    records = [prop.to_dict() for prop in make_properties(size)]
+    for record in records:
+        del record["type"]
+    types = [type(prop).__name__ for prop in make_properties(size)]
+    create = PropertyFactory.create_property
+    return timed(lambda: [create(t, **r) for t, r in zip(types, records)], size)
+
+
+@case("factory.create_many")
+def bench_factory_many(size: int):
+    records = [prop.to_dict() for prop in make_properties(size)]
+    create_many = PropertyFactory.create_many
+    return timed(lambda: [r.property for r in create_many(records)], size)
+
+
+def _cost_case(type_name: str) -> Case:
+    def bench(size: int):
+        properties = [p for p in make_properties(size) if type(p).__name__ == type_name]
+        return timed(lambda: [p.calculate_rental_cost(months) for p in properties for months in (6, 12)],
+                     2 * len(properties))
+    return bench
+
+
+for _name in ("Apartment", "House", "CommercialSpace"):
+    case(f"cost.{_name.lower()}")(_cost_case(_name))
+
+
+# --- Договоры аренды ---
+def _agreements(properties: List[Property]) -> List[RentalAgreement]:
+    tenant = Tenant(1, "Иван", "ivan@example.com", "+79991234567")
+    start, end = date(2025, 1, 1), date(2026, 1, 1)
+    return [RentalAgreement(p.property_id, tenant, p, start, end) for p in properties]
+
+
+@case("agreement.create")
+def bench_agreement_create(size: int):
+    properties = list(make_properties(size))
+    return timed(lambda: _agreements(properties), size)
+
+
+@case("agreement.calculate_total")
+def bench_agreement_total(size: int):
+    agreements = _agreements(list(make_properties(size)))
+    for agreement in agreements:
+        agreement.add_extra("Уборка", 2000)
+        agreement.add_extra("Интернет", 700)
+    return timed(lambda: [a.calculate_total(12) for a in agreements], size)
+
+
+# --- Сериализация ---
+@case("property.to_dict")
+def bench_to_dict(size: int):
+    properties = list(make_properties(size))
+    return timed(lambda: [p.to_dict() for p in properties], size)
+
+
+@case("property.to_json")
+def bench_to_json(size: int):
+    properties = list(make_properties(size))
+    return timed(lambda: [p.to_json() for p in properties], size)
+
+
+@case("property.from_dict")
+def bench_from_dict(size: int):
+    records = [p.to_dict() for p in make_properties(size)]
+    return timed(lambda: [Property.from_dict(r) for r in records], size)
+
+
+# --- Цепочка одобрения ---
+def _approval_requests(size: int) -> List[dict]:
+    rng = random.Random(3)
+    return [{"type": rng.choice(("minor", "financial", "major"))} for _ in range(size)]
+
+
+@case("chain.linked")
+def bench_chain_linked(size: int):
+    chain = RentalManager(FinanceDepartment(Director()))
+    requests = _approval_requests(size)
+    return timed(lambda: [chain.handle_request(r) for r in requests], size)
+
+
+@case("chain.compiled")
+def bench_chain_compiled(size: int):
+    chain = RentalManager(FinanceDepartment(Director())).compile()
+    requests = _approval_requests(size)
+    return timed(lambda: chain.handle_requests(requests), size)
+
+
+# --- Консольное приложение ---
+def _app(size: int) -> Tuple[RentalApp, List[Property]]:
+    app = RentalApp()
+    properties = list(make_properties(size))
+    for prop in properties:
+        app.properties.add(prop)
+    return app, properties
+
+
+def _operations(size: int) -> int:
+    return min(size, 2000)
+
+
+@case("app.search")
+def bench_app_search(size: int):
+    app, properties = _app(size)
+    rng = random.Random(7)
+    # Запрос — улица с началом номера дома, как при наборе с клавиатуры
+    queries = [rng.choice(properties).address.split(" ", 1)[1][:14] for _ in range(_operations(size))]
+
+    def search():
+        with scripted_input(queries):
+            for _ in queries:
+                app.search_property()
+    return timed(search, len(queries))
+
+
+@case("app.edit")
+def bench_app_edit(size: int):
+    app, properties = _app(size)
+    rng = random.Random(7)
+    answers = []
+    for prop in rng.sample(properties, _operations(size)):
+        answers += [str(prop.property_id), str(prop.monthly_rate + 500), str(prop.area + 1)]
+
+    def edit():
+        with scripted_input(answers):
+            for _ in range(len(answers) // 3):
+                app.edit_property()
+    return timed(edit, len(answers) // 3)
+
+
+@case("app.batch_edit")
+def bench_app_batch_edit(size: int):
+    # Те же правки, что в app.edit, но командами пакетного режима вместо input()
+    app, properties = _app(size)
+    rng = random.Random(7)
+    commands = [
+        {"op": "update_property",
+         "args": {"property_id": prop.property_id, "monthly_rate": prop.monthly_rate + 500, "area": prop.area + 1}}
+        for prop in rng.sample(properties, _operations(size))
+    ]
+
+    def batch():
+        for _ in app.run_batch(commands):
+            pass
+    return timed(batch, len(commands))
+
+
+@case("app.delete")
+def bench_app_delete(size: int):
+    app, properties = _app(size)
+    rng = random.Random(7)
+    answers = [str(p.property_id) for p in rng.sample(properties, _operations(size))]
+
+    def delete():
+        with scripted_input(answers):
+            for _ in answers:
+                app.delete_property()
+    return timed(delete, len(answers))
+
+
+# --- Запуск и сравнение ---
+def run(sizes: Iterable[int], repeat: int = 3, cases: Iterable[str] = ()) -> dict:
+    prefixes = tuple(cases)
+    results = {}
+    for name, func in CASES.items():
+        if prefixes and not name.startswith(prefixes):
+            continue
+        for size in sizes:
+            best = None
+            for _ in range(repeat):
+                ops, seconds = func(size)
+                best = seconds if best is None else min(best, seconds)
+            results[f"{name}@{size}"] = {"ops": ops, "seconds": round(best, 6), "ops_per_sec": round(ops / best)}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, case_thresholds: Dict[str, float]) -> List[dict]:
+    """Сравнивает ops_per_sec со базовой линией; возвращает строки отчета по общим сценариям."""
+    rows = []
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        name = key.split("@", 1)[0]
+        limit = next((v for prefix, v in case_thresholds.items() if name.startswith(prefix)), threshold)
+        ratio = result["ops_per_sec"] / base["ops_per_sec"]
+        rows.append({
+            "case": key,
+            "baseline_ops_per_sec": base["ops_per_sec"],
+            "ops_per_sec": result["ops_per_sec"],
+            "ratio": round(ratio, 3),
+            "threshold": limit,
+            "regression": ratio < 1 - limit,
+        })
+    return rows
+
+
+def _parse_thresholds(values: List[str]) -> Dict[str, float]:
+    thresholds = {}
+    for value in values:
+        prefix, _, limit = value.partition("=")
+        thresholds[prefix] = float(limit)
+    return thresholds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", nargs="*", default=[], help="префиксы имен сценариев")
+    parser.add_argument("--output", help="файл для JSON-результатов (по умолчанию stdout)")
+    parser.add_argument("--baseline", help="JSON базовой линии для сравнения")
+    parser.add_argument("--save-baseline", help="записать результаты как базовую линию")
+    parser.add_argument("--threshold", type=float, default=0.25, help="допустимое падение ops/sec (доля)")
+    parser.add_argument("--case-threshold", action="append", default=[], metavar="PREFIX=VALUE")
+    args = parser.parse_args()
+
+    configure_logging(filename=None, console=False)
+    set_dispatcher(NotificationDispatcher(_NullSink(), max_queue=0))
+    report = run(args.sizes, args.repeat, args.cases)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+        report["comparison"] = compare(report, baseline, args.threshold, _parse_thresholds(args.case_threshold))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            fp.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as fp:
+            json.dump({k: v for k, v in report.items() if k != "comparison"}, fp, ensure_ascii=False, indent=2)
+            fp.write("\n")
+
+    regressions = [row["case"] for row in report.get("comparison", ()) if row["regression"]]
+    if regressions:
+        print("Регрессии: " + ", ".join(regressions), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
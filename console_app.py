@@ -1,15 +1,294 @@
+import argparse
+import csv
 import json
+import sys
+import time
+from contextlib import ExitStack
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
 from rental_service.property_factory import PropertyFactory
 from rental_service.client_base import Tenant
 from rental_service.rental_agreement import RentalAgreement
-from rental_service.mixins import LoggingMixin, NotificationMixin
+from rental_service.exceptions import RentalNotFoundError
+from rental_service.journal import Journal, RecoveryReport
+from rental_service.mixins import LoggingMixin, NotificationMixin, audit_disabled, flush_logs, notifications_disabled
+from rental_service.notifications import flush_notifications
+from rental_service.repository import AgreementRepository, ImportReport, PropertyRepository, TenantRepository
+from rental_service.indexes import AddressIndex, PortfolioStats, RateIndex
+from rental_service.availability import AvailabilityCalendar, parse_period
+from rental_service.storage import SQLiteStorage
+
+IMPORT_CHUNK_SIZE = 1000  # записей импорта арендаторов на одну запись журнала
+
+
+class BatchResult(NamedTuple):
+    line: int  # номер команды во входном потоке, с 1
+    op: Optional[str]
+    ok: bool
+    result: Any  # значение, пригодное для JSON
+    error: Optional[str]
+
+
+class BatchReport(NamedTuple):
+    total: int
+    failed: int
+    seconds: float
+
+    @property
+    def ops_per_sec(self) -> float:
+        return self.total / self.seconds if self.seconds else 0.0
+
+
+def _to_result(value):
+    """Результат операции в виде, пригодном для JSON."""
+    if isinstance(value, RentalAgreement):
+        data = value.to_dict()
+        del data["tenant"]
+        return data
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "_asdict"):
+        return value._asdict()
+    return value
 
 
 class RentalApp(LoggingMixin, NotificationMixin):
-    def __init__(self):
-        self.properties = []
-        self.tenants = []
-        self.agreements = []
+    # Операции, которые пишутся в журнал и повторяются при восстановлении (см. apply)
+    OPERATIONS = frozenset({
+        "add_property", "update_property", "remove_property",
+        "add_tenant", "import_tenant_records",
+        "add_agreement", "calculate_total", "add_extra", "remove_extra", "rent_agreement",
+    })
+
+    def __init__(self, storage: SQLiteStorage = None, journal: Journal = None):
+        if storage is not None and journal is not None:
+            raise ValueError("Укажите либо хранилище SQLite, либо журнал операций")
+        self.properties = PropertyRepository()
+        self.address_index = self.properties.add_index(AddressIndex())
+        self.rate_index = self.properties.add_index(RateIndex())
+        self.stats = self.properties.add_index(PortfolioStats())
+        self.tenants = TenantRepository()
+        self.agreements = AgreementRepository()
+        self.calendar = self.agreements.add_index(AvailabilityCalendar())
+        self.properties.add_index(self.calendar.units)
+        # Необязательное постоянное хранилище: загружает данные и сохраняет изменения
+        self.storage = storage
+        if storage is not None:
+            storage.attach(self.properties, self.tenants, self.agreements)
+        # Либо журнал операций: последний снимок + повтор операций после него
+        self.journal = journal
+        self.recovery: Optional[RecoveryReport] = None
+        self.__replaying = False
+        if journal is not None:
+            self.__replaying = True
+            try:
+                with audit_disabled(), notifications_disabled():
+                    self.recovery = journal.recover(self.properties, self.tenants, self.agreements, self.apply)
+            finally:
+                self.__replaying = False
+
+    # --- Операции (без ввода-вывода; каждая пишется в журнал) ---
+    def __record(self, op: str, args: Dict[str, Any]):
+        if self.journal is not None and not self.__replaying:
+            self.journal.append(op, args)
+
+    def apply(self, op: str, args: Dict[str, Any]):
+        """Выполняет операцию по имени (повтор журнала, пакетный режим)."""
+        if op not in self.OPERATIONS:
+            raise ValueError(f"Неизвестная операция: {op}")
+        return getattr(self, op)(**args)
+
+    def __property(self, property_id: int):
+        prop = self.properties.get(property_id)
+        if prop is None:
+            raise RentalNotFoundError(f"Недвижимость ID={property_id} не найдена")
+        return prop
+
+    def __agreement(self, agreement_id: int) -> RentalAgreement:
+        agreement = self.agreements.get(agreement_id)
+        if agreement is None:
+            raise RentalNotFoundError(f"Договор ID={agreement_id} не найден")
+        return agreement
+
+    def add_property(self, property_type: str, **fields):
+        if fields.get("property_id") is None:
+            fields["property_id"] = self.properties.next_id()
+        prop = self.properties.add(PropertyFactory.create_property(property_type, **fields))
+        self.__record("add_property", {"property_type": property_type, **fields})
+        return prop
+
+    def update_property(self, property_id: int, monthly_rate: float = None, area: float = None):
+        prop = self.__property(property_id)
+        applied = {}
+        try:
+            # Сеттеры проверяют значения по одному: в журнал попадает то, что успело примениться
+            if monthly_rate is not None:
+                prop.monthly_rate = monthly_rate
+                applied["monthly_rate"] = monthly_rate
+            if area is not None:
+                prop.area = area
+                applied["area"] = area
+        finally:
+            if applied:
+                self.__record("update_property", {"property_id": property_id, **applied})
+        return prop
+
+    def remove_property(self, property_id: int):
+        if self.calendar.periods(property_id):
+            raise ValueError(f"Недвижимость ID={property_id} нельзя удалить: по ней есть договоры аренды")
+        prop = self.properties.remove(property_id)
+        if prop is None:
+            raise RentalNotFoundError(f"Недвижимость ID={property_id} не найдена")
+        self.__record("remove_property", {"property_id": property_id})
+        return prop
+
+    def add_tenant(self, name: str, email: str, phone: str, tenant_id: int = None) -> Tenant:
+        if tenant_id is None:
+            tenant_id = self.tenants.next_id()
+        tenant = self.tenants.add(Tenant(tenant_id=tenant_id, name=name, email=email, phone=phone))
+        self.__record("add_tenant", {"name": name, "email": email, "phone": phone, "tenant_id": tenant_id})
+        return tenant
+
+    def import_tenant_records(self, records: Iterable[Dict[str, Any]], first_id: int = None, first_line: int = 1):
+        """Потоковый импорт арендаторов (см. TenantRepository.import_tenants).
+
+        Записи импортируются пачками по IMPORT_CHUNK_SIZE, и каждая пачка — отдельная
+        запись журнала со своим first_id: импорт выдает ID по порядку, поэтому
+        повтор дает тот же результат, а весь файл не держится в памяти.
+        """
+        if first_id is not None:
+            self.tenants.reserve_id(first_id - 1)
+        inserted = merged = rejected = 0
+        errors: List[str] = []
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, IMPORT_CHUNK_SIZE))
+            if not chunk:
+                break
+            first_id = self.tenants.peek_id()
+            part = self.tenants.import_tenants(chunk, first_line=first_line)
+            self.__record("import_tenant_records", {"records": chunk, "first_id": first_id, "first_line": first_line})
+            inserted, merged, rejected = inserted + part.inserted, merged + part.merged, rejected + part.rejected
+            errors.extend(part.errors[:100 - len(errors)])
+            first_line += len(chunk)
+        return ImportReport(inserted, merged, rejected, errors)
+
+    def add_agreement(self, property_id: int, tenant_id: int, start_date, end_date, agreement_id: int = None):
+        prop = self.__property(property_id)
+        tenant = self.tenants.get(tenant_id)
+        if tenant is None:
+            raise RentalNotFoundError(f"Арендатор ID={tenant_id} не найден")
+        if agreement_id is None:
+            agreement_id = self.agreements.next_id()
+        agreement = self.agreements.add(RentalAgreement(agreement_id, tenant, prop, start_date, end_date))
+        self.__record("add_agreement", {
+            "property_id": property_id, "tenant_id": tenant_id,
+            "start_date": str(agreement.start_date), "end_date": str(agreement.end_date),
+            "agreement_id": agreement_id,
+        })
+        return agreement
+
+    def __changed(self, agreement: RentalAgreement):
+        """Договор изменился на месте: репозиторий этого не видит, поэтому сообщаем хранилищу сами."""
+        if self.storage is not None:
+            self.storage.mark_dirty("agreements", agreement.agreement_id, agreement)
+
+    def calculate_total(self, agreement_id: int, months: int) -> float:
+        agreement = self.__agreement(agreement_id)
+        total = agreement.calculate_total(months)
+        self.__changed(agreement)
+        self.__record("calculate_total", {"agreement_id": agreement_id, "months": months})
+        return total
+
+    def add_extra(self, agreement_id: int, service_name: str, price: float):
+        agreement = self.__agreement(agreement_id)
+        agreement.add_extra(service_name, price)
+        self.__changed(agreement)
+        self.__record("add_extra", {"agreement_id": agreement_id, "service_name": service_name, "price": price})
+
+    def remove_extra(self, agreement_id: int, service_name: str):
+        agreement = self.__agreement(agreement_id)
+        agreement.remove_extra(service_name)
+        self.__changed(agreement)
+        self.__record("remove_extra", {"agreement_id": agreement_id, "service_name": service_name})
+
+    def rent_agreement(self, agreement_id: int):
+        agreement = self.__agreement(agreement_id)
+        agreement.rent_property()
+        self.__changed(agreement)
+        self.__record("rent_agreement", {"agreement_id": agreement_id})
+
+    def checkpoint(self):
+        """Сохраняет накопленные изменения: SQLite или группа записей журнала (+ снимок по расписанию)."""
+        if self.storage is not None:
+            self.storage.flush()
+        if self.journal is not None:
+            self.journal.commit()
+            if self.journal.needs_snapshot:
+                self.journal.snapshot(self.properties, self.tenants, self.agreements)
+
+    # --- Пакетный режим ---
+    def execute(self, command: Dict[str, Any], line: int = 0) -> BatchResult:
+        """Выполняет одну команду {"op": ..., "args": {...}}; ошибка возвращается в результате.
+
+        Вместо команды может быть передано исключение (например, ошибка разбора строки) —
+        оно тоже становится результатом с ошибкой.
+        """
+        op = None
+        try:
+            if isinstance(command, Exception):
+                raise command
+            op = command["op"]
+            value = self.apply(op, command.get("args") or {})
+        except Exception as e:
+            return BatchResult(line, op, False, None, f"{type(e).__name__}: {e}")
+        return BatchResult(line, op, True, _to_result(value), None)
+
+    def run_batch(self, commands: Iterable[Dict[str, Any]], chunk_size: int = 1000, audit: bool = False) -> Iterator[BatchResult]:
+        """Выполняет команды пачками по chunk_size (генератор результатов).
+
+        Без audit отдельные операции не пишутся в журнал действий: на пачку —
+        одна итоговая запись. Сохранение (checkpoint), запись логов и доставка
+        уведомлений ожидаются один раз на пачку, после чего отдаются ее результаты.
+        """
+        commands = iter(commands)
+        line = 0
+        while True:
+            chunk = list(islice(commands, chunk_size))
+            if not chunk:
+                return
+            results: List[BatchResult] = []
+            if audit:
+                for command in chunk:
+                    line += 1
+                    results.append(self.execute(command, line))
+            else:
+                with audit_disabled():
+                    for command in chunk:
+                        line += 1
+                        results.append(self.execute(command, line))
+            failed = sum(not result.ok for result in results)
+            self.checkpoint()
+            self.audit_action("Пакет команд %s-%s: выполнено %s, ошибок %s", line - len(chunk) + 1, line, len(chunk), failed)
+            flush_logs()
+            flush_notifications()
+            yield from results
+
+    def run_batch_file(self, source: IO[str], output: IO[str], chunk_size: int = 1000, audit: bool = False) -> BatchReport:
+        """Читает команды JSON Lines из source и пишет результаты JSON Lines в output."""
+        started = time.perf_counter()
+        total = failed = 0
+        for result in self.run_batch(_read_commands(source), chunk_size, audit):
+            total += 1
+            failed += not result.ok
+            output.write(json.dumps(result._asdict(), ensure_ascii=False, default=str) + "\n")
+        return BatchReport(total, failed, time.perf_counter() - started)
+
+    def close(self):
+        if self.storage is not None:
+            self.storage.close()
+        if self.journal is not None:
+            self.journal.close()
 
     # --- Функции для работы с недвижимостью ---
     def create_property(self):
@@ -17,7 +296,6 @@ class RentalApp(LoggingMixin, NotificationMixin):
         property_type = input("Тип (apartment/house/commercialspace): ").strip().lower()
         try:
             kwargs = {
-                "property_id": len(self.properties) + 1,
                 "address": input("Адрес: "),
                 "area": float(input("Площадь (кв.м): ")),
                 "monthly_rate": float(input("Месячная ставка: ")),
@@ -31,9 +309,8 @@ class RentalApp(LoggingMixin, NotificationMixin):
             elif property_type == "commercialspace":
                 kwargs["business_type"] = input("Тип бизнеса: ")
 
-            prop = PropertyFactory.create_property(property_type, **kwargs)
-            self.properties.append(prop)
-            self.log_action(f"Добавлена недвижимость: {prop.address}")
+            prop = self.add_property(property_type, **kwargs)
+            self.audit_action(f"Добавлена недвижимость: {prop.address}")
             print("✅ Недвижимость успешно создана!\n")
 
         except Exception as e:
@@ -48,8 +325,8 @@ class RentalApp(LoggingMixin, NotificationMixin):
         print()
 
     def search_property(self):
-        query = input("\n🔍 Введите адрес для поиска: ").strip().lower()
-        found = [p for p in self.properties if query in p.address.lower()]
+        query = input("\n🔍 Введите адрес для поиска: ")
+        found = self.address_index.search(query)
         if found:
             print("Найдено:")
             for p in found:
@@ -61,15 +338,17 @@ class RentalApp(LoggingMixin, NotificationMixin):
     def edit_property(self):
         try:
             pid = int(input("\nВведите ID недвижимости для редактирования: "))
-            prop = next((p for p in self.properties if p.property_id == pid), None)
+            prop = self.properties.get(pid)
             if not prop:
                 print("❌ Недвижимость не найдена.")
                 return
 
             print(f"Редактируем {prop.address}")
-            prop.monthly_rate = float(input("Новая ставка (текущее значение {0}): ".format(prop.monthly_rate)))
-            prop.area = float(input("Новая площадь (текущее значение {0}): ".format(prop.area)))
-            self.log_action(f"Изменена недвижимость ID={pid}")
+            self.update_property(
+                pid, monthly_rate=float(input("Новая ставка (текущее значение {0}): ".format(prop.monthly_rate)))
+            )
+            self.update_property(pid, area=float(input("Новая площадь (текущее значение {0}): ".format(prop.area))))
+            self.audit_action(f"Изменена недвижимость ID={pid}")
             print("✅ Изменения сохранены!\n")
 
         except Exception as e:
@@ -78,9 +357,11 @@ class RentalApp(LoggingMixin, NotificationMixin):
     def delete_property(self):
         try:
             pid = int(input("\nВведите ID недвижимости для удаления: "))
-            self.properties = [p for p in self.properties if p.property_id != pid]
-            self.log_action(f"Удалена недвижимость ID={pid}")
+            self.remove_property(pid)
+            self.audit_action(f"Удалена недвижимость ID={pid}")
             print("✅ Недвижимость удалена!\n")
+        except RentalNotFoundError:
+            print("❌ Недвижимость не найдена.")
         except Exception as e:
             print(f"❌ Ошибка: {e}")
 
@@ -89,27 +370,46 @@ class RentalApp(LoggingMixin, NotificationMixin):
         if not self.properties:
             print("Нет данных для анализа.")
             return
-        most_expensive = max(self.properties, key=lambda p: p.monthly_rate)
-        cheapest = min(self.properties, key=lambda p: p.monthly_rate)
+        most_expensive = self.rate_index.highest()
+        cheapest = self.rate_index.lowest()
         print(f"💰 Самая дорогая: {most_expensive.address} — {most_expensive.monthly_rate} руб/мес")
-        print(f"🪙 Самая дешёвая: {cheapest.address} — {cheapest.monthly_rate} руб/мес\n")
+        print(f"🪙 Самая дешёвая: {cheapest.address} — {cheapest.monthly_rate} руб/мес")
+        total = self.stats.totals()
+        print(f"📈 Сдано: {total.rented} из {total.units} ({total.occupancy:.0%}), "
+              f"выручка {total.rented_revenue:.2f} руб/мес, {total.average_rate_per_m2:.2f} руб/м²")
+        for name, stats in sorted(self.stats.by_type().items()):
+            print(f"   {name}: {stats.occupancy:.0%} сдано, {stats.average_rate_per_m2:.2f} руб/м²")
+        print()
 
     # --- Работа с арендаторами и арендой ---
     def create_tenant(self):
         print("\n👤 Добавление арендатора")
         try:
-            tenant = Tenant(
-                tenant_id=len(self.tenants) + 1,
+            tenant = self.add_tenant(
                 name=input("Имя: "),
                 email=input("Email: "),
                 phone=input("Телефон: ")
             )
-            self.tenants.append(tenant)
-            self.log_action(f"Добавлен арендатор: {tenant.name}")
+            self.audit_action(f"Добавлен арендатор: {tenant.name}")
             print("✅ Арендатор успешно добавлен!\n")
         except Exception as e:
             print(f"❌ Ошибка: {e}")
 
+    def import_tenants(self):
+        print("\n📥 Импорт арендаторов из CSV (колонки name, email, phone)")
+        path = input("Файл: ").strip()
+        try:
+            with open(path, newline="", encoding="utf-8") as fp:
+                report = self.import_tenant_records(csv.DictReader(fp))
+        except OSError as e:
+            print(f"❌ Ошибка: {e}")
+            return
+        self.audit_action("Импорт арендаторов из %s: %s", path, report[:3])
+        print(f"✅ Добавлено: {report.inserted}, объединено: {report.merged}, отклонено: {report.rejected}")
+        for error in report.errors[:10]:
+            print(f"  {error}")
+        print()
+
     def create_agreement(self):
         print("\n🧾 Создание договора аренды")
         if not self.properties or not self.tenants:
@@ -118,30 +418,51 @@ class RentalApp(LoggingMixin, NotificationMixin):
 
         pid = int(input("ID недвижимости: "))
         tid = int(input("ID арендатора: "))
-        prop = next((p for p in self.properties if p.property_id == pid), None)
-        tenant = next((t for t in self.tenants if t.tenant_id == tid), None)
+        prop = self.properties.get(pid)
+        tenant = self.tenants.get(tid)
 
         if not prop or not tenant:
             print("❌ Неверный ID.")
             return
 
-        agreement = RentalAgreement(
-            agreement_id=len(self.agreements) + 1,
-            tenant=tenant,
-            property_=prop,
-            start_date=input("Дата начала (YYYY-MM-DD): "),
-            end_date=input("Дата окончания (YYYY-MM-DD): ")
-        )
-        self.agreements.append(agreement)
-        agreement.log_action("Создан новый договор аренды")
-        agreement.send_notification("Аренда подтверждена")
+        try:
+            start, end = parse_period(
+                input("Дата начала (YYYY-MM-DD): "),
+                input("Дата окончания (YYYY-MM-DD): "),
+            )
+        except ValueError as e:
+            print(f"❌ Ошибка: {e}")
+            return
+        if not self.calendar.is_free(pid, start, end):
+            print(f"❌ Объект уже арендован на часть периода {start} — {end}.")
+            return
+
+        agreement = self.add_agreement(pid, tid, start, end)
+        agreement.audit_action("Создан новый договор аренды")
+        agreement.send_notification("Аренда подтверждена", tenant.tenant_id)
         try:
             months = int(input("Введите срок аренды в месяцах: "))
-            total = agreement.calculate_total(months)
+            total = self.calculate_total(agreement.agreement_id, months)
             print(f"✅ Договор создан. Общая стоимость: {total:.2f} руб.\n")
         except Exception as e:
             print(f"❌ Ошибка при расчете стоимости: {e}")
 
+    def free_properties(self):
+        print("\n📅 Свободные объекты на период")
+        try:
+            start, end = parse_period(
+                input("Дата начала (YYYY-MM-DD): "),
+                input("Дата окончания (YYYY-MM-DD): "),
+            )
+        except ValueError as e:
+            print(f"❌ Ошибка: {e}")
+            return
+        free = self.calendar.free_units(start, end)
+        if not free:
+            print("Нет свободных объектов.")
+        for p in free:
+            print(f"- {p}")
+        print()
 
     # --- Главное меню ---
     def run(self):
@@ -158,6 +479,8 @@ class RentalApp(LoggingMixin, NotificationMixin):
 6. Анализ (дорогая/дешёвая)
 7. Добавить арендатора
 8. Создать договор аренды
+9. Свободные объекты на период
+10. Импорт арендаторов из CSV
 0. Выход
 """)
             choice = input("Выберите действие: ").strip()
@@ -178,13 +501,68 @@ class RentalApp(LoggingMixin, NotificationMixin):
                 self.create_tenant()
             elif choice == "8":
                 self.create_agreement()
+            elif choice == "9":
+                self.free_properties()
+            elif choice == "10":
+                self.import_tenants()
             elif choice == "0":
                 print("👋 Завершение работы.")
                 break
             else:
                 print("❌ Неверный выбор, попробуйте снова.\n")
+            self.checkpoint()
+        self.close()
+
+
+def _read_commands(source: IO[str]) -> Iterator[Dict[str, Any]]:
+    # Строка, которая не разбирается как JSON, передается как исключение,
+    # чтобы номера строк в результатах совпадали с входным файлом.
+    for text in source:
+        if not text.strip():
+            continue
+        try:
+            yield json.loads(text)
+        except ValueError as e:
+            yield e
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сервис аренды жилья")
+    storage_group = parser.add_mutually_exclusive_group()
+    storage_group.add_argument("--db", help="файл SQLite для хранения данных между запусками")
+    storage_group.add_argument("--journal", metavar="DIR", help="каталог журнала операций и снимков")
+    parser.add_argument("--batch", metavar="FILE", help="выполнить команды JSON Lines из файла ('-' — stdin) без меню")
+    parser.add_argument("--output", metavar="FILE", help="куда писать результаты пакетного режима (по умолчанию stdout)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="команд в пачке пакетного режима")
+    parser.add_argument("--audit", action="store_true", help="писать в лог каждую операцию пакета")
+    args = parser.parse_args(argv)
+
+    def open_app() -> RentalApp:
+        return RentalApp(
+            SQLiteStorage(args.db) if args.db else None,
+            Journal(args.journal) if args.journal else None,
+        )
+
+    if not args.batch:
+        open_app().run()
+        return 0
+
+    # Файлы открываются до приложения: ошибка открытия не оставит незакрытыми базу или журнал
+    with ExitStack() as files:
+        source = sys.stdin if args.batch == "-" else files.enter_context(open(args.batch, encoding="utf-8"))
+        output = files.enter_context(open(args.output, "w", encoding="utf-8")) if args.output else sys.stdout
+        app = open_app()
+        try:
+            report = app.run_batch_file(source, output, args.chunk_size, args.audit)
+        finally:
+            app.close()
+    print(
+        f"Выполнено команд: {report.total}, ошибок: {report.failed}, "
+        f"{report.seconds:.2f} с, {report.ops_per_sec:.0f} оп/с",
+        file=sys.stderr,
+    )
+    return 1 if report.failed else 0
 
 
 if __name__ == "__main__":
-    app = RentalApp()
-    app.run()
+    sys.exit(main())
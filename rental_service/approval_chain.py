@@ -1,34 +1,114 @@
-from abc import ABC, abstractmethod
+from abc import ABC
+from typing import Dict, Iterable, List, Optional
+from rental_service.metrics import instrumented
+
+NOT_HANDLED = "Запрос не обработан."
 
 
 class Handler(ABC):
-    """Базовый класс для звеньев цепочки."""
+    """Базовый класс для звеньев цепочки.
+
+    request_type — тип запроса, который одобряет звено; None — звено одобряет
+    любой запрос (как Director) и завершает цепочку.
+
+    Новые звенья переопределяют approve. Звенья старого вида, переопределяющие
+    только handle_request и сами решающие, передавать ли запрос дальше, тоже
+    работают: для них request_type остается None, и approve по умолчанию
+    отдает запрос их handle_request.
+    """
+
+    request_type: Optional[str] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.approve is Handler.approve and cls.handle_request is Handler.handle_request:
+            raise TypeError(f"{cls.__name__} должен переопределить approve или handle_request")
+
     def __init__(self, next_handler=None):
+        if type(self) is Handler:
+            raise TypeError("Handler — базовый класс: создавайте его подклассы")
         self.next_handler = next_handler
 
-    @abstractmethod
-    def handle_request(self, request: dict):
-        pass
+    def approve(self, request: dict) -> str:
+        """Одобряет запрос, дошедший до этого звена (по умолчанию — handle_request звена старого вида)."""
+        return self.handle_request(request)
+
+    @instrumented("handle_request")
+    def handle_request(self, request: dict) -> str:
+        """Передает запрос по цепочке до первого подходящего звена (без рекурсии)."""
+        request_type = request.get("type")
+        handler = self
+        while handler is not None:
+            if handler.request_type is None or handler.request_type == request_type:
+                return handler.approve(request)
+            handler = handler.next_handler
+        return NOT_HANDLED
+
+    def compile(self) -> "CompiledChain":
+        """Таблица маршрутизации для цепочки, начинающейся с этого звена."""
+        return CompiledChain(self)
+
+    def handle_requests(self, requests: Iterable[dict]) -> List[str]:
+        return self.compile().handle_requests(requests)
 
 
 class RentalManager(Handler):
-    def handle_request(self, request: dict):
-        if request.get("type") == "minor":
-            return "Изменение одобрено менеджером."
-        elif self.next_handler:
-            return self.next_handler.handle_request(request)
-        return "Запрос не обработан."
+    request_type = "minor"
+
+    def approve(self, request: dict) -> str:
+        return "Изменение одобрено менеджером."
 
 
 class FinanceDepartment(Handler):
-    def handle_request(self, request: dict):
-        if request.get("type") == "financial":
-            return "Изменение одобрено финансовым отделом."
-        elif self.next_handler:
-            return self.next_handler.handle_request(request)
-        return "Запрос не обработан."
+    request_type = "financial"
+
+    def approve(self, request: dict) -> str:
+        return "Изменение одобрено финансовым отделом."
 
 
 class Director(Handler):
-    def handle_request(self, request: dict):
+    def approve(self, request: dict) -> str:
         return "Изменение одобрено директором."
+
+
+class CompiledChain:
+    """Цепочка, скомпилированная в таблицу «тип запроса -> звено».
+
+    Семантика та же, что у обхода цепочки: запрос получает первое звено с его
+    типом, иначе первое универсальное звено (Director), иначе NOT_HANDLED.
+    Маршрут ищется за O(1) независимо от длины цепочки. Таблица — снимок:
+    после изменения next_handler цепочку нужно скомпилировать заново.
+    """
+
+    def __init__(self, chain: Handler):
+        self.__routes: Dict[str, Handler] = {}
+        self.__fallback: Optional[Handler] = None
+        handler = chain
+        while handler is not None:
+            if handler.request_type is None:
+                self.__fallback = handler  # дальше него запросы не проходят
+                break
+            self.__routes.setdefault(handler.request_type, handler)  # первое совпадение
+            handler = handler.next_handler
+
+    def route(self, request: dict) -> Optional[Handler]:
+        return self.__routes.get(request.get("type"), self.__fallback)
+
+    @instrumented("handle_request")
+    def handle_request(self, request: dict) -> str:
+        handler = self.route(request)
+        return handler.approve(request) if handler is not None else NOT_HANDLED
+
+    @instrumented("handle_requests")
+    def handle_requests(self, requests: Iterable[dict]) -> List[str]:
+        """Пакетное одобрение: ответы в порядке запросов."""
+        routes_get, fallback = self.__routes.get, self.__fallback
+        results = []
+        append = results.append
+        for request in requests:
+            handler = routes_get(request.get("type"), fallback)
+            append(handler.approve(request) if handler is not None else NOT_HANDLED)
+        return results
+
+    def __len__(self) -> int:
+        return len(self.__routes) + (self.__fallback is not None)
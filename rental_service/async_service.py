@@ -0,0 +1,81 @@
+# rental_service/async_service.py
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+from rental_service.approval_chain import Director, FinanceDepartment, Handler, RentalManager
+
+
+class AsyncRentalService:
+    """Асинхронный слой над синхронными процессами аренды, договорами и цепочкой одобрения.
+
+    - Блокирующие операции (блокировка объекта при бронировании, постановка
+      уведомления в очередь с backpressure) выполняются в пуле потоков,
+      цикл событий не останавливается.
+    - Чисто вычислительные операции (цепочка одобрения, расчет стоимости —
+      их лог уходит в очередь без ожидания) выполняются прямо в цикле событий:
+      переход в поток стоил бы дороже самой операции.
+    - Одновременно выполняется не больше max_concurrency запросов, остальные ждут.
+    - timeout ограничивает весь запрос, включая ожидание в очереди; по истечении
+      вызывающий код получает TimeoutError. Операция, уже запущенная в потоке,
+      доработает до конца — прервать поток нельзя.
+    """
+
+    def __init__(
+        self,
+        chain: Optional[Handler] = None,
+        max_concurrency: int = 64,
+        timeout: Optional[float] = 5.0,
+        executor: Optional[Executor] = None,
+        max_workers: int = 8,
+    ):
+        self.chain = chain if chain is not None else RentalManager(FinanceDepartment(Director()))
+        self.__router = self.chain.compile()
+        self.timeout = timeout
+        self.__own_executor = executor is None
+        self.__executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rental-async")
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __in_executor(self, func, *args):
+        async with self.__semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.__executor, partial(func, *args))
+
+    async def __inline(self, func, *args):
+        async with self.__semaphore:
+            return func(*args)
+
+    async def __with_timeout(self, coro, timeout: Optional[float]):
+        return await asyncio.wait_for(coro, self.timeout if timeout is None else timeout)
+
+    # --- Операции ---
+    async def rent_property(self, process, property_obj, tenant_obj, timeout: Optional[float] = None) -> str:
+        """Аренда через RentalProcess (онлайн или оффлайн)."""
+        return await self.__with_timeout(
+            self.__in_executor(process.rent_property, property_obj, tenant_obj), timeout
+        )
+
+    async def handle_request(self, request: dict, timeout: Optional[float] = None) -> str:
+        """Обработка запроса на изменение цепочкой одобрения."""
+        return await self.__with_timeout(self.__inline(self.__router.handle_request, request), timeout)
+
+    async def calculate_total(self, agreement, months: int, timeout: Optional[float] = None) -> float:
+        """Расчет полной стоимости договора."""
+        return await self.__with_timeout(self.__inline(agreement.calculate_total, months), timeout)
+
+    # --- Завершение ---
+    def close(self):
+        """Синхронное завершение: ждет операции в пуле (не вызывать из цикла событий)."""
+        if self.__own_executor:
+            self.__executor.shutdown(wait=True)
+
+    async def aclose(self):
+        """Завершение из цикла событий: ожидание пула уходит в отдельный поток."""
+        if self.__own_executor:
+            await asyncio.to_thread(self.__executor.shutdown, wait=True)
+
+    async def __aenter__(self) -> "AsyncRentalService":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
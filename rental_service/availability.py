@@ -0,0 +1,232 @@
+# rental_service/availability.py
+import random
+from bisect import bisect_left
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from rental_service.exceptions import BookingConflictError
+from rental_service.indexes import PropertyIndex, RepositoryIndex
+
+
+def parse_date(value) -> date:
+    """Приводит дату (date, datetime или строку YYYY-MM-DD) к date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value.strip())
+        except ValueError:
+            pass
+    raise ValueError(f"Некорректная дата: {value!r}, ожидается формат YYYY-MM-DD")
+
+
+def parse_period(start, end) -> Tuple[date, date]:
+    """Проверяет период аренды [start, end): конец строго позже начала."""
+    start, end = parse_date(start), parse_date(end)
+    if end <= start:
+        raise ValueError(f"Дата окончания {end} должна быть позже даты начала {start}")
+    return start, end
+
+
+# --- Интервальное дерево ---
+class _Node:
+    __slots__ = ("start", "end", "key", "value", "priority", "max_end", "left", "right")
+
+    def __init__(self, start: int, end: int, key, value, priority: float):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.value = value
+        self.priority = priority
+        self.max_end = end
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+
+
+def _update(node: _Node):
+    max_end = node.end
+    if node.left is not None and node.left.max_end > max_end:
+        max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > max_end:
+        max_end = node.right.max_end
+    node.max_end = max_end
+
+
+def _split(node: Optional[_Node], key: tuple):
+    """Делит дерево на узлы с (start, key) < key и все остальные."""
+    if node is None:
+        return None, None
+    if (node.start, node.key) < key:
+        left, right = _split(node.right, key)
+        node.right = left
+        _update(node)
+        return node, right
+    left, right = _split(node.left, key)
+    node.left = right
+    _update(node)
+    return left, node
+
+
+def _merge(a: Optional[_Node], b: Optional[_Node]) -> Optional[_Node]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.priority > b.priority:
+        a.right = _merge(a.right, b)
+        _update(a)
+        return a
+    b.left = _merge(a, b.left)
+    _update(b)
+    return b
+
+
+class IntervalTree:
+    """Интервальное дерево на декартовом дереве (treap), упорядоченном по началу.
+
+    Каждый узел хранит максимальный конец интервала в своем поддереве, поэтому
+    поиск пересечений отсекает поддеревья целиком: O(log n + k).
+    Интервалы полуоткрытые: [start, end).
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.__root: Optional[_Node] = None
+        self.__size = 0
+        self.__random = random.Random(seed)
+
+    def insert(self, start: int, end: int, key, value):
+        node = _Node(start, end, key, value, self.__random.random())
+        left, right = _split(self.__root, (start, key))
+        self.__root = _merge(_merge(left, node), right)
+        self.__size += 1
+
+    def remove(self, start: int, end: int, key) -> bool:
+        left, rest = _split(self.__root, (start, key))
+        found, right = _split(rest, (start, key, 1))  # ровно узел с ключом (start, key)
+        self.__root = _merge(left, right)
+        if found is None:
+            return False
+        self.__size -= 1
+        return True
+
+    def overlapping(self, start: int, end: int) -> Iterator:
+        """Значения всех интервалов, пересекающих [start, end)."""
+        stack = [self.__root] if self.__root is not None else []
+        while stack:
+            node = stack.pop()
+            if node.max_end <= start:
+                continue  # в поддереве все интервалы заканчиваются до start
+            if node.left is not None:
+                stack.append(node.left)
+            if node.start < end:
+                if node.end > start:
+                    yield node.value
+                if node.right is not None:
+                    stack.append(node.right)
+
+    def __len__(self) -> int:
+        return self.__size
+
+
+# --- Календарь занятости ---
+class _Units(PropertyIndex):
+    """Объекты недвижимости, известные календарю (индекс PropertyRepository)."""
+
+    def __init__(self):
+        self.by_id: Dict[int, object] = {}
+
+    def add(self, prop):
+        self.by_id[prop.property_id] = prop
+
+    def remove(self, prop):
+        self.by_id.pop(prop.property_id, None)
+
+    def property_changed(self, prop, field: str, old, new):
+        pass  # ID объекта не меняется
+
+
+class AvailabilityCalendar(RepositoryIndex):
+    """Календарь занятости недвижимости, построенный по договорам аренды.
+
+    Подключается к AgreementRepository как индекс. Для каждого объекта хранятся
+    отсортированные непересекающиеся периоды аренды (проверка одного объекта —
+    O(log k)), а общее интервальное дерево отвечает, какие объекты заняты в период.
+    Чтобы free_units знал и объекты без договоров, units подключается индексом
+    к PropertyRepository: properties.add_index(calendar.units).
+    """
+
+    def __init__(self):
+        self.units = _Units()
+        self.__tree = IntervalTree()
+        # ID объекта -> (начала, концы, ID договоров), отсортировано по началу
+        self.__periods: Dict[int, Tuple[List[int], List[int], List[int]]] = {}
+
+    @staticmethod
+    def __ordinals(start, end) -> Tuple[int, int]:
+        start, end = parse_period(start, end)
+        return start.toordinal(), end.toordinal()
+
+    def __is_free(self, property_id: int, start: int, end: int) -> bool:
+        periods = self.__periods.get(property_id)
+        if periods is None:
+            return True
+        starts, ends, _ = periods
+        i = bisect_left(starts, end)  # периоды [0, i) начинаются раньше end
+        return i == 0 or ends[i - 1] <= start
+
+    # --- Обновление индекса ---
+    def add(self, agreement):
+        property_id = agreement.property_.property_id
+        start, end = self.__ordinals(agreement.start_date, agreement.end_date)
+        if not self.__is_free(property_id, start, end):
+            raise BookingConflictError(
+                f"Недвижимость {property_id} уже арендована на часть периода "
+                f"{agreement.start_date} — {agreement.end_date}"
+            )
+        starts, ends, ids = self.__periods.setdefault(property_id, ([], [], []))
+        i = bisect_left(starts, start)
+        starts.insert(i, start)
+        ends.insert(i, end)
+        ids.insert(i, agreement.agreement_id)
+        self.__tree.insert(start, end, agreement.agreement_id, property_id)
+
+    def remove(self, agreement):
+        property_id = agreement.property_.property_id
+        start, end = self.__ordinals(agreement.start_date, agreement.end_date)
+        periods = self.__periods.get(property_id)
+        if periods is None or agreement.agreement_id not in periods[2]:
+            return
+        starts, ends, ids = periods
+        i = ids.index(agreement.agreement_id)
+        del starts[i], ends[i], ids[i]
+        if not ids:
+            del self.__periods[property_id]
+        self.__tree.remove(start, end, agreement.agreement_id)
+
+    # --- Запросы ---
+    def is_free(self, property_id: int, start, end) -> bool:
+        """Свободен ли объект на период [start, end)."""
+        return self.__is_free(property_id, *self.__ordinals(start, end))
+
+    def busy_units(self, start, end) -> Set[int]:
+        """ID объектов, занятых хотя бы часть периода [start, end)."""
+        return set(self.__tree.overlapping(*self.__ordinals(start, end)))
+
+    def free_units(self, start, end, properties: Optional[Iterable] = None) -> List:
+        """Объекты, свободные на весь период [start, end), по возрастанию ID.
+
+        Без properties ответ строится из известных календарю объектов (units):
+        занятые берутся запросом к дереву за O(log n + b), свободные — разностью
+        множеств ID без проверки каждого объекта в Python. С properties каждый
+        объект переданного набора проверяется по очереди — O(n), порядок набора.
+        """
+        busy = self.busy_units(start, end)
+        if properties is not None:
+            return [p for p in properties if p.property_id not in busy]
+        units = self.units.by_id
+        return [units[pid] for pid in sorted(units.keys() - busy)]
+
+    def periods(self, property_id: int) -> List[Tuple[date, date]]:
+        starts, ends, _ = self.__periods.get(property_id, ((), (), ()))
+        return [(date.fromordinal(s), date.fromordinal(e)) for s, e in zip(starts, ends)]
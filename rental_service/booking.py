@@ -0,0 +1,55 @@
+# rental_service/booking.py
+import threading
+from contextlib import contextmanager
+from typing import List, NamedTuple, Optional
+from rental_service.property_base import Property
+
+CONFLICT_UNAVAILABLE = "Недвижимость недоступна."
+CONFLICT_STALE_VERSION = "Недвижимость изменилась с момента проверки."
+
+
+class BookingResult(NamedTuple):
+    success: bool
+    property_id: int
+    version: int  # версия объекта после попытки бронирования
+    message: str
+
+
+class BookingEngine:
+    """Атомарное бронирование недвижимости.
+
+    Проверка доступности и смена is_available выполняются под блокировкой
+    объекта, поэтому параллельные запросы не могут забронировать его дважды.
+    Блокировки полосатые (lock striping): stripes блокировок на все объекты,
+    а не по одной на объект, чтобы не тратить память на миллионы объектов.
+    """
+
+    def __init__(self, stripes: int = 64):
+        self.__locks: List[threading.RLock] = [threading.RLock() for _ in range(stripes)]
+
+    def lock_for(self, prop: Property) -> threading.RLock:
+        return self.__locks[hash(prop.property_id) % len(self.__locks)]
+
+    @contextmanager
+    def locked(self, prop: Property):
+        with self.lock_for(prop):
+            yield prop
+
+    def try_book(self, prop: Property, expected_version: Optional[int] = None) -> BookingResult:
+        """Compare-and-set: бронирует объект, только если он доступен и (если задано)
+        его версия не изменилась с момента, когда вызывающий код его прочитал."""
+        with self.lock_for(prop):
+            if not prop.is_available:
+                return BookingResult(False, prop.property_id, prop.version, CONFLICT_UNAVAILABLE)
+            if expected_version is not None and prop.version != expected_version:
+                return BookingResult(False, prop.property_id, prop.version, CONFLICT_STALE_VERSION)
+            prop.is_available = False
+            return BookingResult(True, prop.property_id, prop.version, "Забронировано.")
+
+    def release(self, prop: Property) -> BookingResult:
+        with self.lock_for(prop):
+            prop.is_available = True
+            return BookingResult(True, prop.property_id, prop.version, "Бронь снята.")
+
+
+default_engine = BookingEngine()
@@ -1,10 +1,39 @@
 # rental_service/client_base.py
-from typing import Dict, Any
+import re
+from typing import Dict, Any, List, Optional
+
+_NON_DIGITS = re.compile(r"\D")
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Email в нижнем регистре без пробелов по краям; None — пустой или некорректный."""
+    if not email:
+        return None
+    email = email.strip().lower()
+    return email if _EMAIL.match(email) else None
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Телефон в виде цифр с кодом страны: 8 (999) 123-45-67 -> 79991234567.
+
+    None — пустой или слишком короткий номер.
+    """
+    if not phone:
+        return None
+    digits = _NON_DIGITS.sub("", phone)
+    if len(digits) == 10:
+        digits = "7" + digits
+    elif len(digits) == 11 and digits[0] == "8":
+        digits = "7" + digits[1:]
+    return digits if 11 <= len(digits) <= 15 else None
 
 
 class Tenant:
     """Класс, представляющий арендатора (композиция в RentalAgreement)."""
 
+    __slots__ = ("__tenant_id", "__name", "__email", "__phone")
+
     def __init__(self, tenant_id: int, name: str, email: str, phone: str):
         self.__tenant_id = tenant_id
         self.__name = name
@@ -31,6 +60,23 @@ class Tenant:
     def __str__(self) -> str:
         return f"Арендатор: {self.__name} ({self.__email})"
 
+    def merge(self, name: str = "", email: str = "", phone: str = "") -> List[str]:
+        """Заполняет пустые поля данными из другой записи того же арендатора.
+
+        Заполненные поля не перезаписываются. Возвращает имена измененных полей.
+        """
+        changed = []
+        if name and not self.__name:
+            self.__name = name
+            changed.append("name")
+        if email and not self.__email:
+            self.__email = email
+            changed.append("email")
+        if phone and not self.__phone:
+            self.__phone = phone
+            changed.append("phone")
+        return changed
+
     # --- Сериализация ---
     def to_dict(self) -> Dict[str, Any]:
         return {
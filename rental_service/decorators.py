@@ -1,19 +1,173 @@
+import atexit
+import threading
+import time
+from datetime import datetime
 from functools import wraps
+from typing import Dict, Iterable, List, Optional, Tuple
 from rental_service.exceptions import PermissionDeniedError
+from rental_service.mixins import logger
 
 
-def check_permissions(required_role: str):
+class RolePolicy:
+    """Роли с наследованием прав.
+
+    Каждой роли назначается свой бит; эффективная маска роли — ее бит и биты
+    всех ролей, от которых она наследует. Доступ разрешен, если маска роли
+    пользователя пересекается с маской требуемых ролей метода.
+    """
+
+    def __init__(self):
+        self.__bits: Dict[str, int] = {}
+        self.__parents: Dict[str, Tuple[str, ...]] = {}
+        # Роль -> эффективная маска. Словарь обновляется на месте, поэтому
+        # уже декорированные методы видят изменения иерархии.
+        self.masks: Dict[str, int] = {}
+
+    def add_role(self, name: str, inherits: Iterable[str] = ()) -> int:
+        """Добавляет роль (или меняет ее родителей); возвращает бит роли."""
+        inherits = tuple(inherits)
+        for parent in inherits:
+            if parent not in self.__bits:
+                self.add_role(parent)
+        if name not in self.__bits:
+            self.__bits[name] = 1 << len(self.__bits)
+        previous = self.__parents.get(name, ())
+        self.__parents[name] = inherits
+        try:
+            self.__resolve()
+        except ValueError:
+            self.__parents[name] = previous
+            raise
+        return self.__bits[name]
+
+    def __resolve(self):
+        resolved: Dict[str, int] = {}
+
+        def mask(role: str, path: Tuple[str, ...]) -> int:
+            if role in path:
+                raise ValueError(f"Циклическое наследование ролей: {' -> '.join(path + (role,))}")
+            if role not in resolved:
+                value = self.__bits[role]
+                for parent in self.__parents[role]:
+                    value |= mask(parent, path + (role,))
+                resolved[role] = value
+            return resolved[role]
+
+        for role in self.__bits:
+            mask(role, ())
+        self.masks.clear()
+        self.masks.update(resolved)
+
+    def required_mask(self, roles: Iterable[str]) -> int:
+        """Маска требуемых ролей; неизвестная роль ничего не добавляет (политика не меняется)."""
+        value = 0
+        for role in roles:
+            value |= self.__bits.get(role, 0)
+        return value
+
+    def allows(self, role: str, *required: str) -> bool:
+        return bool(self.masks.get(role, 0) & self.required_mask(required))
+
+    @property
+    def roles(self) -> List[str]:
+        return list(self.__bits)
+
+
+default_policy = RolePolicy()
+default_policy.add_role("guest")
+default_policy.add_role("agent")
+default_policy.add_role("manager", inherits=("agent",))
+default_policy.add_role("admin", inherits=("manager",))
+
+
+class DenialAudit:
+    """Буферизованный журнал отказов в доступе.
+
+    Отказ только добавляется в буфер; в лог записи уходят одним сообщением
+    на batch_size отказов, при flush(), close() или при завершении процесса.
+    Выход процесса отслеживается с первого отказа до close().
+    """
+
+    def __init__(self, batch_size: int = 100):
+        self.batch_size = batch_size
+        self.total = 0
+        self.__buffer: List[Tuple[float, str, str, str]] = []
+        self.__lock = threading.Lock()
+        self.__registered = False
+
+    def record(self, role: str, method: str, required: str):
+        with self.__lock:
+            if not self.__registered:
+                atexit.register(self.flush)
+                self.__registered = True
+            self.__buffer.append((time.time(), role, method, required))
+            self.total += 1
+            if len(self.__buffer) < self.batch_size:
+                return
+            batch, self.__buffer = self.__buffer, []
+        self.__write(batch)
+
+    def flush(self):
+        with self.__lock:
+            batch, self.__buffer = self.__buffer, []
+        if batch:
+            self.__write(batch)
+
+    def close(self):
+        """Записывает остаток буфера и снимает обработчик завершения процесса."""
+        self.flush()
+        with self.__lock:
+            if self.__registered:
+                atexit.unregister(self.flush)
+                self.__registered = False
+
+    @staticmethod
+    def __write(batch):
+        # Текст пачки собирается лениво — в потоке записи логов (см. mixins)
+        logger.warning("Отказано в доступе (%s):\n%s", len(batch), _DenialBatch(batch))
+
+
+class _DenialBatch(list):
+    def __str__(self) -> str:
+        return "\n".join(
+            f"{datetime.fromtimestamp(t).isoformat(timespec='milliseconds')} "
+            f"роль={role} метод={method} требуется={required}"
+            for t, role, method, required in self
+        )
+
+
+denial_audit = DenialAudit()
+
+
+def check_permissions(*required_roles: str, policy: Optional[RolePolicy] = None, audit: Optional[DenialAudit] = None):
     """
     Декоратор для проверки прав пользователя перед выполнением метода.
+
+    Разрешает вызов, если роль пользователя (self.user_role) или одна из ролей,
+    от которых она наследует, входит в required_roles. Маска требуемых ролей
+    вычисляется один раз при декорировании; при вызове — поиск маски роли
+    в словаре и побитовое И.
     """
+    if not required_roles:
+        raise ValueError("Нужно указать хотя бы одну роль")
+    policy = policy or default_policy
+    audit = audit or denial_audit
+    for role in required_roles:
+        if role not in policy.masks:
+            policy.add_role(role)  # роль впервые объявлена декоратором
+    required = policy.required_mask(required_roles)
+    masks = policy.masks
+    required_text = "|".join(required_roles)
+
     def decorator(func):
+        method = func.__qualname__
+
         @wraps(func)
         def wrapper(self, *args, **kwargs):
             user_role = getattr(self, "user_role", "guest")
-            if user_role != required_role:
-                raise PermissionDeniedError(
-                    f"Недостаточно прав: требуется '{required_role}', а у пользователя '{user_role}'."
-                )
-            return func(self, *args, **kwargs)
+            if masks.get(user_role, 0) & required:
+                return func(self, *args, **kwargs)
+            audit.record(user_role, method, required_text)
+            raise PermissionDeniedError(required=required_text, role=user_role)
         return wrapper
     return decorator
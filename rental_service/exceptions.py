@@ -4,10 +4,28 @@ class InvalidPropertyError(Exception):
 
 
 class PermissionDeniedError(Exception):
-    """Ошибка: у пользователя нет прав доступа."""
-    pass
+    """Ошибка: у пользователя нет прав доступа.
+
+    check_permissions передает required и role, а текст сообщения собирается
+    только при обращении к нему.
+    """
+
+    def __init__(self, *args, required: str = None, role: str = None):
+        super().__init__(*args)
+        self.required = required
+        self.role = role
+
+    def __str__(self) -> str:
+        if self.args:
+            return super().__str__()
+        return f"Недостаточно прав: требуется '{self.required}', а у пользователя '{self.role}'."
 
 
 class RentalNotFoundError(Exception):
     """Ошибка: аренда не найдена."""
     pass
+
+
+class BookingConflictError(Exception):
+    """Ошибка: недвижимость уже забронирована другим запросом."""
+    pass
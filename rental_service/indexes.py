@@ -0,0 +1,380 @@
+# rental_service/indexes.py
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from heapq import nsmallest
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from rental_service.interfaces import PropertyObserver
+from rental_service.property_base import Property
+
+
+class RepositoryIndex(ABC):
+    """Вторичный индекс, который репозиторий поддерживает в актуальном состоянии."""
+
+    @abstractmethod
+    def add(self, item):
+        """Добавляет объект в индекс."""
+        pass
+
+    @abstractmethod
+    def remove(self, item):
+        """Удаляет объект из индекса."""
+        pass
+
+
+class PropertyIndex(RepositoryIndex, PropertyObserver):
+    """Индекс недвижимости: дополнительно получает изменения полей через сеттеры."""
+
+
+class AddressIndex(PropertyIndex):
+    """Инвертированный триграммный индекс по адресу для поиска подстроки."""
+
+    N = 3
+
+    def __init__(self):
+        self.__postings: Dict[str, Set[int]] = {}
+        self.__addresses: Dict[int, str] = {}  # ID -> нормализованный адрес
+        self.__properties: Dict[int, Property] = {}
+        self.__short: Set[int] = set()  # адреса короче N символов (без триграмм)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return text.strip().lower()
+
+    @classmethod
+    def grams(cls, text: str) -> Set[str]:
+        n = cls.N
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    # --- Обновление индекса ---
+    def add(self, prop: Property):
+        pid = prop.property_id
+        self.__properties[pid] = prop
+        self.__index(pid, self.normalize(prop.address))
+
+    def remove(self, prop: Property):
+        pid = prop.property_id
+        self.__properties.pop(pid, None)
+        self.__unindex(pid)
+
+    def property_changed(self, prop: Property, field: str, old, new):
+        if field == "address":
+            pid = prop.property_id
+            self.__unindex(pid)
+            self.__index(pid, self.normalize(new))
+
+    def __index(self, pid: int, address: str):
+        self.__addresses[pid] = address
+        if len(address) < self.N:
+            self.__short.add(pid)
+            return
+        for gram in self.grams(address):
+            self.__postings.setdefault(gram, set()).add(pid)
+
+    def __unindex(self, pid: int):
+        address = self.__addresses.pop(pid, None)
+        if address is None:
+            return
+        self.__short.discard(pid)
+        for gram in self.grams(address):
+            ids = self.__postings.get(gram)
+            if ids is not None:
+                ids.discard(pid)
+                if not ids:
+                    del self.__postings[gram]
+
+    # --- Поиск ---
+    def __candidates(self, query: str) -> Set[int]:
+        if len(query) >= self.N:
+            postings = []
+            for gram in self.grams(query):
+                ids = self.__postings.get(gram)
+                if not ids:
+                    return set()
+                postings.append(ids)
+            postings.sort(key=len)
+            return postings[0].intersection(*postings[1:])
+        # Короткий запрос: объединяем списки триграмм, содержащих запрос.
+        found = set(self.__short)
+        for gram, ids in self.__postings.items():
+            if query in gram:
+                found |= ids
+        return found
+
+    @staticmethod
+    def rank(address: str, query: str, position: int):
+        """Ключ качества совпадения: точное, с начала, с начала слова, внутри слова."""
+        if address == query:
+            kind = 0
+        elif position == 0:
+            kind = 1
+        elif not address[position - 1].isalnum():
+            kind = 2
+        else:
+            kind = 3
+        return kind, position, len(address)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Property]:
+        """Возвращает объекты, адрес которых содержит запрос, от лучших совпадений к худшим."""
+        query = self.normalize(query)
+        addresses = self.__addresses
+        candidates = self.__candidates(query) if query else addresses
+        ranked = []
+        for pid in candidates:
+            address = addresses[pid]
+            position = address.find(query)
+            if position >= 0:
+                ranked.append(self.rank(address, query, position) + (pid,))
+        ranked = nsmallest(limit, ranked) if limit is not None else sorted(ranked)
+        return [self.__properties[key[-1]] for key in ranked]
+
+    def __len__(self) -> int:
+        return len(self.__addresses)
+
+
+class RateIndex(PropertyIndex):
+    """Отсортированный индекс по месячной ставке с фильтрами по типу и доступности.
+
+    Для каждой комбинации фильтров (тип или любой, доступность или любая) хранится
+    отдельный отсортированный список (ставка, ID, объект), поэтому min/max — O(1),
+    выборка диапазона и перцентиль — O(log n).
+    """
+
+    def __init__(self):
+        self.__buckets: Dict[Tuple[Optional[str], Optional[bool]], List[tuple]] = {}
+
+    @staticmethod
+    def __keys(property_type: str, is_available: bool):
+        return (None, None), (property_type, None), (None, is_available), (property_type, is_available)
+
+    def __insert(self, prop: Property, rate: float, is_available: bool):
+        entry = (rate, prop.property_id, prop)
+        for key in self.__keys(type(prop).__name__.lower(), bool(is_available)):
+            insort(self.__buckets.setdefault(key, []), entry)
+
+    def __delete(self, prop: Property, rate: float, is_available: bool):
+        probe = (rate, prop.property_id)
+        for key in self.__keys(type(prop).__name__.lower(), bool(is_available)):
+            bucket = self.__buckets[key]
+            del bucket[bisect_left(bucket, probe)]
+
+    # --- Обновление индекса ---
+    def add(self, prop: Property):
+        self.__insert(prop, prop.monthly_rate, prop.is_available)
+
+    def remove(self, prop: Property):
+        self.__delete(prop, prop.monthly_rate, prop.is_available)
+
+    def property_changed(self, prop: Property, field: str, old, new):
+        if field == "monthly_rate":
+            self.__delete(prop, old, prop.is_available)
+            self.__insert(prop, new, prop.is_available)
+        elif field == "is_available" and bool(old) != bool(new):
+            self.__delete(prop, prop.monthly_rate, old)
+            self.__insert(prop, prop.monthly_rate, new)
+
+    # --- Запросы ---
+    def __bucket(self, property_type: Optional[str], is_available: Optional[bool]) -> List[tuple]:
+        if property_type is not None:
+            property_type = property_type.lower()
+        if is_available is not None:
+            is_available = bool(is_available)
+        return self.__buckets.get((property_type, is_available), [])
+
+    def lowest(self, property_type: Optional[str] = None, is_available: Optional[bool] = None) -> Optional[Property]:
+        """Самый дешёвый объект за O(1)."""
+        bucket = self.__bucket(property_type, is_available)
+        return bucket[0][2] if bucket else None
+
+    def highest(self, property_type: Optional[str] = None, is_available: Optional[bool] = None) -> Optional[Property]:
+        """Самый дорогой объект за O(1)."""
+        bucket = self.__bucket(property_type, is_available)
+        return bucket[-1][2] if bucket else None
+
+    def between(
+        self,
+        low: float,
+        high: float,
+        property_type: Optional[str] = None,
+        is_available: Optional[bool] = None,
+    ) -> List[Property]:
+        """Объекты со ставкой в диапазоне [low, high], по возрастанию ставки."""
+        bucket = self.__bucket(property_type, is_available)
+        start = bisect_left(bucket, (low,))
+        end = bisect_right(bucket, (high, float("inf")))
+        return [entry[2] for entry in bucket[start:end]]
+
+    def percentile(
+        self,
+        q: float,
+        property_type: Optional[str] = None,
+        is_available: Optional[bool] = None,
+    ) -> Optional[float]:
+        """Перцентиль ставки (0–100) с линейной интерполяцией между соседями."""
+        if not 0 <= q <= 100:
+            raise ValueError("Перцентиль должен быть в диапазоне от 0 до 100")
+        bucket = self.__bucket(property_type, is_available)
+        if not bucket:
+            return None
+        position = (len(bucket) - 1) * q / 100
+        lower = int(position)
+        upper = min(lower + 1, len(bucket) - 1)
+        fraction = position - lower
+        return bucket[lower][0] + (bucket[upper][0] - bucket[lower][0]) * fraction
+
+    def median(self, property_type: Optional[str] = None, is_available: Optional[bool] = None) -> Optional[float]:
+        return self.percentile(50, property_type, is_available)
+
+    def cheapest(self, k: int, property_type: Optional[str] = None, is_available: Optional[bool] = None) -> List[Property]:
+        return [entry[2] for entry in self.__bucket(property_type, is_available)[:k]]
+
+    def most_expensive(
+        self,
+        k: int,
+        property_type: Optional[str] = None,
+        is_available: Optional[bool] = None,
+    ) -> List[Property]:
+        bucket = self.__bucket(property_type, is_available)
+        return [entry[2] for entry in reversed(bucket[-k:])] if k > 0 else []
+
+    def __len__(self) -> int:
+        return len(self.__buckets.get((None, None), []))
+
+
+class PortfolioTotals(NamedTuple):
+    units: int
+    rented: int  # объекты с is_available=False
+    occupancy: float  # доля сданных объектов, 0..1
+    rented_revenue: float  # сумма месячных ставок сданных объектов
+    average_rate_per_m2: float  # среднее monthly_rate / area по объектам с area > 0
+
+
+class _Aggregate:
+    __slots__ = ("units", "rented", "revenue", "rate_per_m2", "measured")
+
+    def __init__(self):
+        self.units = self.rented = self.measured = 0
+        self.revenue = self.rate_per_m2 = 0.0
+
+    def apply(self, sign: int, rate: float, area: float, rented: bool):
+        self.units += sign
+        if rented:
+            self.rented += sign
+            self.revenue += sign * rate
+        if area > 0:
+            self.measured += sign
+            self.rate_per_m2 += sign * rate / area
+        if not self.units:
+            # Пустая группа: сбрасываем накопленную ошибку округления сумм
+            self.revenue = self.rate_per_m2 = 0.0
+            self.rented = self.measured = 0
+
+    def totals(self) -> PortfolioTotals:
+        return PortfolioTotals(
+            self.units,
+            self.rented,
+            self.rented / self.units if self.units else 0.0,
+            self.revenue,
+            self.rate_per_m2 / self.measured if self.measured else 0.0,
+        )
+
+
+class PortfolioStats(PropertyIndex):
+    """Агрегаты портфеля (заполняемость, выручка сданных объектов, ставка за м²),
+    которые обновляются за O(1) при каждом изменении вместо обхода всех объектов.
+
+    Сдача в аренду (RentalAgreement.rent_property, BookingEngine) меняет
+    is_available через сеттер, поэтому тоже учитывается. Суммы копятся
+    сложением и вычитанием, так что допускают ошибку округления порядка
+    машинного эпсилон относительно полного пересчета.
+    """
+
+    def __init__(self):
+        self.__total = _Aggregate()
+        self.__by_type: Dict[str, _Aggregate] = {}
+        self.__by_class: Dict[type, _Aggregate] = {}  # тот же агрегат без lower() имени
+
+    def __aggregate(self, prop: Property) -> _Aggregate:
+        cls = type(prop)
+        aggregate = self.__by_class.get(cls)
+        if aggregate is None:
+            aggregate = self.__by_type.setdefault(cls.__name__.lower(), _Aggregate())
+            self.__by_class[cls] = aggregate
+        return aggregate
+
+    # --- Обновление индекса ---
+    def add(self, prop: Property):
+        rented = not prop.is_available
+        self.__total.apply(1, prop.monthly_rate, prop.area, rented)
+        self.__aggregate(prop).apply(1, prop.monthly_rate, prop.area, rented)
+
+    def remove(self, prop: Property):
+        rented = not prop.is_available
+        self.__total.apply(-1, prop.monthly_rate, prop.area, rented)
+        self.__aggregate(prop).apply(-1, prop.monthly_rate, prop.area, rented)
+
+    def property_changed(self, prop: Property, field: str, old, new):
+        # Частые изменения — сдвиг сумм на разницу; число объектов не меняется
+        total = self.__total
+        by_type = self.__by_class.get(type(prop)) or self.__aggregate(prop)
+        if field == "monthly_rate":
+            area = prop.area
+            if area > 0:
+                delta = (new - old) / area
+                total.rate_per_m2 += delta
+                by_type.rate_per_m2 += delta
+            if not prop.is_available:
+                total.revenue += new - old
+                by_type.revenue += new - old
+        elif field == "is_available":
+            if bool(old) == bool(new):
+                return
+            sign = -1 if new else 1
+            rate = sign * prop.monthly_rate
+            total.rented += sign
+            by_type.rented += sign
+            total.revenue += rate
+            by_type.revenue += rate
+        elif field == "area":
+            rate = prop.monthly_rate
+            if old > 0 and new > 0:
+                delta = rate / new - rate / old
+                total.rate_per_m2 += delta
+                by_type.rate_per_m2 += delta
+            else:
+                # Объект входит в среднее за м² или выходит из него
+                rented = not prop.is_available
+                for aggregate in (total, by_type):
+                    aggregate.apply(-1, rate, old, rented)
+                    aggregate.apply(1, rate, new, rented)
+
+    # --- Запросы ---
+    def totals(self, property_type: Optional[str] = None) -> PortfolioTotals:
+        """Агрегаты по всему портфелю или по одному типу недвижимости за O(1)."""
+        if property_type is None:
+            return self.__total.totals()
+        aggregate = self.__by_type.get(property_type.lower())
+        return aggregate.totals() if aggregate is not None else _Aggregate().totals()
+
+    def by_type(self) -> Dict[str, PortfolioTotals]:
+        return {name: aggregate.totals() for name, aggregate in self.__by_type.items() if aggregate.units}
+
+    def occupancy(self, property_type: Optional[str] = None) -> float:
+        return self.totals(property_type).occupancy
+
+    def rented_revenue(self, property_type: Optional[str] = None) -> float:
+        return self.totals(property_type).rented_revenue
+
+    def average_rate_per_m2(self, property_type: Optional[str] = None) -> float:
+        return self.totals(property_type).average_rate_per_m2
+
+    @staticmethod
+    def recompute(properties, property_type: Optional[str] = None) -> PortfolioTotals:
+        """Те же агрегаты полным проходом по объектам (для проверки и отладки)."""
+        aggregate = _Aggregate()
+        for prop in properties:
+            if property_type is None or type(prop).__name__.lower() == property_type.lower():
+                aggregate.apply(1, prop.monthly_rate, prop.area, not prop.is_available)
+        return aggregate.totals()
+
+    def __len__(self) -> int:
+        return self.__total.units
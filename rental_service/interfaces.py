@@ -5,6 +5,8 @@ from abc import ABC, abstractmethod
 class Rentable(ABC):
     """Интерфейс для аренды недвижимости."""
 
+    __slots__ = ()
+
     @abstractmethod
     def rent_property(self):
         """Оформить аренду недвижимости."""
@@ -14,7 +16,20 @@ class Rentable(ABC):
 class Reportable(ABC):
     """Интерфейс для создания отчётов."""
 
+    __slots__ = ()
+
     @abstractmethod
     def generate_report(self) -> str:
         """Сгенерировать отчет об аренде."""
         pass
+
+
+class PropertyObserver(ABC):
+    """Интерфейс наблюдателя за изменениями объекта недвижимости."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def property_changed(self, prop, field: str, old, new):
+        """Вызывается после изменения поля объекта недвижимости."""
+        pass
@@ -0,0 +1,229 @@
+# rental_service/journal.py
+"""Журнал операций (write-ahead log) со снимками состояния.
+
+Файлы в каталоге журнала:
+  snapshot.<seq>.jsonl — полное состояние после операции seq: первая строка —
+                         счетчики ID {"kind": "ids", ...}, далее формат serialization;
+  journal.<seq>.jsonl  — операции с номерами больше seq, по одной строке
+                         [seq, "операция", {аргументы}].
+
+Восстановление загружает последний снимок и повторяет только операции после него.
+Последняя строка журнала, оборванная сбоем посреди записи, отбрасывается.
+"""
+import json
+import os
+import re
+import threading
+from itertools import islice
+from typing import IO, Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from rental_service.serialization import dump_jsonl, load_into
+
+_SNAPSHOT = re.compile(r"^snapshot\.(\d+)\.jsonl$")
+_SEGMENT = re.compile(r"^journal\.(\d+)\.jsonl$")
+READ_CHUNK = 10_000  # строк журнала на один вызов decode()
+
+_REPOSITORIES = ("properties", "tenants", "agreements")  # порядок аргументов snapshot/recover
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+_decode = json.JSONDecoder().decode
+
+
+class JournalCorruptedError(Exception):
+    """Ошибка: журнал поврежден не в последней строке (не обрыв записи)."""
+    pass
+
+
+class RecoveryReport(NamedTuple):
+    snapshot_seq: int  # 0 — снимка не было
+    loaded: int  # записей загружено из снимка
+    replayed: int  # операций повторено из журнала
+    truncated: bool  # отброшена оборванная последняя строка
+
+
+class Journal:
+    """Журнал операций с групповой фиксацией и периодическими снимками.
+
+    append() только кладет запись в буфер; запись в файл с fsync выполняется
+    одним вызовом на group_size операций или при commit(). Операция считается
+    сохраненной после commit(). snapshot_every — через сколько операций
+    needs_snapshot предлагает сделать снимок.
+    """
+
+    def __init__(self, directory: str, group_size: int = 256, fsync: bool = True, snapshot_every: int = 100_000):
+        self.directory = directory
+        self.group_size = group_size
+        self.fsync = fsync
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+        self.__lock = threading.RLock()
+        self.__buffer: List[str] = []
+        self.__file: Optional[IO[str]] = None
+        self.__seq = 0
+        self.__snapshot_seq = 0
+        self.__recovered = False
+
+    @property
+    def seq(self) -> int:
+        """Номер последней записанной операции."""
+        return self.__seq
+
+    @property
+    def needs_snapshot(self) -> bool:
+        return self.__seq - self.__snapshot_seq >= self.snapshot_every
+
+    # --- Файлы ---
+    def __path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def __files(self, pattern) -> List[Tuple[int, str]]:
+        found = []
+        for name in os.listdir(self.directory):
+            match = pattern.match(name)
+            if match:
+                found.append((int(match.group(1)), self.__path(name)))
+        return sorted(found)
+
+    def __sync_directory(self):
+        if self.fsync and hasattr(os, "O_DIRECTORY"):
+            fd = os.open(self.directory, os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def __open_segment(self):
+        if self.__file is not None:
+            self.__file.close()
+        self.__file = open(self.__path(f"journal.{self.__seq}.jsonl"), "a", encoding="utf-8")
+        self.__sync_directory()
+
+    # --- Запись ---
+    def append(self, op: str, args: Dict[str, Any]) -> int:
+        """Добавляет операцию в журнал; возвращает ее номер."""
+        with self.__lock:
+            if not self.__recovered:
+                raise RuntimeError("Сначала вызовите recover(): журнал продолжает существующие записи")
+            self.__seq += 1
+            self.__buffer.append(_encode([self.__seq, op, args]))
+            if len(self.__buffer) >= self.group_size:
+                self.commit()
+            return self.__seq
+
+    def commit(self):
+        """Записывает буфер одним вызовом write() и фиксирует его на диске (fsync)."""
+        with self.__lock:
+            if not self.__buffer:
+                return
+            self.__file.write("\n".join(self.__buffer) + "\n")
+            self.__file.flush()
+            if self.fsync:
+                os.fsync(self.__file.fileno())
+            self.__buffer.clear()
+
+    def snapshot(self, properties, tenants, agreements) -> int:
+        """Сохраняет полное состояние и начинает новый сегмент журнала.
+
+        Старые сегменты и снимки удаляются только после того, как новый снимок
+        записан и переименован, поэтому сбой посреди снимка ничего не теряет.
+        """
+        with self.__lock:
+            self.commit()
+            seq = self.__seq
+            final = self.__path(f"snapshot.{seq}.jsonl")
+            tmp = final + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fp:
+                # Следующие ID сохраняются явно: удаленный объект с наибольшим ID
+                # не должен отдать свой ID новому после восстановления
+                ids = {"kind": "ids"}
+                ids.update(zip(_REPOSITORIES, (r.peek_id() for r in (properties, tenants, agreements))))
+                fp.write(_encode(ids) + "\n")
+                dump_jsonl(fp, properties, tenants, agreements)
+                fp.flush()
+                if self.fsync:
+                    os.fsync(fp.fileno())
+            os.replace(tmp, final)
+            self.__snapshot_seq = seq
+            self.__open_segment()
+            for old_seq, path in self.__files(_SEGMENT) + self.__files(_SNAPSHOT):
+                if old_seq < seq:
+                    os.remove(path)
+            self.__sync_directory()
+            return seq
+
+    def close(self):
+        with self.__lock:
+            if self.__file is not None:
+                self.commit()
+                self.__file.close()
+                self.__file = None
+
+    # --- Восстановление ---
+    def recover(self, properties, tenants, agreements, apply: Callable[[str, Dict[str, Any]], None]) -> RecoveryReport:
+        """Загружает последний снимок в репозитории и повторяет через apply(op, args)
+        операции журнала после него. После восстановления журнал готов к записи."""
+        with self.__lock:
+            for _, path in self.__files(re.compile(r"^snapshot\.\d+\.jsonl\.tmp$")):
+                os.remove(path)  # недописанный снимок
+            loaded = 0
+            snapshots = self.__files(_SNAPSHOT)
+            if snapshots:
+                self.__snapshot_seq, path = snapshots[-1]
+                with open(path, encoding="utf-8") as fp:
+                    header = fp.readline()
+                    ids = _decode(header) if header.strip() else {}
+                    if ids.get("kind") != "ids":
+                        ids = {}
+                        fp.seek(0)  # снимок старого формата без счетчиков
+                    loaded = load_into(fp, properties, tenants, agreements)
+                for name, repository in zip(_REPOSITORIES, (properties, tenants, agreements)):
+                    if name in ids:
+                        repository.reserve_id(ids[name] - 1)
+            self.__seq = self.__snapshot_seq
+
+            replayed = 0
+            truncated = False
+            segments = self.__files(_SEGMENT)
+            for number, (_, path) in enumerate(segments):
+                last = number == len(segments) - 1
+                for seq, op, args in self.__read_segment(path, last):
+                    if seq <= self.__seq:
+                        continue  # уже есть в снимке
+                    if seq != self.__seq + 1:
+                        raise JournalCorruptedError(f"{path}: пропуск в номерах операций ({self.__seq} -> {seq})")
+                    apply(op, args)
+                    self.__seq = seq
+                    replayed += 1
+                truncated = truncated or self.__truncated
+            self.__recovered = True
+            self.__open_segment()
+            return RecoveryReport(self.__snapshot_seq, loaded, replayed, truncated)
+
+    def __read_segment(self, path: str, last: bool) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        self.__truncated = False
+        with open(path, "r+", encoding="utf-8") as fp:
+            offset = 0  # конец последней целой строки
+            while True:
+                lines = list(islice(fp, READ_CHUNK))
+                if not lines:
+                    return
+                complete = lines[-1].endswith("\n")
+                try:
+                    if not complete:
+                        raise ValueError("оборванная строка")
+                    records = _decode("[" + ",".join(lines) + "]")
+                except ValueError:
+                    records = []
+                    for index, line in enumerate(lines):
+                        try:
+                            if not line.endswith("\n"):
+                                raise ValueError("оборванная строка")
+                            records.append(_decode(line))
+                        except ValueError:
+                            if not last or index != len(lines) - 1 or fp.readline():
+                                raise JournalCorruptedError(f"{path}: поврежденная запись (смещение {offset}, строка {index + 1} блока)")
+                            yield from records
+                            fp.truncate(offset + sum(len(l.encode("utf-8")) for l in lines[:index]))
+                            self.__truncated = True
+                            return
+                offset += sum(len(line.encode("utf-8")) for line in lines)
+                yield from records
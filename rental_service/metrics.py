@@ -0,0 +1,332 @@
+# rental_service/metrics.py
+"""Метрики и трассировка горячих путей rental_service.
+
+По умолчанию сбор выключен: обернутые функции проверяют один флаг и сразу
+вызывают оригинал. После enable() каждая обернутая операция увеличивает
+счетчики вызовов и ошибок, пишет длительность в гистограмму и запоминает
+спан в кольцевом буфере последних спанов.
+
+    metrics.enable()
+    ...
+    metrics.export_prometheus("metrics.prom")
+"""
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+# Границы корзин гистограмм длительности, секунды
+DEFAULT_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_enabled = False
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+# --- Реестр ---
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # последняя корзина — +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Оценка квантиля по верхней границе корзины."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class SpanRecord(NamedTuple):
+    name: str
+    parent: Optional[str]
+    start: float  # time.time() начала
+    duration: float
+    error: bool
+
+
+class MetricsRegistry:
+    """Счетчики, гистограммы и последние спаны в памяти процесса."""
+
+    def __init__(self, max_spans: int = 1000):
+        self.__lock = threading.Lock()
+        self.__counters: Dict[Tuple[str, Labels], float] = {}
+        self.__histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.__spans: Deque[SpanRecord] = deque(maxlen=max_spans)
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1):
+        key = (name, labels)
+        with self.__lock:
+            self.__counters[key] = self.__counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: Labels, value: float):
+        key = (name, labels)
+        with self.__lock:
+            histogram = self.__histograms.get(key)
+            if histogram is None:
+                histogram = self.__histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def record_span(self, span: SpanRecord):
+        self.__spans.append(span)  # deque.append потокобезопасен
+
+    def counter(self, name: str, **labels) -> float:
+        return self.__counters.get((name, _labels(labels)), 0)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        return self.__histograms.get((name, _labels(labels)))
+
+    def spans(self) -> List[SpanRecord]:
+        return list(self.__spans)
+
+    def snapshot(self) -> dict:
+        """Копия всех метрик в виде словаря (например, для JSON)."""
+        with self.__lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in self.__counters.items()
+                ],
+                "histograms": [
+                    {
+                        "name": name,
+                        "labels": dict(labels),
+                        "buckets": dict(zip([*map(str, h.bounds), "+Inf"], h.counts)),
+                        "sum": h.sum,
+                        "count": h.count,
+                    }
+                    for (name, labels), h in self.__histograms.items()
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        """Текстовый формат экспозиции Prometheus."""
+        lines = []
+        with self.__lock:
+            counters = sorted(self.__counters.items())
+            histograms = sorted(self.__histograms.items(), key=lambda item: item[0])
+            typed = set()
+            for (name, labels), value in counters:
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+            for (name, labels), h in histograms:
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} histogram")
+                cumulative = 0
+                for bound, count in zip([*map(repr, h.bounds), "+Inf"], h.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {h.sum}")
+                lines.append(f"{name}_count{_format_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self.__lock:
+            self.__counters.clear()
+            self.__histograms.clear()
+            self.__spans.clear()
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+registry = MetricsRegistry()
+
+
+# --- Инструментирование ---
+CALLS = "rental_service_calls_total"
+ERRORS = "rental_service_errors_total"
+DURATION = "rental_service_duration_seconds"
+
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+
+def _finish(op: str, labels: Labels, parent, started: float, started_wall: float, error: bool):
+    duration = time.perf_counter() - started
+    registry.inc(CALLS, labels)
+    if error:
+        registry.inc(ERRORS, labels)
+    registry.observe(DURATION, labels, duration)
+    registry.record_span(SpanRecord(op, parent, started_wall, duration, error))
+
+
+@contextmanager
+def span(op: str, **labels):
+    """Спан вокруг произвольного блока кода; при выключенном сборе ничего не делает."""
+    if not _enabled:
+        yield
+        return
+    labels = _labels({"op": op, **labels})
+    parent = _current_span.get()
+    token = _current_span.set(op)
+    started_wall, started = time.time(), time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        _current_span.reset(token)
+        _finish(op, labels, parent, started, started_wall, error)
+
+
+def instrumented(op: str, method: bool = True):
+    """Декоратор: вызовы, ошибки, гистограмма длительности и спан операции op.
+
+    Для методов (method=True) в метки добавляется класс объекта, например
+    type="Apartment" для calculate_rental_cost.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            if method and args:
+                labels = (("op", op), ("type", type(args[0]).__name__))
+            else:
+                labels = (("op", op),)
+            parent = _current_span.get()
+            token = _current_span.set(op)
+            started_wall, started = time.time(), time.perf_counter()
+            error = False
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                _current_span.reset(token)
+                _finish(op, labels, parent, started, started_wall, error)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> dict:
+    return registry.snapshot()
+
+
+def export_prometheus(path: Optional[str] = None) -> str:
+    """Возвращает метрики в формате Prometheus и, если задан path, атомарно пишет их в файл
+    (например, для node_exporter textfile collector)."""
+    text = registry.to_prometheus()
+    if path:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            fp.write(text)
+        os.replace(tmp, path)
+    return text
+
+
+# --- Сэмплирующий профилировщик ---
+class SamplingProfiler:
+    """Периодически снимает стеки всех потоков и считает, сколько раз встретился каждый стек.
+
+    Включается и выключается во время работы (start/stop); результат — свернутые
+    стеки в формате flamegraph.pl: "модуль:функция;...;модуль:функция число".
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self.__thread: Optional[threading.Thread] = None
+        self.__stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self.__thread is not None
+
+    def start(self):
+        if self.__thread is None:
+            self.__stop.clear()
+            self.__thread = threading.Thread(target=self.__run, name="sampling-profiler", daemon=True)
+            self.__thread.start()
+
+    def stop(self):
+        if self.__thread is not None:
+            self.__stop.set()
+            self.__thread.join()
+            self.__thread = None
+
+    def __run(self):
+        own = threading.get_ident()
+        while not self.__stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Функции, чаще всего оказывавшиеся на вершине стека."""
+        leaves: Counter = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(n)
+
+
+profiler = SamplingProfiler()
+
+
+def start_profiler(interval: Optional[float] = None):
+    if interval is not None:
+        profiler.interval = interval
+    profiler.start()
+
+
+def stop_profiler() -> SamplingProfiler:
+    profiler.stop()
+    return profiler
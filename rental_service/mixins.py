@@ -1,33 +1,267 @@
+import atexit
 import logging
+import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, List, Optional
+from rental_service.notifications import get_dispatcher
 
 
-# Настройка логгера — он будет писать в файл и в консоль
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("rental_service.log", encoding="utf-8"),  # лог в файл
-        logging.StreamHandler()  # лог в консоль
-    ]
-)
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler, который не форматирует запись в вызывающем потоке.
+
+    Стандартный prepare() сразу вызывает format(); здесь запись передается как есть,
+    и %-подстановка аргументов выполняется уже в фоновом потоке записи.
+    Если логирование еще не настроено, первая запись настраивает его по умолчанию.
+    """
+
+    def prepare(self, record):
+        return record
+
+    def emit(self, record):
+        if _listener is None:
+            _configure_lazily()
+        super().emit(record)
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Пишет в текущий sys.stderr, а не в поток, который был при настройке
+    (важно для записей при завершении процесса, когда stderr уже подменен обратно).
+    Поток, заданный через setStream, используется как обычно."""
+
+    def __init__(self):
+        super().__init__()
+        self.stream = None  # None — sys.stderr на момент записи
+
+    def emit(self, record):
+        if self.stream is not None:
+            super().emit(record)
+            return
+        try:
+            stream = sys.stderr
+            stream.write(self.format(record) + self.terminator)
+            stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        if self.stream is not None:
+            super().flush()
+            return
+        with self.lock:
+            sys.stderr.flush()
+
+
+# Импорт модуля не открывает файлов и не запускает потоков: вызывающий код только
+# кладет запись в очередь, а обработчики создаются в configure_logging().
+_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+_settings: Dict[str, Any] = {}  # параметры последнего вызова configure_logging
+_handlers: List[logging.Handler] = []
+_listener: Optional[QueueListener] = None
+_lock = threading.RLock()
+
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_queue_handler = _DeferredQueueHandler(_log_queue)
+
+logger = logging.getLogger("rental_service")
+logger.setLevel(logging.INFO)
+logger.addHandler(_queue_handler)
+logger.propagate = False
+
+
+def configure_logging(
+    filename: Optional[str] = "rental_service.log",
+    level: int = logging.INFO,
+    console: bool = True,
+    max_bytes: int = 0,
+    backup_count: int = 0,
+    per_process: bool = False,
+):
+    """Настраивает логирование rental_service (можно вызывать повторно).
+
+    filename=None отключает запись в файл (например, в read-only контейнере).
+    max_bytes > 0 включает ротацию файла с backup_count архивными копиями.
+    per_process=True добавляет PID к имени файла: rental_service.1234.log.
+    Без явного вызова настройка по умолчанию выполняется при первой записи в лог.
+    Если файл лога не открывается (каталог только для чтения и т.п.), лог
+    пишется только в консоль: ошибка логирования не ломает вызывающий код.
+    """
+    global _listener
+    with _lock:
+        _stop_listener()
+        handlers: List[logging.Handler] = []
+        file_error = None
+        if filename:
+            path = filename
+            if per_process:
+                root, ext = os.path.splitext(filename)
+                path = f"{root}.{os.getpid()}{ext}"
+            # Файл открывается сразу (уже при первой записи в лог, а не при импорте),
+            # чтобы ошибка открытия была видна здесь, а не в фоновом потоке записи.
+            try:
+                if max_bytes:
+                    handlers.append(RotatingFileHandler(
+                        path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+                    ))
+                else:
+                    handlers.append(logging.FileHandler(path, encoding="utf-8"))
+            except OSError as e:
+                file_error = e
+                console = True
+        if console:
+            handlers.append(_ConsoleHandler())
+        for handler in handlers:
+            handler.setFormatter(_formatter)
+
+        _settings.clear()
+        _settings.update(
+            filename=filename,
+            level=level,
+            console=console,
+            max_bytes=max_bytes,
+            backup_count=backup_count,
+            per_process=per_process,
+        )
+        logger.setLevel(level)
+        _handlers[:] = handlers
+        _listener = QueueListener(_log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        if file_error is not None:
+            logger.warning("Файл лога %s недоступен (%s), лог пишется только в консоль", filename, file_error)
+
+
+def _configure_lazily():
+    with _lock:
+        if _listener is None:
+            try:
+                configure_logging(**_settings)
+            except Exception:
+                configure_logging(filename=None)  # запись в лог не должна ломать вызывающий код
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # stop() дописывает очередь до конца
+        _listener = None
+    for handler in _handlers:
+        handler.close()
+    _handlers.clear()
+
+
+def flush_logs():
+    """Дожидается записи всех сообщений, уже поставленных в очередь."""
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener.start()
+
+
+def shutdown_logging():
+    """Записывает все сообщения из очереди и закрывает файлы.
+
+    Следующая запись в лог снова настроит логирование с прежними параметрами.
+    """
+    with _lock:
+        _stop_listener()
+
+
+def _reset_after_fork():
+    # Поток записи родителя в дочернем процессе не существует, а его файлы
+    # принадлежат родителю: дочерний процесс заново настроится при первой записи.
+    global _listener, _lock, _log_queue
+    _lock = threading.RLock()
+    _listener = None
+    _handlers.clear()
+    _log_queue = queue.SimpleQueue()
+    _queue_handler.queue = _log_queue
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# Флаг аудита для текущего потока/задачи (см. audit_disabled)
+_audit_enabled: ContextVar[bool] = ContextVar("audit_enabled", default=True)
+
+
+@contextmanager
+def audit_disabled():
+    """Отключает log_action и audit_action в пределах блока (например, для пакетного расчета цен).
+
+    with audit_disabled():
+        costs = [p.calculate_rental_cost(36) for p in portfolio]
+    """
+    token = _audit_enabled.set(False)
+    try:
+        yield
+    finally:
+        _audit_enabled.reset(token)
+
+
+# Флаг уведомлений для текущего потока/задачи (см. notifications_disabled)
+_notifications_enabled: ContextVar[bool] = ContextVar("notifications_enabled", default=True)
+
+
+@contextmanager
+def notifications_disabled():
+    """Не отправляет уведомления в пределах блока (например, при восстановлении из журнала)."""
+    token = _notifications_enabled.set(False)
+    try:
+        yield
+    finally:
+        _notifications_enabled.reset(token)
 
 
 class LoggingMixin:
     """Миксин для логирования действий с объектами недвижимости."""
 
-    def log_action(self, action: str):
-        """Логирует указанное действие."""
-        class_name = self.__class__.__name__
-        logging.info(f"{class_name} - {action}")
-        return f"{class_name} - {action}"
+    __slots__ = ()
+
+    def audit_action(self, action: str, *args):
+        """Логирует указанное действие (для кода, которому текст записи не нужен).
+
+        Аргументы подставляются в action через %-форматирование только тогда,
+        когда запись действительно будет выведена, и уже в фоновом потоке записи;
+        при отключенном аудите или уровне выше INFO вызов почти ничего не стоит.
+        """
+        if not _audit_enabled.get() or not logger.isEnabledFor(logging.INFO):
+            return
+        if args:
+            logger.info("%s - " + action, self.__class__.__name__, *args)
+        else:
+            logger.info("%s - %s", self.__class__.__name__, action)
+
+    def log_action(self, action: str, *args) -> str:
+        """Логирует указанное действие и возвращает текст записи "Класс - действие".
+
+        Текст собирается в вызывающем потоке; в частых путях (расчет стоимости
+        и т.п.) используйте audit_action.
+        """
+        self.audit_action(action, *args)
+        text = action
+        if args:
+            try:
+                text = action % args
+            except (TypeError, ValueError):
+                text = f"{action} {args!r}"  # ошибка в шаблоне не должна ломать вызывающий код
+        return f"{self.__class__.__name__} - {text}"
 
 
 class NotificationMixin:
     """Миксин для отправки уведомлений пользователям."""
 
-    def send_notification(self, message: str):
-        """Имитация отправки уведомления пользователю."""
-        notification = f"[Уведомление] {message}"
-        print(notification)  # выводим в консоль (для демонстрации)
-        logging.info(notification)  # и записываем в лог
-        return notification
+    __slots__ = ()
+
+    def send_notification(self, message: str, recipient=None):
+        """Ставит уведомление в очередь диспетчера; доставка — в фоновом потоке."""
+        if _notifications_enabled.get():
+            get_dispatcher().submit(message, recipient)
+        return f"[Уведомление] {message}"
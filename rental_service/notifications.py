@@ -0,0 +1,200 @@
+# rental_service/notifications.py
+import atexit
+import logging
+import os
+import queue
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger("rental_service")
+
+
+class Notification(NamedTuple):
+    recipient: Optional[object]  # ID арендатора (или None — общее уведомление)
+    message: str
+
+    def __str__(self) -> str:
+        return f"[Уведомление] {self.message}"
+
+
+# --- Приемники уведомлений ---
+class NotificationSink(ABC):
+    """Интерфейс канала доставки уведомлений."""
+
+    @abstractmethod
+    def send_batch(self, notifications: List[Notification]):
+        """Доставляет пачку уведомлений."""
+        pass
+
+    def close(self):
+        pass
+
+
+class ConsoleSink(NotificationSink):
+    """Вывод в консоль и запись в лог (поведение по умолчанию)."""
+
+    def send_batch(self, notifications: List[Notification]):
+        print("\n".join(str(n) for n in notifications))
+        for notification in notifications:
+            logger.info("%s", notification)
+
+
+class MemorySink(NotificationSink):
+    """Накапливает уведомления в памяти (для тестов)."""
+
+    def __init__(self):
+        self.batches: List[List[Notification]] = []
+
+    def send_batch(self, notifications: List[Notification]):
+        self.batches.append(list(notifications))
+
+    @property
+    def notifications(self) -> List[Notification]:
+        return [n for batch in self.batches for n in batch]
+
+
+class FileSink(NotificationSink):
+    """Дописывает уведомления в файл — одна запись на пачку."""
+
+    def __init__(self, path: str):
+        self.__file = open(path, "a", encoding="utf-8")
+
+    def send_batch(self, notifications: List[Notification]):
+        self.__file.write("".join(f"{n.recipient}\t{n.message}\n" for n in notifications))
+        self.__file.flush()
+
+    def close(self):
+        self.__file.close()
+
+
+# --- Диспетчер ---
+_STOP = object()
+
+
+class NotificationDispatcher:
+    """Фоновая доставка уведомлений пачками.
+
+    submit() только кладет уведомление в ограниченную очередь; при переполнении
+    вызывающий поток ждет (backpressure). Фоновый поток собирает до batch_size
+    уведомлений, убирает повторы одного и того же сообщения одному получателю
+    и передает пачку приемнику.
+    """
+
+    def __init__(
+        self,
+        sink: NotificationSink,
+        max_queue: int = 10_000,
+        batch_size: int = 100,
+        flush_interval: float = 0.05,
+    ):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.__queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.__thread: Optional[threading.Thread] = None
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+    def submit(self, message: str, recipient=None, timeout: Optional[float] = None):
+        """Ставит уведомление в очередь; при timeout и полной очереди — queue.Full."""
+        if self.__closed:
+            raise RuntimeError("Диспетчер уведомлений остановлен")
+        if self.__thread is None:
+            self.__start()
+        self.__queue.put(Notification(recipient, message), timeout=timeout)
+
+    def __start(self):
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name="notification-dispatcher", daemon=True)
+                self.__thread.start()
+                # Регистрируется позже обработчика логов, поэтому при выходе
+                # уведомления доставляются до остановки логирования.
+                atexit.register(self.close)
+
+    def __run(self):
+        stop = False
+        while not stop:
+            try:
+                first = self.__queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            items = [first]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+            batch: Dict[Notification, None] = {}
+            for item in items:
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch[item] = None  # dict сохраняет порядок и убирает дубликаты
+            try:
+                if batch:
+                    self.sink.send_batch(list(batch))
+            except Exception:
+                logger.exception("Ошибка доставки уведомлений")
+            finally:
+                for _ in items:
+                    self.__queue.task_done()
+
+    def flush(self):
+        """Ждет доставки всех уже поставленных в очередь уведомлений."""
+        if self.__thread is not None:
+            self.__queue.join()
+
+    def close(self):
+        """Доставляет оставшиеся уведомления и останавливает фоновый поток."""
+        if self.__closed:
+            return
+        self.__closed = True
+        if self.__thread is not None:
+            self.__queue.put(_STOP)
+            self.__thread.join()
+            atexit.unregister(self.close)
+        self.sink.close()
+
+
+_dispatcher: Optional[NotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> NotificationDispatcher:
+    """Текущий диспетчер; по умолчанию создается при первом уведомлении."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = NotificationDispatcher(ConsoleSink())
+    return _dispatcher
+
+
+def set_dispatcher(dispatcher: Optional[NotificationDispatcher]):
+    """Подменяет диспетчер (старый доставляет очередь и останавливается).
+
+    None возвращает диспетчер по умолчанию.
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        old, _dispatcher = _dispatcher, dispatcher
+    if old is not None and old is not dispatcher:
+        old.close()
+
+
+def flush_notifications():
+    if _dispatcher is not None:
+        _dispatcher.flush()
+
+
+def _reset_after_fork():
+    # Поток доставки родителя в дочернем процессе не существует.
+    global _dispatcher, _dispatcher_lock
+    _dispatcher = None
+    _dispatcher_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
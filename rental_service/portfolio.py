@@ -0,0 +1,99 @@
+# rental_service/portfolio.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from rental_service.mixins import LoggingMixin
+from rental_service.property_base import Property
+from rental_service.property_table import APARTMENT, COMMERCIAL, HOUSE, PropertyTable
+
+TYPE_NAMES = {APARTMENT: "apartment", HOUSE: "house", COMMERCIAL: "commercialspace"}
+_GROUPS = 2 * len(TYPE_NAMES)  # группа = код типа * 2 + доступность
+
+# Компактная запись шарда: колонки PropertyTable, нужные для расчета стоимости
+# (код типа, ставка, сад, retail, доступность)
+Shard = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+class RevenueReport(NamedTuple):
+    horizons: Tuple[int, ...]
+    units: int
+    total: List[float]  # выручка по каждому сроку
+    by_type: Dict[str, List[float]]
+    by_availability: Dict[bool, List[float]]
+    count_by_type: Dict[str, int]
+
+
+def encode(properties: Iterable[Property]) -> Shard:
+    """Переводит объекты в компактные колонки (через PropertyTable)."""
+    return encode_table(PropertyTable.from_properties(properties))
+
+
+def encode_table(table: PropertyTable) -> Shard:
+    return (table.type_code, table.monthly_rate, table.has_garden, table.is_retail, table.is_available)
+
+
+def price_shard(shard: Shard, horizons: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """Выручка шарда по группам (тип, доступность) x срок и число объектов в группах.
+
+    Выполняется в процессе-исполнителе: объекты Property туда не передаются,
+    поэтому журнал аудита в исполнителях не пишется.
+    """
+    codes, rates, garden, retail, available = shard
+    months = np.asarray(horizons)[None, :]
+    # Коэффициенты и порядок умножения — как в PropertyTable.quote
+    costs = rates[:, None] * months * PropertyTable.rate_multipliers(codes, garden, retail, months)
+    groups = codes.astype(np.intp) * 2 + available
+    revenue = np.stack(
+        [np.bincount(groups, weights=costs[:, j], minlength=_GROUPS) for j in range(len(horizons))], axis=1
+    )
+    return revenue, np.bincount(groups, minlength=_GROUPS)
+
+
+def _split(shard: Shard, size: int) -> List[Shard]:
+    total = len(shard[0])
+    return [tuple(column[start:start + size] for column in shard) for start in range(0, total, size)]
+
+
+class PortfolioPricer(LoggingMixin):
+    """Параллельная переоценка портфеля: объекты x сроки аренды.
+
+    Портфель переводится в компактные колонки и делится на шарды, которые
+    считаются в ProcessPoolExecutor; из исполнителей возвращаются только
+    агрегаты по группам (тип, доступность). Итог — выручка по типам и по
+    доступности для каждого срока и одна запись в журнале аудита.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, shards_per_worker: int = 4):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.shards_per_worker = shards_per_worker
+
+    def reprice(self, portfolio, horizons: Sequence[int] = (1, 6, 12, 24, 36)) -> RevenueReport:
+        """portfolio — объекты недвижимости или PropertyTable."""
+        horizons = tuple(horizons)
+        shard = encode_table(portfolio) if isinstance(portfolio, PropertyTable) else encode(portfolio)
+        units = len(shard[0])
+        revenue = np.zeros((_GROUPS, len(horizons)))
+        counts = np.zeros(_GROUPS, dtype=np.int64)
+
+        if self.max_workers == 1 or units == 0:
+            results = [price_shard(shard, horizons)]
+        else:
+            size = max(-(-units // (self.max_workers * self.shards_per_worker)), 1)
+            shards = _split(shard, size)
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                results = list(pool.map(price_shard, shards, [horizons] * len(shards)))
+        for shard_revenue, shard_counts in results:
+            revenue += shard_revenue
+            counts += shard_counts
+
+        report = RevenueReport(
+            horizons=horizons,
+            units=units,
+            total=revenue.sum(axis=0).tolist(),
+            by_type={name: revenue[code * 2:code * 2 + 2].sum(axis=0).tolist() for code, name in TYPE_NAMES.items()},
+            by_availability={flag: revenue[int(flag)::2].sum(axis=0).tolist() for flag in (False, True)},
+            count_by_type={name: int(counts[code * 2:code * 2 + 2].sum()) for code, name in TYPE_NAMES.items()},
+        )
+        self.audit_action("Переоценка портфеля: %s объектов, сроки %s мес.", units, horizons)
+        return report
@@ -0,0 +1,141 @@
+# rental_service/pricing.py
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Set, Tuple
+from rental_service.interfaces import PropertyObserver
+from rental_service.mixins import audit_disabled
+from rental_service.property_base import Property
+
+# Поля, от которых зависит стоимость аренды
+PRICE_FIELDS = frozenset(("monthly_rate", "area"))
+# Сроки, на которые по умолчанию прогревается кэш
+DEFAULT_HORIZONS = (1, 3, 6, 12, 24, 36)
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class PricingCache(PropertyObserver):
+    """LRU-кэш стоимости аренды по (объект, срок в месяцах).
+
+    Кэш подписывается на объекты, которые в нем есть, и сбрасывает их записи,
+    когда сеттеры monthly_rate или area меняют объект. Размер ограничен maxsize:
+    при переполнении вытесняется давно не запрашиваемая запись.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        if maxsize <= 0:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.maxsize = maxsize
+        # (ID объекта, срок) -> (объект, стоимость); объект хранится, чтобы
+        # не отдать чужую цену другому объекту с тем же ID
+        self.__entries: "OrderedDict[Tuple[int, int], Tuple[Property, float]]" = OrderedDict()
+        self.__months: Dict[int, Set[int]] = {}  # ID объекта -> закэшированные сроки
+        self.__lock = threading.RLock()
+        self.__hits = self.__misses = self.__evictions = self.__invalidations = 0
+
+    def quote(self, prop: Property, months: int) -> float:
+        key = (prop.property_id, months)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] is prop:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return entry[1]
+            self.__misses += 1
+        version = prop.version
+        cost = prop.calculate_rental_cost(months)
+        with self.__lock:
+            self.__store(key, prop, cost, version)
+        return cost
+
+    def __store(self, key: Tuple[int, int], prop: Property, cost: float, version: int):
+        if prop.version != version:
+            return  # объект изменился во время расчета: цена могла устареть
+        entry = self.__entries.get(key)
+        if entry is not None and entry[0] is prop:
+            self.__entries[key] = (prop, cost)
+            self.__entries.move_to_end(key)
+            return
+        cached = self.__months.get(key[0])
+        if cached:
+            owner = self.__entries[(key[0], next(iter(cached)))][0]
+            if owner is not prop:
+                # Другой объект с тем же ID: его цены больше не отслеживаются
+                self.__drop(key[0], owner)
+        self.__entries[key] = (prop, cost)
+        self.__months.setdefault(key[0], set()).add(key[1])
+        prop.subscribe(self)
+        while len(self.__entries) > self.maxsize:
+            (pid, months), (old, _) = self.__entries.popitem(last=False)
+            self.__evictions += 1
+            self.__forget(pid, months, old)
+
+    def __forget(self, pid: int, months: int, prop: Property):
+        cached = self.__months[pid]
+        cached.discard(months)
+        if not cached:
+            del self.__months[pid]
+            prop.unsubscribe(self)
+
+    def __drop(self, pid: int, prop: Property):
+        for months in self.__months.pop(pid, ()):
+            if self.__entries.pop((pid, months), None) is not None:
+                self.__invalidations += 1
+        prop.unsubscribe(self)
+
+    def invalidate(self, prop: Property):
+        """Сбрасывает все закэшированные цены объекта."""
+        with self.__lock:
+            self.__drop(prop.property_id, prop)
+
+    def property_changed(self, prop, field: str, old, new):
+        if field in PRICE_FIELDS:
+            self.invalidate(prop)
+
+    def warm(self, portfolio: Iterable[Property], horizons: Iterable[int] = DEFAULT_HORIZONS) -> int:
+        """Заранее рассчитывает цены портфеля; возвращает число рассчитанных цен.
+
+        Расчеты при прогреве не пишутся в журнал аудита и не считаются промахами.
+        """
+        horizons = tuple(horizons)
+        computed = 0
+        with audit_disabled():
+            for prop in portfolio:
+                for months in horizons:
+                    key = (prop.property_id, months)
+                    entry = self.__entries.get(key)
+                    if entry is not None and entry[0] is prop:
+                        continue
+                    version = prop.version
+                    cost = prop.calculate_rental_cost(months)
+                    with self.__lock:
+                        self.__store(key, prop, cost, version)
+                    computed += 1
+        return computed
+
+    def clear(self):
+        with self.__lock:
+            for prop, _ in self.__entries.values():
+                prop.unsubscribe(self)
+            self.__entries.clear()
+            self.__months.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.__hits, self.__misses, self.__evictions, self.__invalidations, len(self.__entries))
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return key in self.__entries
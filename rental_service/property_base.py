@@ -1,18 +1,28 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from abc import ABCMeta
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 import json
+from rental_service.metrics import instrumented
 from rental_service.mixins import LoggingMixin
+from rental_service.interfaces import PropertyObserver
 
 
 class PropertyMeta(ABCMeta):
-    """Метакласс для регистрации всех подклассов недвижимости."""
+    """Метакласс для регистрации всех подклассов недвижимости.
+
+    Заодно один раз на класс вычисляет схему полей: fields — аргументы
+    конструктора по порядку, extra_fields — поля, добавленные подклассом.
+    """
 
     registry: Dict[str, type] = {}
 
     def __new__(mcs, name, bases, attrs):
         cls = super().__new__(mcs, name, bases, attrs)
+        code = cls.__init__.__code__
+        parent_fields = next((b.fields for b in bases if isinstance(b, PropertyMeta)), ())
+        cls.fields = code.co_varnames[1:code.co_argcount]
+        cls.extra_fields = tuple(f for f in cls.fields if f not in parent_fields)
         if name != "Property":  # не регистрируем базовый класс
             PropertyMeta.registry[name.lower()] = cls
         return cls
@@ -21,6 +31,13 @@ class PropertyMeta(ABCMeta):
 class Property(ABC, metaclass=PropertyMeta):
     """Абстрактный класс недвижимости."""
 
+    # Атрибуты хранятся в слотах, а не в __dict__ экземпляра: при миллионах
+    # объектов это основная экономия памяти. Имена слотов манглируются так же,
+    # как self.__address и т.п.
+    __slots__ = (
+        "__property_id", "__address", "__area", "__monthly_rate", "__is_available", "__observers", "__version",
+    )
+
     def __init__(
         self,
         property_id: int,
@@ -34,12 +51,34 @@ class Property(ABC, metaclass=PropertyMeta):
         self.__area = area
         self.__monthly_rate = monthly_rate
         self.__is_available = is_available
+        self.__observers: Tuple[PropertyObserver, ...] = ()
+        self.__version = 0
+
+    # --- Наблюдатели (индексы репозиториев) ---
+    def subscribe(self, observer: PropertyObserver):
+        """Подписывает наблюдателя на изменения полей объекта."""
+        if observer not in self.__observers:
+            self.__observers += (observer,)
+
+    def unsubscribe(self, observer: PropertyObserver):
+        self.__observers = tuple(o for o in self.__observers if o is not observer)
+
+    def _notify(self, field: str, old, new):
+        """Фиксирует изменение поля: увеличивает версию и оповещает наблюдателей."""
+        self.__version += 1
+        for observer in self.__observers:
+            observer.property_changed(self, field, old, new)
 
     # --- Геттеры и сеттеры ---
     @property
     def property_id(self) -> int:
         return self.__property_id
 
+    @property
+    def version(self) -> int:
+        """Счетчик изменений (для оптимистичных блокировок и кэшей)."""
+        return self.__version
+
     @property
     def address(self) -> str:
         return self.__address
@@ -48,7 +87,9 @@ class Property(ABC, metaclass=PropertyMeta):
     def address(self, value: str):
         if not value:
             raise ValueError("Адрес не может быть пустым")
+        old = self.__address
         self.__address = value
+        self._notify("address", old, value)
 
     @property
     def area(self) -> float:
@@ -58,7 +99,9 @@ class Property(ABC, metaclass=PropertyMeta):
     def area(self, value: float):
         if value <= 0:
             raise ValueError("Площадь должна быть положительным числом")
+        old = self.__area
         self.__area = value
+        self._notify("area", old, value)
 
     @property
     def monthly_rate(self) -> float:
@@ -68,7 +111,9 @@ class Property(ABC, metaclass=PropertyMeta):
     def monthly_rate(self, value: float):
         if value < 0:
             raise ValueError("Ставка не может быть отрицательной")
+        old = self.__monthly_rate
         self.__monthly_rate = value
+        self._notify("monthly_rate", old, value)
 
     @property
     def is_available(self) -> bool:
@@ -76,7 +121,9 @@ class Property(ABC, metaclass=PropertyMeta):
 
     @is_available.setter
     def is_available(self, value: bool):
+        old = self.__is_available
         self.__is_available = value
+        self._notify("is_available", old, value)
 
     # --- Методы ---
     @abstractmethod
@@ -99,8 +146,8 @@ class Property(ABC, metaclass=PropertyMeta):
 
     # --- Сериализация ---
     def to_dict(self) -> Dict[str, Any]:
-        """Преобразует объект в словарь."""
-        return {
+        """Преобразует объект в словарь (включая поля подкласса)."""
+        data = {
             "type": self.__class__.__name__,
             "property_id": self.property_id,
             "address": self.address,
@@ -108,6 +155,9 @@ class Property(ABC, metaclass=PropertyMeta):
             "monthly_rate": self.monthly_rate,
             "is_available": self.is_available,
         }
+        for name in self.extra_fields:
+            data[name] = getattr(self, name)
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> Property:
@@ -116,14 +166,7 @@ class Property(ABC, metaclass=PropertyMeta):
         subclass = PropertyMeta.registry.get(property_type)
         if not subclass:
             raise ValueError(f"Неизвестный тип недвижимости: {property_type}")
-        return subclass(
-            data["property_id"],
-            data["address"],
-            data["area"],
-            data["monthly_rate"],
-            data["is_available"],
-            **{k: v for k, v in data.items() if k not in cls().to_dict()},
-        )
+        return subclass(**{name: data[name] for name in subclass.fields if name in data})
 
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
@@ -131,6 +174,8 @@ class Property(ABC, metaclass=PropertyMeta):
 
 # --- Подклассы недвижимости ---
 class Apartment(Property, LoggingMixin):
+    __slots__ = ("__number_of_rooms",)
+
     def __init__(
         self,
         property_id: int,
@@ -147,10 +192,11 @@ class Apartment(Property, LoggingMixin):
     def number_of_rooms(self) -> int:
         return self.__number_of_rooms
 
+    @instrumented("calculate_rental_cost")
     def calculate_rental_cost(self, months: int) -> float:
         discount = 0.9 if months >= 12 else 1.0
         cost = self.monthly_rate * months * discount
-        self.log_action(f"Расчет френды {cost} руб. за {months} мес.")
+        self.audit_action("Расчет аренды %s руб. за %s мес.", cost, months)
         return cost
 
     def __str__(self):
@@ -158,6 +204,8 @@ class Apartment(Property, LoggingMixin):
 
 
 class House(Property, LoggingMixin):
+    __slots__ = ("__has_garden",)
+
     def __init__(
         self,
         property_id: int,
@@ -174,10 +222,11 @@ class House(Property, LoggingMixin):
     def has_garden(self) -> bool:
         return self.__has_garden
 
+    @instrumented("calculate_rental_cost")
     def calculate_rental_cost(self, months: int) -> float:
         garden_fee = 1.1 if self.has_garden else 1.0
         cost = self.monthly_rate * months * garden_fee
-        self.log_action(f"Расчет френды {cost} руб. за {months} мес.")
+        self.audit_action("Расчет аренды %s руб. за %s мес.", cost, months)
         return cost
 
     def __str__(self):
@@ -185,6 +234,8 @@ class House(Property, LoggingMixin):
 
 
 class CommercialSpace(Property, LoggingMixin):
+    __slots__ = ("__business_type", "__business_multiplier")
+
     def __init__(
         self,
         property_id: int,
@@ -196,15 +247,17 @@ class CommercialSpace(Property, LoggingMixin):
     ):
         super().__init__(property_id, address, area, monthly_rate, is_available)
         self.__business_type = business_type
+        # Тип бизнеса не меняется после создания — множитель считается один раз
+        self.__business_multiplier = 1.2 if business_type.lower() == "retail" else 1.0
 
     @property
     def business_type(self) -> str:
         return self.__business_type
 
+    @instrumented("calculate_rental_cost")
     def calculate_rental_cost(self, months: int) -> float:
-        business_multiplier = 1.2 if self.business_type.lower() == "retail" else 1.0
-        cost = self.monthly_rate * months * business_multiplier
-        self.log_action(f"Расчет френды {cost} руб. за {months} мес.")
+        cost = self.monthly_rate * months * self.__business_multiplier
+        self.audit_action("Расчет аренды %s руб. за %s мес.", cost, months)
         return cost
 
     def __str__(self):
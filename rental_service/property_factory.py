@@ -1,5 +1,94 @@
+import numbers
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from rental_service.property_base import PropertyMeta, Property
 
+CHUNK_SIZE = 10_000  # записей, которые create_many группирует за один раз
+
+_NUMBER = (int, float)  # быстрая проверка самых частых типов до isinstance
+
+
+def _is_number(value) -> bool:
+    """Вещественное число (в том числе скаляр NumPy), но не bool."""
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+class CreateResult(NamedTuple):
+    row: int  # номер записи во входном потоке, с 1
+    property: Optional[Property]
+    error: Optional[str]
+
+
+class _Constructor:
+    """Конструктор типа недвижимости с заранее вычисленным порядком аргументов."""
+
+    __slots__ = ("cls", "fields", "getter", "defaults", "address", "area", "monthly_rate")
+
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.fields = cls.fields
+        self.getter = itemgetter(*cls.fields)
+        defaults = cls.__init__.__defaults__ or ()
+        self.defaults = dict(zip(cls.fields[len(cls.fields) - len(defaults):], defaults))
+        # Позиции проверяемых полей в кортеже аргументов
+        self.address = cls.fields.index("address")
+        self.area = cls.fields.index("area")
+        self.monthly_rate = cls.fields.index("monthly_rate")
+
+    def arguments(self, record: Dict[str, Any]) -> tuple:
+        try:
+            return self.getter(record)
+        except KeyError:
+            # Медленный путь только для неполных записей: значения по умолчанию
+            missing = [f for f in self.fields if f not in record and f not in self.defaults]
+            if missing:
+                raise KeyError(", ".join(missing)) from None
+            return tuple(record[f] if f in record else self.defaults[f] for f in self.fields)
+
+
+_constructors: Dict[str, _Constructor] = {}
+
+
+def _constructor(property_type: str) -> _Constructor:
+    constructor = _constructors.get(property_type)
+    if constructor is None:
+        cls = PropertyMeta.registry.get(property_type.lower())
+        if cls is None:
+            raise ValueError(f"Неизвестный тип недвижимости: {property_type}")
+        constructor = _constructors[property_type] = _Constructor(cls)
+    return constructor
+
+
+def _prepare(record: Dict[str, Any], property_type: Optional[str]) -> Tuple[_Constructor, tuple]:
+    """Медленный путь для записи, не прошедшей быстрый: тип и аргументы или ValueError с причиной."""
+    if not isinstance(record, dict):
+        raise ValueError(f"Запись должна быть словарем, получено {type(record).__name__}")
+    type_name = property_type or record.get("type")
+    if not isinstance(type_name, str):
+        raise ValueError("Нет поля: type")
+    constructor = _constructor(type_name)
+    try:
+        return constructor, constructor.arguments(record)
+    except KeyError as e:
+        raise ValueError(f"Нет поля: {e.args[0]}") from None
+
+
+def _invalid(address, area, monthly_rate) -> str:
+    """Причина отказа для записи, не прошедшей пакетную проверку.
+
+    Правила те же, что у сеттеров, плюс площадь и ставка должны быть числами (не bool).
+    """
+    if not address:
+        return "Адрес не может быть пустым"
+    if not _is_number(area):
+        return f"Площадь должна быть числом, получено {area!r}"
+    if not area > 0:
+        return "Площадь должна быть положительным числом"
+    if not _is_number(monthly_rate):
+        return f"Ставка должна быть числом, получено {monthly_rate!r}"
+    return "Ставка не может быть отрицательной"
+
 
 class PropertyFactory:
     """Фабрика для создания объектов недвижимости по типу."""
@@ -11,3 +100,72 @@ class PropertyFactory:
         if not cls:
             raise ValueError(f"Неизвестный тип недвижимости: {property_type}")
         return cls(**kwargs)
+
+    @staticmethod
+    def create_many(
+        records: Iterable[Dict[str, Any]], property_type: Optional[str] = None, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[CreateResult]:
+        """Массовое создание объектов из словарей (генератор, результаты в порядке записей).
+
+        Тип берется из property_type или из поля "type" каждой записи. Записи
+        обрабатываются пачками по chunk_size: внутри пачки группируются по типу,
+        аргументы конструктора выбираются в заранее вычисленном порядке, а адрес,
+        площадь и ставка проверяются одним проходом по группе (по правилам сеттеров;
+        числом считается любое numbers.Real, кроме bool). Ошибочная запись
+        дает CreateResult с error и property=None; исключения не выбрасываются.
+        """
+        records = iter(records)
+        row = 0
+        constructors = _constructors
+        new = tuple.__new__  # CreateResult без вызова __new__ на Python
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                return
+            results: List[Optional[CreateResult]] = [None] * len(chunk)
+            groups: Dict[_Constructor, Tuple[List[int], List[tuple]]] = {}
+            for position, record in enumerate(chunk):
+                try:
+                    type_name = property_type or record["type"]
+                    constructor = constructors.get(type_name) or _constructor(type_name)
+                    args = constructor.getter(record)
+                except Exception:
+                    try:
+                        constructor, args = _prepare(record, property_type)
+                    except ValueError as e:
+                        results[position] = new(CreateResult, (row + position + 1, None, str(e)))
+                        continue
+                group = groups.get(constructor)
+                if group is None:
+                    group = groups[constructor] = ([], [])
+                group[0].append(position)
+                group[1].append(args)
+
+            for constructor, (positions, arguments) in groups.items():
+                cls, address, area, rate = constructor.cls, constructor.address, constructor.area, constructor.monthly_rate
+                valid = [
+                    bool(args[address])
+                    and (type(args[area]) in _NUMBER or _is_number(args[area])) and args[area] > 0
+                    and (type(args[rate]) in _NUMBER or _is_number(args[rate])) and args[rate] >= 0
+                    for args in arguments
+                ]
+                if all(valid):
+                    try:
+                        created = [cls(*args) for args in arguments]
+                    except Exception:
+                        created = None  # ошибка в конструкторе: разберем записи по одной
+                    if created is not None:
+                        for position, prop in zip(positions, created):
+                            results[position] = new(CreateResult, (row + position + 1, prop, None))
+                        continue
+                for position, args, ok in zip(positions, arguments, valid):
+                    if ok:
+                        try:
+                            result = (row + position + 1, cls(*args), None)
+                        except Exception as e:
+                            result = (row + position + 1, None, f"{type(e).__name__}: {e}")
+                    else:
+                        result = (row + position + 1, None, _invalid(args[address], args[area], args[rate]))
+                    results[position] = new(CreateResult, result)
+            row += len(chunk)
+            yield from results
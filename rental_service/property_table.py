@@ -0,0 +1,125 @@
+# rental_service/property_table.py
+from typing import Iterable, List
+import numpy as np
+from rental_service.property_base import Apartment, House, CommercialSpace, Property
+
+# Коды типов недвижимости в колонке type_code
+APARTMENT, HOUSE, COMMERCIAL = 0, 1, 2
+TYPE_CODES = {Apartment: APARTMENT, House: HOUSE, CommercialSpace: COMMERCIAL}
+
+
+class PropertyTable:
+    """Колоночное (NumPy) хранилище недвижимости для пакетного расчета стоимости.
+
+    Поля подклассов хранятся в общих колонках; для чужого типа в них лежит
+    значение-заглушка (-1 для number_of_rooms и business_code, False для has_garden).
+    """
+
+    def __init__(
+        self,
+        property_id,
+        address: List[str],
+        area,
+        monthly_rate,
+        type_code,
+        is_available,
+        number_of_rooms,
+        has_garden,
+        business_code,
+        business_types: List[str],
+    ):
+        self.property_id = np.asarray(property_id, dtype=np.int64)
+        self.address = list(address)
+        self.area = np.asarray(area, dtype=np.float64)
+        self.monthly_rate = np.asarray(monthly_rate, dtype=np.float64)
+        self.type_code = np.asarray(type_code, dtype=np.int8)
+        self.is_available = np.asarray(is_available, dtype=bool)
+        self.number_of_rooms = np.asarray(number_of_rooms, dtype=np.int32)
+        self.has_garden = np.asarray(has_garden, dtype=bool)
+        self.business_code = np.asarray(business_code, dtype=np.int32)
+        self.business_types = list(business_types)  # словарь кодов business_code
+        retail = np.array([b.lower() == "retail" for b in self.business_types] + [False], dtype=bool)
+        self.is_retail = retail[self.business_code]  # код -1 попадает на последний False
+
+    # --- Конвертация ---
+    @classmethod
+    def from_properties(cls, properties: Iterable[Property]) -> "PropertyTable":
+        columns = ([], [], [], [], [], [], [], [], [])
+        (ids, addresses, areas, rates, codes, available, rooms, gardens, business) = columns
+        business_types: List[str] = []
+        business_index = {}
+        for prop in properties:
+            code = TYPE_CODES.get(type(prop))
+            if code is None:
+                raise ValueError(f"Тип {type(prop).__name__} не поддерживается PropertyTable")
+            ids.append(prop.property_id)
+            addresses.append(prop.address)
+            areas.append(prop.area)
+            rates.append(prop.monthly_rate)
+            codes.append(code)
+            available.append(prop.is_available)
+            rooms.append(prop.number_of_rooms if code == APARTMENT else -1)
+            gardens.append(prop.has_garden if code == HOUSE else False)
+            if code == COMMERCIAL:
+                name = prop.business_type
+                if name not in business_index:
+                    business_index[name] = len(business_types)
+                    business_types.append(name)
+                business.append(business_index[name])
+            else:
+                business.append(-1)
+        return cls(*columns, business_types=business_types)
+
+    def to_properties(self) -> List[Property]:
+        result = []
+        for i in range(len(self)):
+            args = (
+                int(self.property_id[i]),
+                self.address[i],
+                float(self.area[i]),
+                float(self.monthly_rate[i]),
+            )
+            code = self.type_code[i]
+            available = bool(self.is_available[i])
+            if code == APARTMENT:
+                result.append(Apartment(*args, int(self.number_of_rooms[i]), available))
+            elif code == HOUSE:
+                result.append(House(*args, bool(self.has_garden[i]), available))
+            else:
+                result.append(CommercialSpace(*args, self.business_types[self.business_code[i]], available))
+        return result
+
+    def __len__(self) -> int:
+        return len(self.property_id)
+
+    # --- Пакетный расчет ---
+    def multipliers(self, months) -> np.ndarray:
+        """Коэффициенты подклассов: скидка за год, надбавка за сад, множитель retail."""
+        return self.rate_multipliers(self.type_code, self.has_garden, self.is_retail, months)
+
+    @staticmethod
+    def rate_multipliers(type_code, garden, retail, months) -> np.ndarray:
+        """То же по отдельным колонкам (для шардов PortfolioPricer без всей таблицы)."""
+        months = np.asarray(months)
+        if months.ndim == 2:
+            type_code, garden, retail = type_code[:, None], garden[:, None], retail[:, None]
+        return np.where(
+            type_code == APARTMENT,
+            np.where(months >= 12, 0.9, 1.0),
+            np.where(type_code == HOUSE, np.where(garden, 1.1, 1.0), np.where(retail, 1.2, 1.0)),
+        )
+
+    def calculate_rental_cost(self, months) -> np.ndarray:
+        """Стоимость аренды для всех объектов.
+
+        months — число или массив длины len(self) (свой срок для каждого объекта).
+        Порядок операций тот же, что в calculate_rental_cost подклассов, поэтому
+        результаты совпадают с поштучным расчетом бит в бит.
+        """
+        months = np.asarray(months)
+        return self.monthly_rate * months * self.multipliers(months)
+
+    def quote(self, horizons) -> np.ndarray:
+        """Матрица стоимостей (объект x срок) для набора сроков аренды."""
+        months = np.asarray(horizons)[None, :]
+        return self.monthly_rate[:, None] * months * self.multipliers(months)
@@ -1,6 +1,10 @@
 # rental_service/rental_agreement.py
 from datetime import date
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Union
+from rental_service.availability import parse_date, parse_period
+from rental_service.booking import default_engine
+from rental_service.exceptions import BookingConflictError
+from rental_service.metrics import instrumented
 from rental_service.mixins import LoggingMixin, NotificationMixin
 from rental_service.interfaces import Rentable, Reportable
 from rental_service.client_base import Tenant
@@ -10,49 +14,120 @@ from rental_service.property_base import Property
 class RentalAgreement(LoggingMixin, NotificationMixin, Rentable, Reportable):
     """Класс для управления арендой жилья (агрегация + композиция)."""
 
+    __slots__ = (
+        "__agreement_id", "__tenant", "__property", "__start_date", "__end_date", "__extras", "__total_cost",
+        "__extras_sum", "__base_version", "__base_costs",
+    )
+
     def __init__(
         self,
         agreement_id: int,
         tenant: Tenant,
         property_: Property,
-        start_date: date,
-        end_date: date,
+        start_date: Union[date, str],
+        end_date: Union[date, str],
     ):
+        # Даты принимаются как date или строка YYYY-MM-DD; ValueError при ошибке
+        self.__start_date, self.__end_date = parse_period(start_date, end_date)
         self.__agreement_id = agreement_id
         self.__tenant = tenant
         self.__property = property_
-        self.__start_date = start_date
-        self.__end_date = end_date
-        self.__extras: List[Tuple[str, float]] = []
+        self.__init_extras(())
         self.__total_cost = 0.0
 
-        self.log_action(f"Аренда {self.__agreement_id} создана.")
+        self.audit_action("Аренда %s создана.", self.__agreement_id)
         self.send_notification(
-            f"Аренда {self.__property.address} успешно оформлена для {self.__tenant.name}."
+            f"Аренда {self.__property.address} успешно оформлена для {self.__tenant.name}.",
+            self.__tenant.tenant_id,
         )
 
+    # --- Геттеры ---
+    @property
+    def agreement_id(self) -> int:
+        return self.__agreement_id
+
+    @property
+    def tenant(self) -> Tenant:
+        return self.__tenant
+
+    @property
+    def property_(self) -> Property:
+        return self.__property
+
+    @property
+    def start_date(self) -> date:
+        return self.__start_date
+
+    @property
+    def end_date(self) -> date:
+        return self.__end_date
+
+    @property
+    def extras(self) -> List[Tuple[str, float]]:
+        return [(name, price) for name, prices in self.__extras.items() for price in prices]
+
+    @property
+    def extras_total(self) -> float:
+        return self.__extras_sum
+
+    @property
+    def total_cost(self) -> float:
+        return self.__total_cost
+
     # --- Методы управления ---
+    def __init_extras(self, extras):
+        # Услуги хранятся по названию (одна услуга может быть добавлена несколько раз),
+        # их сумма поддерживается при каждом изменении; кэш базовой стоимости
+        # действителен, пока не изменилась версия объекта недвижимости.
+        self.__extras: Dict[str, List[float]] = {}
+        self.__extras_sum = 0.0
+        self.__base_version = None
+        self.__base_costs: Dict[int, float] = {}
+        for name, price in extras:
+            self.__extras.setdefault(name, []).append(price)
+            self.__extras_sum += price
+
     def add_extra(self, service_name: str, price: float):
-        self.__extras.append((service_name, price))
-        self.log_action(f"Добавлена услуга '{service_name}' стоимостью {price}₽.")
+        self.__extras.setdefault(service_name, []).append(price)
+        self.__extras_sum += price
+        self.audit_action("Добавлена услуга '%s' стоимостью %s₽.", service_name, price)
 
     def remove_extra(self, service_name: str):
-        self.__extras = [e for e in self.__extras if e[0] != service_name]
-        self.log_action(f"Услуга '{service_name}' удалена.")
+        prices = self.__extras.pop(service_name, None)
+        if prices is not None:
+            if self.__extras:
+                self.__extras_sum -= sum(prices)
+            else:
+                self.__extras_sum = 0.0  # без накопленной ошибки округления
+        self.audit_action("Услуга '%s' удалена.", service_name)
 
+    def base_cost(self, months: int) -> float:
+        """Стоимость аренды без услуг; пересчитывается только после изменения объекта."""
+        version = self.__property.version
+        if version != self.__base_version:
+            self.__base_version = version
+            self.__base_costs = {}
+        cost = self.__base_costs.get(months)
+        if cost is None:
+            cost = self.__base_costs[months] = self.__property.calculate_rental_cost(months)
+        return cost
+
+    @instrumented("calculate_total")
     def calculate_total(self, months: int) -> float:
-        base = self.__property.calculate_rental_cost(months)
-        extras = sum(p for _, p in self.__extras)
-        self.__total_cost = base + extras
-        self.log_action(f"Общая стоимость аренды: {self.__total_cost}₽.")
+        self.__total_cost = self.base_cost(months) + self.__extras_sum
+        self.audit_action("Общая стоимость аренды: %s₽.", self.__total_cost)
         return self.__total_cost
 
     # --- Интерфейсы ---
+    @instrumented("rent_property")
     def rent_property(self):
-        self.__property.is_available = False
-        self.log_action(f"Аренда {self.__agreement_id} активирована.")
+        result = default_engine.try_book(self.__property)
+        if not result.success:
+            raise BookingConflictError(f"Аренда {self.__agreement_id}: {result.message}")
+        self.audit_action("Аренда %s активирована.", self.__agreement_id)
         self.send_notification(
-            f"Недвижимость {self.__property.address} теперь недоступна для других арендаторов."
+            f"Недвижимость {self.__property.address} теперь недоступна для других арендаторов.",
+            self.__tenant.tenant_id,
         )
 
     def generate_report(self) -> str:
@@ -61,7 +136,7 @@ class RentalAgreement(LoggingMixin, NotificationMixin, Rentable, Reportable):
             f"Арендатор: {self.__tenant.name}\n"
             f"Недвижимость: {self.__property.address}\n"
             f"Период: {self.__start_date} — {self.__end_date}\n"
-            f"Доп. услуги: {len(self.__extras)}\n"
+            f"Доп. услуги: {sum(map(len, self.__extras.values()))}\n"
             f"Итог: {self.__total_cost}₽"
         )
 
@@ -70,13 +145,28 @@ class RentalAgreement(LoggingMixin, NotificationMixin, Rentable, Reportable):
         return {
             "agreement_id": self.__agreement_id,
             "tenant": self.__tenant.to_dict(),
+            "tenant_id": self.__tenant.tenant_id,
             "property_id": self.__property.property_id,
             "start_date": str(self.__start_date),
             "end_date": str(self.__end_date),
-            "extras": self.__extras,
+            "extras": self.extras,
             "total_cost": self.__total_cost,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], tenant: Tenant, property_: Property) -> "RentalAgreement":
+        """Восстанавливает сохраненный договор (без повторного лога и уведомления о создании)."""
+        agreement = cls.__new__(cls)
+        agreement.__agreement_id = data["agreement_id"]
+        agreement.__tenant = tenant
+        agreement.__property = property_
+        agreement.__start_date = parse_date(data["start_date"])
+        agreement.__end_date = parse_date(data["end_date"])
+        agreement.__init_extras(data.get("extras", ()))
+        agreement.__total_cost = data.get("total_cost", 0.0)
+        return agreement
+
     # --- Строковое представление ---
     def __str__(self) -> str:
         return f"Аренда #{self.__agreement_id}: {self.__tenant.name} → {self.__property.address}"
+
@@ -1,18 +1,28 @@
 from abc import ABC, abstractmethod
+from rental_service.booking import CONFLICT_UNAVAILABLE, default_engine
 from rental_service.decorators import check_permissions
+from rental_service.metrics import instrumented
 from rental_service.mixins import LoggingMixin, NotificationMixin
 
 
 class RentalProcess(ABC, LoggingMixin, NotificationMixin):
     """Шаблонный метод для процесса аренды."""
 
+    booking_engine = default_engine
+
+    @instrumented("rent_property")
     @check_permissions("manager")
     def rent_property(self, property_obj, tenant_obj):
-        """Общий алгоритм аренды."""
-        if not self.check_availability(property_obj):
-            return "Недвижимость недоступна."
+        """Общий алгоритм аренды.
+
+        Проверка доступности и оформление выполняются атомарно под блокировкой
+        объекта, уведомление отправляется уже после снятия блокировки.
+        """
+        with self.booking_engine.locked(property_obj):
+            if not self.check_availability(property_obj):
+                return CONFLICT_UNAVAILABLE
+            self.create_agreement(property_obj, tenant_obj)
 
-        self.create_agreement(property_obj, tenant_obj)
         self.confirm_rental(property_obj, tenant_obj)
         return "Аренда успешно оформлена."
 
@@ -36,11 +46,13 @@ class OnlineRentalProcess(RentalProcess):
         return property_obj.is_available
 
     def create_agreement(self, property_obj, tenant_obj):
-        self.log_action(f"Аренда онлайн для {tenant_obj.name} оформляется.")
+        self.audit_action("Аренда онлайн для %s оформляется.", tenant_obj.name)
         property_obj.is_available = False
 
     def confirm_rental(self, property_obj, tenant_obj):
-        self.send_notification(f"Аренда {property_obj.address} подтверждена для {tenant_obj.name} (онлайн).")
+        self.send_notification(
+            f"Аренда {property_obj.address} подтверждена для {tenant_obj.name} (онлайн).", tenant_obj.tenant_id
+        )
 
 
 class OfflineRentalProcess(RentalProcess):
@@ -50,8 +62,10 @@ class OfflineRentalProcess(RentalProcess):
         return property_obj.is_available
 
     def create_agreement(self, property_obj, tenant_obj):
-        self.log_action(f"Аренда оффлайн для {tenant_obj.name} оформляется.")
+        self.audit_action("Аренда оффлайн для %s оформляется.", tenant_obj.name)
         property_obj.is_available = False
 
     def confirm_rental(self, property_obj, tenant_obj):
-        self.send_notification(f"Аренда {property_obj.address} подтверждена для {tenant_obj.name} (в офисе).")
+        self.send_notification(
+            f"Аренда {property_obj.address} подтверждена для {tenant_obj.name} (в офисе).", tenant_obj.tenant_id
+        )
@@ -0,0 +1,311 @@
+# rental_service/repository.py
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from rental_service.interfaces import PropertyObserver
+from rental_service.indexes import PropertyIndex, RepositoryIndex
+from rental_service.property_base import Property
+from rental_service.client_base import Tenant, normalize_email, normalize_phone
+
+
+class IdAllocator:
+    """Монотонный генератор ID: однажды выданный ID не выдаётся повторно."""
+
+    def __init__(self, start: int = 1):
+        self.__next_id = start
+
+    def allocate(self) -> int:
+        value = self.__next_id
+        self.__next_id += 1
+        return value
+
+    def reserve(self, value: int):
+        """Учитывает ID, пришедший извне, чтобы не выдать его ещё раз."""
+        if value >= self.__next_id:
+            self.__next_id = value + 1
+
+    @property
+    def next_id(self) -> int:
+        return self.__next_id
+
+
+class Repository(ABC):
+    """Базовое хранилище объектов с доступом по ID за O(1)."""
+
+    def __init__(self):
+        self.__items: Dict[int, Any] = {}
+        self.__ids = IdAllocator()
+        self._indexes: List[RepositoryIndex] = []
+
+    def add_index(self, index: RepositoryIndex) -> RepositoryIndex:
+        """Подключает вторичный индекс и заполняет его текущими объектами."""
+        for item in self:
+            index.add(item)
+        self._indexes.append(index)
+        return index
+
+    @abstractmethod
+    def key_of(self, item) -> int:
+        """Возвращает ID объекта."""
+        pass
+
+    def next_id(self) -> int:
+        """Выдаёт новый уникальный ID."""
+        return self.__ids.allocate()
+
+    def peek_id(self) -> int:
+        """ID, который выдаст следующий вызов next_id() (не выдавая его)."""
+        return self.__ids.next_id
+
+    def reserve_id(self, key: int):
+        """Учитывает ID, выданный ранее: next_id() больше его не выдаст."""
+        self.__ids.reserve(key)
+
+    def add(self, item):
+        key = self.key_of(item)
+        if key in self.__items:
+            raise ValueError(f"Объект с ID={key} уже существует")
+        self.__items[key] = item
+        self.__ids.reserve(key)
+        added = []
+        try:
+            for index in self._indexes:
+                index.add(item)
+                added.append(index)
+        except Exception:
+            # Индекс отверг объект (например, календарь — пересечение периодов):
+            # откатываем вставку, чтобы репозиторий и индексы не разошлись.
+            for index in added:
+                index.remove(item)
+            del self.__items[key]
+            raise
+        return item
+
+    def get(self, key: int, default=None):
+        return self.__items.get(key, default)
+
+    def _reindex(self, item):
+        """Обновляет вторичные индексы после изменения объекта на месте."""
+        for index in self._indexes:
+            index.remove(item)
+            index.add(item)
+
+    def remove(self, key: int):
+        """Удаляет объект за O(1). Возвращает удалённый объект или None."""
+        item = self.__items.pop(key, None)
+        if item is not None:
+            for index in self._indexes:
+                index.remove(item)
+        return item
+
+    def __getitem__(self, key: int):
+        return self.__items[key]
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.__items
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.__items.values())
+
+
+class PropertyRepository(Repository, PropertyObserver):
+    """Хранилище недвижимости с индексами по типу и доступности."""
+
+    def __init__(self):
+        super().__init__()
+        self.__by_type: Dict[str, Dict[int, Property]] = {}
+        self.__by_availability: Dict[bool, Dict[int, Property]] = {True: {}, False: {}}
+
+    def add_index(self, index: PropertyIndex) -> PropertyIndex:
+        if not isinstance(index, PropertyIndex):
+            raise TypeError("Индекс недвижимости должен реализовывать PropertyIndex")
+        return super().add_index(index)
+
+    def key_of(self, item: Property) -> int:
+        return item.property_id
+
+    def add(self, item: Property) -> Property:
+        super().add(item)
+        pid = item.property_id
+        self.__by_type.setdefault(type(item).__name__.lower(), {})[pid] = item
+        self.__by_availability[bool(item.is_available)][pid] = item
+        item.subscribe(self)
+        return item
+
+    def remove(self, key: int) -> Optional[Property]:
+        item = super().remove(key)
+        if item is None:
+            return None
+        self.__by_type[type(item).__name__.lower()].pop(key, None)
+        self.__by_availability[bool(item.is_available)].pop(key, None)
+        item.unsubscribe(self)
+        return item
+
+    def property_changed(self, prop: Property, field: str, old, new):
+        if field == "is_available" and bool(old) != bool(new):
+            pid = prop.property_id
+            self.__by_availability[bool(old)].pop(pid, None)
+            self.__by_availability[bool(new)][pid] = prop
+        for index in self._indexes:
+            index.property_changed(prop, field, old, new)
+
+    # --- Запросы по индексам ---
+    def by_type(self, property_type: str) -> List[Property]:
+        return list(self.__by_type.get(property_type.lower(), {}).values())
+
+    def by_availability(self, is_available: bool = True) -> List[Property]:
+        return list(self.__by_availability[bool(is_available)].values())
+
+    def find(self, property_type: Optional[str] = None, is_available: Optional[bool] = None) -> List[Property]:
+        """Выборка по типу и/или доступности; перебирается меньший из индексов."""
+        if property_type is None and is_available is None:
+            return list(self)
+        if property_type is None:
+            return self.by_availability(is_available)
+        typed = self.__by_type.get(property_type.lower(), {})
+        if is_available is None:
+            return list(typed.values())
+        by_status = self.__by_availability[bool(is_available)]
+        if len(typed) <= len(by_status):
+            return [p for pid, p in typed.items() if pid in by_status]
+        return [p for pid, p in by_status.items() if pid in typed]
+
+
+class ImportReport(NamedTuple):
+    inserted: int
+    merged: int
+    rejected: int
+    errors: List[str]  # первые причины отказа (не больше max_errors)
+
+
+class TenantRepository(Repository):
+    """Хранилище арендаторов с доступом по ID, email и телефону за O(1).
+
+    Email и телефон индексируются в нормализованном виде (см. normalize_email,
+    normalize_phone), поэтому " Ivan@Example.com " и "ivan@example.com" —
+    один и тот же арендатор. Один email или телефон не может принадлежать
+    двум арендаторам.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__by_email: Dict[str, Tenant] = {}
+        self.__by_phone: Dict[str, Tenant] = {}
+
+    def key_of(self, item: Tenant) -> int:
+        return item.tenant_id
+
+    def add(self, item: Tenant, strict: bool = True) -> Tenant:
+        """Добавляет арендатора; при strict=False (загрузка старых данных) занятый
+        email или телефон не вызывает ошибку, а остается за прежним владельцем."""
+        email, phone = normalize_email(item.email), normalize_phone(item.phone)
+        owner = self.__owner(email, phone)
+        if owner is not None and owner is not item:
+            if strict:
+                raise ValueError(f"Email или телефон уже принадлежат арендатору ID={owner.tenant_id}")
+            if self.__by_email.get(email, item) is not item:
+                email = None
+            if self.__by_phone.get(phone, item) is not item:
+                phone = None
+        super().add(item)
+        self.__index(item, email, phone)
+        return item
+
+    def remove(self, key: int) -> Optional[Tenant]:
+        item = super().remove(key)
+        if item is not None:
+            for index, value in ((self.__by_email, normalize_email(item.email)),
+                                 (self.__by_phone, normalize_phone(item.phone))):
+                if value is not None and index.get(value) is item:
+                    del index[value]
+        return item
+
+    def __index(self, item: Tenant, email: Optional[str], phone: Optional[str]):
+        if email is not None:
+            self.__by_email[email] = item
+        if phone is not None:
+            self.__by_phone[phone] = item
+
+    def __owner(self, email: Optional[str], phone: Optional[str]) -> Optional[Tenant]:
+        owner = self.__by_email.get(email) if email is not None else None
+        if owner is None and phone is not None:
+            owner = self.__by_phone.get(phone)
+        return owner
+
+    # --- Поиск ---
+    def by_email(self, email: str) -> Optional[Tenant]:
+        key = normalize_email(email)
+        return self.__by_email.get(key) if key is not None else None
+
+    def by_phone(self, phone: str) -> Optional[Tenant]:
+        key = normalize_phone(phone)
+        return self.__by_phone.get(key) if key is not None else None
+
+    def find(self, email: str = None, phone: str = None) -> Optional[Tenant]:
+        """Арендатор с таким email или телефоном (email проверяется первым)."""
+        return self.__owner(normalize_email(email), normalize_phone(phone))
+
+    # --- Массовый импорт ---
+    def import_tenants(
+        self, records: Iterable[Dict[str, Any]], max_errors: int = 100, first_line: int = 1
+    ) -> ImportReport:
+        """Потоковый импорт записей с полями name, email, phone (например, строк csv.DictReader).
+
+        Записи обрабатываются по одной за один проход; дубликаты ищутся по
+        индексам email и телефона, поэтому память не растет с размером входа
+        (кроме самих добавленных арендаторов).
+        - новая запись добавляется с очередным ID (inserted);
+        - запись, совпавшая с арендатором по email или телефону, дополняет
+          его пустые поля (merged);
+        - запись без корректных email и телефона или с email и телефоном
+          разных арендаторов отклоняется (rejected).
+
+        first_line — номер первой записи в сообщениях об ошибках (для импорта по частям).
+        """
+        inserted = merged = rejected = 0
+        errors: List[str] = []
+        for line, record in enumerate(records, start=first_line):
+            name = (record.get("name") or "").strip()
+            email = normalize_email(record.get("email"))
+            phone = normalize_phone(record.get("phone"))
+            error = None
+            if email is None and phone is None:
+                error = "нет корректного email или телефона"
+            else:
+                by_email = self.__by_email.get(email) if email is not None else None
+                by_phone = self.__by_phone.get(phone) if phone is not None else None
+                if by_email is not None and by_phone is not None and by_email is not by_phone:
+                    error = (f"email принадлежит арендатору ID={by_email.tenant_id}, "
+                             f"телефон — ID={by_phone.tenant_id}")
+                elif by_email is not None or by_phone is not None:
+                    self.__merge(by_email or by_phone, name, email, phone)
+                    merged += 1
+                    continue
+                else:
+                    self.add(Tenant(self.next_id(), name, email or "", phone or ""))
+                    inserted += 1
+                    continue
+            rejected += 1
+            if len(errors) < max_errors:
+                errors.append(f"Запись {line}: {error}")
+        return ImportReport(inserted, merged, rejected, errors)
+
+    def __merge(self, tenant: Tenant, name: str, email: Optional[str], phone: Optional[str]):
+        # Телефон или email, уже занятый другим арендатором, не переносится
+        if email is not None and email in self.__by_email:
+            email = None
+        if phone is not None and phone in self.__by_phone:
+            phone = None
+        changed = tenant.merge(name, email or "", phone or "")
+        if changed:
+            self.__index(tenant, normalize_email(tenant.email), normalize_phone(tenant.phone))
+            self._reindex(tenant)
+
+
+class AgreementRepository(Repository):
+    """Хранилище договоров аренды с доступом по ID за O(1)."""
+
+    def key_of(self, item) -> int:
+        return item.agreement_id
@@ -0,0 +1,148 @@
+# rental_service/serialization.py
+"""Потоковая выгрузка и загрузка данных в формате JSON Lines.
+
+Одна строка — одна запись с полем kind: property, tenant или agreement.
+Договоры ссылаются на недвижимость и арендатора по ID, поэтому в файле
+записи недвижимости и арендаторов идут раньше договоров.
+"""
+import json
+from itertools import islice
+from operator import itemgetter
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, Tuple
+from rental_service.client_base import Tenant
+from rental_service.exceptions import RentalNotFoundError
+from rental_service.metrics import instrumented
+from rental_service.property_base import Property, PropertyMeta
+from rental_service.rental_agreement import RentalAgreement
+
+CHUNK_SIZE = 10_000  # записей на одну операцию write()
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_decode = json.JSONDecoder().decode
+
+# Кэш схем: тип -> (класс, выборка аргументов конструктора из записи по порядку)
+_schemas: Dict[str, Tuple[type, Callable[[dict], tuple]]] = {}
+
+
+def _schema(type_name: str) -> Tuple[type, Callable[[dict], tuple]]:
+    schema = _schemas.get(type_name)
+    if schema is None:
+        cls = PropertyMeta.registry.get(type_name.lower())
+        if cls is None:
+            raise ValueError(f"Неизвестный тип недвижимости: {type_name}")
+        schema = _schemas[type_name] = (cls, itemgetter(*cls.fields))
+    return schema
+
+
+# --- Выгрузка ---
+def _lines(properties: Iterable[Property], tenants: Iterable[Tenant], agreements: Iterable[RentalAgreement]):
+    for prop in properties:
+        data = prop.to_dict()
+        data["kind"] = "property"
+        yield _encode(data)
+    for tenant in tenants:
+        data = tenant.to_dict()
+        data["kind"] = "tenant"
+        yield _encode(data)
+    for agreement in agreements:
+        data = agreement.to_dict()
+        del data["tenant"]  # арендатор сохраняется отдельной записью, здесь только tenant_id
+        data["kind"] = "agreement"
+        yield _encode(data)
+
+
+@instrumented("dump_jsonl", method=False)
+def dump_jsonl(
+    fp: IO[str],
+    properties: Iterable[Property] = (),
+    tenants: Iterable[Tenant] = (),
+    agreements: Iterable[RentalAgreement] = (),
+) -> int:
+    """Пишет записи в файл пачками по CHUNK_SIZE строк; возвращает число записей."""
+    count = 0
+    chunk = []
+    for line in _lines(properties, tenants, agreements):
+        chunk.append(line)
+        if len(chunk) >= CHUNK_SIZE:
+            fp.write("\n".join(chunk) + "\n")
+            count += len(chunk)
+            chunk.clear()
+    if chunk:
+        fp.write("\n".join(chunk) + "\n")
+        count += len(chunk)
+    return count
+
+
+# --- Загрузка ---
+def _read_records(fp: IO[str]) -> Iterator[Dict[str, Any]]:
+    """Декодирует строки пачками: одна строка JSON-массива на CHUNK_SIZE записей
+    вместо отдельного вызова decode() на каждую запись."""
+    while True:
+        chunk = list(islice(fp, CHUNK_SIZE))
+        if not chunk:
+            return
+        lines = [line for line in chunk if not line.isspace()]
+        if lines:
+            yield from _decode("[" + ",".join(lines) + "]")
+
+
+def load_jsonl(fp: IO[str], properties=None, tenants=None) -> Iterator[Any]:
+    """Читает файл построчно и отдает объекты по одному (генератор).
+
+    properties / tenants — отображения ID -> объект (например, репозитории),
+    через которые договоры находят свои недвижимость и арендатора. Если они не
+    переданы, загрузчик сам запоминает прочитанные объекты. Если переданы,
+    вызывающий код должен добавлять в них полученные объекты (см. load_into).
+    """
+    if properties is None:
+        properties = {}
+        remember_properties = properties.__setitem__
+    else:
+        remember_properties = None
+    if tenants is None:
+        tenants = {}
+        remember_tenants = tenants.__setitem__
+    else:
+        remember_tenants = None
+
+    for data in _read_records(fp):
+        kind = data.get("kind")
+        if kind == "property":
+            cls, arguments = _schema(data["type"])
+            try:
+                obj = cls(*arguments(data))
+            except KeyError:
+                obj = Property.from_dict(data)  # неполная запись: значения по умолчанию
+            if remember_properties:
+                remember_properties(obj.property_id, obj)
+        elif kind == "tenant":
+            obj = Tenant(data["tenant_id"], data["name"], data["email"], data["phone"])
+            if remember_tenants:
+                remember_tenants(obj.tenant_id, obj)
+        elif kind == "agreement":
+            prop = properties.get(data["property_id"])
+            tenant = tenants.get(data["tenant_id"])
+            if prop is None or tenant is None:
+                raise RentalNotFoundError(
+                    f"Договор {data['agreement_id']}: не найдены недвижимость "
+                    f"{data['property_id']} или арендатор {data['tenant_id']}"
+                )
+            obj = RentalAgreement.from_dict(data, tenant, prop)
+        else:
+            raise ValueError(f"Неизвестный тип записи: {kind}")
+        yield obj
+
+
+@instrumented("load_into", method=False)
+def load_into(fp: IO[str], properties, tenants, agreements) -> int:
+    """Загружает файл прямо в репозитории; возвращает число записей."""
+    count = 0
+    for obj in load_jsonl(fp, properties, tenants):
+        if isinstance(obj, Property):
+            properties.add(obj)
+        elif isinstance(obj, Tenant):
+            tenants.add(obj)
+        else:
+            agreements.add(obj)
+        count += 1
+    return count
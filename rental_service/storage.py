@@ -0,0 +1,420 @@
+# rental_service/storage.py
+"""Хранение недвижимости, арендаторов и договоров в SQLite.
+
+Запись идет через одно соединение-писатель пакетами executemany внутри
+транзакции, чтение — через небольшой пул соединений (WAL позволяет читателям
+работать параллельно с писателем).
+"""
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from rental_service.client_base import Tenant
+from rental_service.indexes import PropertyIndex, RepositoryIndex
+from rental_service.property_base import Property, PropertyMeta
+from rental_service.rental_agreement import RentalAgreement
+
+logger = logging.getLogger("rental_service")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS properties (
+    property_id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    address TEXT NOT NULL,
+    area REAL NOT NULL,
+    monthly_rate REAL NOT NULL,
+    is_available INTEGER NOT NULL,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_properties_type ON properties(type, is_available, monthly_rate);
+CREATE INDEX IF NOT EXISTS idx_properties_available ON properties(is_available, monthly_rate);
+CREATE INDEX IF NOT EXISTS idx_properties_rate ON properties(monthly_rate);
+CREATE INDEX IF NOT EXISTS idx_properties_address ON properties(address);
+
+CREATE TABLE IF NOT EXISTS tenants (
+    tenant_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    phone TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS agreements (
+    agreement_id INTEGER PRIMARY KEY,
+    tenant_id INTEGER NOT NULL,
+    property_id INTEGER NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    extras TEXT NOT NULL DEFAULT '[]',
+    total_cost REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_agreements_property ON agreements(property_id);
+CREATE INDEX IF NOT EXISTS idx_agreements_tenant ON agreements(tenant_id);
+
+-- Следующий ID каждой таблицы: удаленный объект с наибольшим ID не отдает его снова
+CREATE TABLE IF NOT EXISTS next_ids (
+    table_name TEXT PRIMARY KEY,
+    next_id INTEGER NOT NULL
+);
+"""
+
+UPSERT_PROPERTY = (
+    "INSERT OR REPLACE INTO properties "
+    "(property_id, type, address, area, monthly_rate, is_available, extra) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+UPSERT_NEXT_ID = "INSERT OR REPLACE INTO next_ids (table_name, next_id) VALUES (?, ?)"
+UPSERT_TENANT = "INSERT OR REPLACE INTO tenants (tenant_id, name, email, phone) VALUES (?, ?, ?, ?)"
+UPSERT_AGREEMENT = (
+    "INSERT OR REPLACE INTO agreements "
+    "(agreement_id, tenant_id, property_id, start_date, end_date, extras, total_cost) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+PROPERTY_COLUMNS = "property_id, type, address, area, monthly_rate, is_available, extra"
+KEY_COLUMNS = {"properties": "property_id", "tenants": "tenant_id", "agreements": "agreement_id"}
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")  # 64 МБ страничного кэша на соединение
+    return conn
+
+
+class ConnectionPool:
+    """Пул соединений для читателей; соединения создаются по мере надобности."""
+
+    def __init__(self, path: str, size: int = 4):
+        self.__path = path
+        self.__size = size
+        self.__created = 0
+        self.__idle: queue.LifoQueue = queue.LifoQueue()
+        self.__lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self.__idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self.__lock:
+                if self.__created < self.__size:
+                    self.__created += 1
+                    conn = _connect(self.__path)
+            if conn is None:
+                conn = self.__idle.get()  # все соединения заняты — ждем свободное
+        try:
+            yield conn
+        finally:
+            self.__idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self.__idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# --- Преобразование объектов в строки таблиц и обратно ---
+def property_row(prop: Property) -> tuple:
+    extra = {name: getattr(prop, name) for name in prop.extra_fields}
+    return (
+        prop.property_id,
+        type(prop).__name__.lower(),
+        prop.address,
+        prop.area,
+        prop.monthly_rate,
+        int(bool(prop.is_available)),
+        _dumps(extra),
+    )
+
+
+def property_from_row(row) -> Property:
+    property_id, type_name, address, area, monthly_rate, is_available, extra = row
+    cls = PropertyMeta.registry.get(type_name)
+    if cls is None:
+        raise ValueError(f"Неизвестный тип недвижимости: {type_name}")
+    return cls(property_id, address, area, monthly_rate, is_available=bool(is_available), **json.loads(extra))
+
+
+def tenant_row(tenant: Tenant) -> tuple:
+    return tenant.tenant_id, tenant.name, tenant.email, tenant.phone
+
+
+def agreement_row(agreement: RentalAgreement) -> tuple:
+    return (
+        agreement.agreement_id,
+        agreement.tenant.tenant_id,
+        agreement.property_.property_id,
+        str(agreement.start_date),
+        str(agreement.end_date),
+        _dumps(agreement.extras),
+        agreement.total_cost,
+    )
+
+
+class SQLiteStorage:
+    """Хранилище в файле SQLite с пакетной записью и пулом читателей."""
+
+    def __init__(self, path: str, pool_size: int = 4, batch_size: int = 1000):
+        if path in ("", ":memory:"):
+            # У каждого соединения пула была бы своя пустая база
+            raise ValueError("SQLiteStorage нужен файл базы: временная база не видна читателям пула")
+        self.batch_size = batch_size
+        self.__pool = ConnectionPool(path, pool_size)
+        self.__writer = _connect(path)
+        self.__write_lock = threading.RLock()
+        self.__writer.executescript(SCHEMA)
+
+        # Отложенные изменения из подключенных репозиториев (см. attach)
+        self.__dirty: Dict[str, Dict[int, object]] = {"properties": {}, "tenants": {}, "agreements": {}}
+        self.__deleted: Dict[str, Set[int]] = {"properties": set(), "tenants": set(), "agreements": set()}
+        self.__pending = 0
+        self.__repositories: Dict[str, object] = {}  # подключенные репозитории (см. attach)
+
+    # --- Пакетная запись ---
+    def __write_many(self, sql: str, rows: Iterable[tuple]) -> int:
+        count = 0
+        batch: List[tuple] = []
+        with self.__write_lock:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    with self.__writer:  # одна транзакция на пакет
+                        self.__writer.executemany(sql, batch)
+                    count += len(batch)
+                    batch.clear()
+            if batch:
+                with self.__writer:
+                    self.__writer.executemany(sql, batch)
+                count += len(batch)
+        return count
+
+    def __execute_many(self, sql: str, rows: Iterable[tuple]) -> int:
+        """Пакеты executemany внутри уже открытой транзакции писателя."""
+        count = 0
+        rows = iter(rows)
+        for batch in iter(lambda: list(islice(rows, self.batch_size)), []):
+            self.__writer.executemany(sql, batch)
+            count += len(batch)
+        return count
+
+    def save_properties(self, properties: Iterable[Property]) -> int:
+        return self.__write_many(UPSERT_PROPERTY, map(property_row, properties))
+
+    def save_tenants(self, tenants: Iterable[Tenant]) -> int:
+        return self.__write_many(UPSERT_TENANT, map(tenant_row, tenants))
+
+    def save_agreements(self, agreements: Iterable[RentalAgreement]) -> int:
+        return self.__write_many(UPSERT_AGREEMENT, map(agreement_row, agreements))
+
+    def delete(self, table: str, ids: Iterable[int]) -> int:
+        return self.__write_many(f"DELETE FROM {table} WHERE {KEY_COLUMNS[table]} = ?", ((i,) for i in ids))
+
+    # --- Чтение ---
+    def load_properties(self) -> Iterator[Property]:
+        with self.__pool.connection() as conn:
+            cursor = conn.execute(f"SELECT {PROPERTY_COLUMNS} FROM properties ORDER BY property_id")
+            for rows in iter(lambda: cursor.fetchmany(self.batch_size), []):
+                yield from map(property_from_row, rows)
+
+    def load_tenants(self) -> Iterator[Tenant]:
+        with self.__pool.connection() as conn:
+            cursor = conn.execute("SELECT tenant_id, name, email, phone FROM tenants ORDER BY tenant_id")
+            for rows in iter(lambda: cursor.fetchmany(self.batch_size), []):
+                for row in rows:
+                    yield Tenant(*row)
+
+    def load_agreements(self, properties, tenants) -> Iterator[RentalAgreement]:
+        """Договоры со ссылками, разрешенными через отображения ID -> объект.
+
+        Договор, ссылающийся на отсутствующий объект или арендатора, пропускается
+        с предупреждением в журнале, чтобы одна «висячая» строка не мешала запуску.
+        """
+        with self.__pool.connection() as conn:
+            cursor = conn.execute(
+                "SELECT agreement_id, tenant_id, property_id, start_date, end_date, extras, total_cost "
+                "FROM agreements ORDER BY agreement_id"
+            )
+            for rows in iter(lambda: cursor.fetchmany(self.batch_size), []):
+                for agreement_id, tenant_id, property_id, start_date, end_date, extras, total_cost in rows:
+                    prop = properties.get(property_id)
+                    tenant = tenants.get(tenant_id)
+                    if prop is None or tenant is None:
+                        logger.warning(
+                            "Договор %s пропущен: не найдены недвижимость %s или арендатор %s",
+                            agreement_id, property_id, tenant_id,
+                        )
+                        continue
+                    data = {
+                        "agreement_id": agreement_id,
+                        "start_date": start_date,
+                        "end_date": end_date,
+                        "extras": json.loads(extras),
+                        "total_cost": total_cost,
+                    }
+                    yield RentalAgreement.from_dict(data, tenant, prop)
+
+    def find_properties(
+        self,
+        property_type: Optional[str] = None,
+        is_available: Optional[bool] = None,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+    ) -> List[Property]:
+        """Выборка по индексированным колонкам без загрузки всей таблицы."""
+        conditions, params = [], []
+        if property_type is not None:
+            conditions.append("type = ?")
+            params.append(property_type.lower())
+        if is_available is not None:
+            conditions.append("is_available = ?")
+            params.append(int(bool(is_available)))
+        if min_rate is not None:
+            conditions.append("monthly_rate >= ?")
+            params.append(min_rate)
+        if max_rate is not None:
+            conditions.append("monthly_rate <= ?")
+            params.append(max_rate)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.__pool.connection() as conn:
+            rows = conn.execute(f"SELECT {PROPERTY_COLUMNS} FROM properties{where} ORDER BY monthly_rate", params)
+            return [property_from_row(row) for row in rows]
+
+    def count(self, table: str) -> int:
+        if table not in self.__dirty:
+            raise ValueError(f"Неизвестная таблица: {table}")
+        with self.__pool.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    # --- Синхронизация с репозиториями ---
+    def attach(self, properties, tenants, agreements):
+        """Загружает сохраненные данные в репозитории и дальше сохраняет их изменения.
+
+        Изменения копятся и записываются пакетом, когда их набирается batch_size,
+        а также при flush() и close().
+        """
+        syncs = [
+            properties.add_index(_PropertySync(self)),
+            tenants.add_index(_RepositorySync(self, "tenants", tenants.key_of)),
+            agreements.add_index(_RepositorySync(self, "agreements", agreements.key_of)),
+        ]
+        for sync in syncs:
+            sync.suspended = True
+        try:
+            for prop in self.load_properties():
+                properties.add(prop)
+            for tenant in self.load_tenants():
+                owner = tenants.find(tenant.email, tenant.phone)
+                if owner is not None:
+                    # Старые базы могли сохранить общий email или телефон у двух арендаторов
+                    logger.warning(
+                        "Арендатор %s: email или телефон уже принадлежат арендатору %s, поиск по ним вернет его",
+                        tenant.tenant_id, owner.tenant_id,
+                    )
+                tenants.add(tenant, strict=False)
+            for agreement in self.load_agreements(properties, tenants):
+                agreements.add(agreement)
+            with self.__pool.connection() as conn:
+                next_ids = dict(conn.execute("SELECT table_name, next_id FROM next_ids"))
+            self.__repositories = {"properties": properties, "tenants": tenants, "agreements": agreements}
+            for table, repository in self.__repositories.items():
+                if table in next_ids:
+                    repository.reserve_id(next_ids[table] - 1)
+        finally:
+            for sync in syncs:
+                sync.suspended = False
+
+    def mark_dirty(self, table: str, key: int, item):
+        """Ставит объект в очередь на запись (например, договор после add_extra)."""
+        with self.__write_lock:
+            self.__deleted[table].discard(key)
+            self.__dirty[table][key] = item
+            self.__pending += 1
+            if self.__pending >= self.batch_size:
+                self.flush()
+
+    def mark_deleted(self, table: str, key: int):
+        with self.__write_lock:
+            self.__dirty[table].pop(key, None)
+            self.__deleted[table].add(key)
+            self.__pending += 1
+            if self.__pending >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Записывает все отложенные изменения одной транзакцией.
+
+        Если запись не удалась, изменения возвращаются в очередь и будут
+        записаны следующим flush(); в базе не остается части пакета.
+        """
+        with self.__write_lock:
+            dirty, self.__dirty = self.__dirty, {"properties": {}, "tenants": {}, "agreements": {}}
+            deleted, self.__deleted = self.__deleted, {"properties": set(), "tenants": set(), "agreements": set()}
+            pending, self.__pending = self.__pending, 0
+            try:
+                with self.__writer:
+                    self.__execute_many(UPSERT_PROPERTY, map(property_row, dirty["properties"].values()))
+                    self.__execute_many(UPSERT_TENANT, map(tenant_row, dirty["tenants"].values()))
+                    self.__execute_many(UPSERT_AGREEMENT, map(agreement_row, dirty["agreements"].values()))
+                    for table, ids in deleted.items():
+                        if ids:
+                            sql = f"DELETE FROM {table} WHERE {KEY_COLUMNS[table]} = ?"
+                            self.__execute_many(sql, ((i,) for i in ids))
+                    if self.__repositories and pending:
+                        self.__execute_many(
+                            UPSERT_NEXT_ID, ((table, repo.peek_id()) for table, repo in self.__repositories.items())
+                        )
+            except Exception:
+                self.__requeue(dirty, deleted, pending)
+                raise
+
+    def __requeue(self, dirty, deleted, pending: int):
+        """Возвращает неудавшийся пакет в очередь; более новые отметки важнее."""
+        for table in dirty:
+            newer_dirty, newer_deleted = self.__dirty[table], self.__deleted[table]
+            merged = dirty[table]
+            for key in newer_deleted:
+                merged.pop(key, None)
+            merged.update(newer_dirty)
+            self.__dirty[table] = merged
+            self.__deleted[table] = (deleted[table] - newer_dirty.keys()) | newer_deleted
+        self.__pending += pending
+
+    def close(self):
+        self.flush()
+        with self.__write_lock:
+            self.__writer.close()
+        self.__pool.close()
+
+
+class _RepositorySync(RepositoryIndex):
+    """Индекс-наблюдатель, который переносит изменения репозитория в хранилище."""
+
+    def __init__(self, storage: SQLiteStorage, table: str, key_of):
+        self.storage = storage
+        self.table = table
+        self.key_of = key_of
+        self.suspended = False
+
+    def add(self, item):
+        if not self.suspended:
+            self.storage.mark_dirty(self.table, self.key_of(item), item)
+
+    def remove(self, item):
+        if not self.suspended:
+            self.storage.mark_deleted(self.table, self.key_of(item))
+
+
+class _PropertySync(_RepositorySync, PropertyIndex):
+    def __init__(self, storage: SQLiteStorage):
+        super().__init__(storage, "properties", lambda prop: prop.property_id)
+
+    def property_changed(self, prop: Property, field: str, old, new):
+        if not self.suspended:
+            self.storage.mark_dirty(self.table, prop.property_id, prop)
@@ -0,0 +1,10 @@
+import pytest
+from rental_service.notifications import MemorySink, NotificationDispatcher, set_dispatcher
+
+
+@pytest.fixture
+def quiet_notifications():
+    """Уведомления уходят в память, а не в файл или консоль."""
+    set_dispatcher(NotificationDispatcher(MemorySink()))
+    yield
+    set_dispatcher(None)
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+import pytest
+from datetime import date
+from rental_service.async_service import AsyncRentalService
+from rental_service.client_base import Tenant
+from rental_service.property_base import Apartment
+from rental_service.rental_agreement import RentalAgreement
+from rental_service.rental_process import OfflineRentalProcess, OnlineRentalProcess
+
+
+pytestmark = pytest.mark.usefixtures("quiet_notifications")
+
+
+class SlowProcess(OnlineRentalProcess):
+    """Считает одновременно выполняемые запросы."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def create_agreement(self, property_obj, tenant_obj):
+        with self.lock:
+            SlowProcess.active += 1
+            SlowProcess.peak = max(SlowProcess.peak, SlowProcess.active)
+        time.sleep(0.02)
+        with self.lock:
+            SlowProcess.active -= 1
+        super().create_agreement(property_obj, tenant_obj)
+
+
+def test_concurrent_requests_book_each_unit_once():
+    tenant = Tenant(1, "Иван", "ivan@example.com", "123")
+    units = [Apartment(i, f"ул. Ленина, {i}", 40, 30000, 1) for i in range(20)]
+    online, offline = OnlineRentalProcess(), OfflineRentalProcess()
+    online.user_role = offline.user_role = "manager"
+
+    async def scenario():
+        async with AsyncRentalService(max_concurrency=16) as service:
+            calls = [
+                service.rent_property(online if i % 2 else offline, units[i % 20], tenant)
+                for i in range(400)
+            ]
+            results = await asyncio.gather(*calls)
+            approval = await service.handle_request({"type": "financial"})
+            agreement = RentalAgreement(1, tenant, units[0], date(2025, 1, 1), date(2026, 1, 1))
+            total = await service.calculate_total(agreement, 12)
+        return results, approval, total
+
+    results, approval, total = asyncio.run(scenario())
+    assert results.count("Аренда успешно оформлена.") == 20
+    assert approval == "Изменение одобрено финансовым отделом."
+    assert total == units[0].calculate_rental_cost(12)
+
+
+def test_concurrency_limit_and_timeout():
+    tenant = Tenant(1, "Иван", "ivan@example.com", "123")
+    process = SlowProcess()
+    process.user_role = "manager"
+
+    async def scenario():
+        async with AsyncRentalService(max_concurrency=3, max_workers=10) as service:
+            units = [Apartment(i, f"Адрес {i}", 40, 30000, 1) for i in range(12)]
+            await asyncio.gather(*(service.rent_property(process, u, tenant) for u in units))
+            with pytest.raises(TimeoutError):
+                await service.rent_property(process, Apartment(99, "X", 40, 30000, 1), tenant, timeout=0.001)
+
+    asyncio.run(scenario())
+    assert SlowProcess.peak == 3
+
+
+def test_close_does_not_block_event_loop():
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        class SleepyProcess:
+            def rent_property(self, property_obj, tenant_obj):
+                time.sleep(0.2)
+                return "ok"
+
+        service = AsyncRentalService()
+        # Операция в пуле, завершения которой ждет закрытие
+        rent = asyncio.create_task(service.rent_property(SleepyProcess(), None, None))
+        await asyncio.sleep(0.01)
+        task = asyncio.create_task(ticker())
+        await service.aclose()
+        task.cancel()
+        assert await rent == "ok"
+        return ticks
+
+    assert asyncio.run(scenario()) > 5
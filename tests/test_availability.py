@@ -0,0 +1,92 @@
+import random
+import pytest
+from datetime import date, timedelta
+from rental_service.availability import AvailabilityCalendar, IntervalTree
+from rental_service.client_base import Tenant
+from rental_service.exceptions import BookingConflictError
+from rental_service.property_base import Apartment
+from rental_service.rental_agreement import RentalAgreement
+from rental_service.repository import AgreementRepository, PropertyRepository
+
+
+pytestmark = pytest.mark.usefixtures("quiet_notifications")
+
+
+def make_agreement(agreement_id, prop, start, end):
+    tenant = Tenant(1, "Иван", "ivan@example.com", "123")
+    return RentalAgreement(agreement_id, tenant, prop, start, end)
+
+
+def test_agreement_parses_and_validates_dates():
+    apt = Apartment(1, "A", 40, 30000, 2)
+    agreement = make_agreement(1, apt, "2025-01-01", date(2025, 6, 1))
+    assert agreement.start_date == date(2025, 1, 1)
+    assert agreement.end_date == date(2025, 6, 1)
+    with pytest.raises(ValueError):
+        make_agreement(2, apt, "01.01.2025", "2025-06-01")
+    with pytest.raises(ValueError):
+        make_agreement(3, apt, "2025-06-01", "2025-06-01")
+
+
+def test_calendar_half_open_periods():
+    apt, other = Apartment(1, "A", 40, 30000, 2), Apartment(2, "B", 50, 40000, 2)
+    agreements = AgreementRepository()
+    calendar = agreements.add_index(AvailabilityCalendar())
+    agreements.add(make_agreement(1, apt, "2025-01-01", "2025-03-01"))
+
+    assert not calendar.is_free(1, "2025-02-01", "2025-04-01")
+    assert calendar.is_free(1, "2025-03-01", "2025-04-01")  # конец не входит в период
+    assert calendar.is_free(1, "2024-12-01", "2025-01-01")
+    assert calendar.free_units("2025-02-01", "2025-02-02", [apt, other]) == [other]
+
+    with pytest.raises(BookingConflictError):
+        agreements.add(make_agreement(2, apt, "2025-02-15", "2025-05-01"))
+    assert 2 not in agreements  # репозиторий откатил вставку
+
+    agreements.remove(1)
+    assert calendar.is_free(1, "2025-02-01", "2025-04-01")
+    assert calendar.busy_units("2024-01-01", "2030-01-01") == set()
+
+
+def test_interval_tree_matches_linear_scan():
+    rng = random.Random(7)
+    tree = IntervalTree(seed=1)
+    intervals = {}
+    for key in range(2000):
+        start = rng.randrange(0, 10_000)
+        intervals[key] = (start, start + rng.randrange(1, 300))
+        tree.insert(*intervals[key], key, key)
+    for key in rng.sample(sorted(intervals), 500):
+        assert tree.remove(*intervals.pop(key), key)
+    assert len(tree) == len(intervals)
+
+    for _ in range(200):
+        lo = rng.randrange(0, 10_000)
+        hi = lo + rng.randrange(1, 500)
+        expected = {k for k, (s, e) in intervals.items() if s < hi and e > lo}
+        assert set(tree.overlapping(lo, hi)) == expected
+
+
+def test_free_units_over_many_properties():
+    props = [Apartment(i, f"Адрес {i}", 40, 30000, 2) for i in range(1, 101)]
+    agreements = AgreementRepository()
+    calendar = agreements.add_index(AvailabilityCalendar())
+    day = date(2025, 1, 1)
+    for i, prop in enumerate(props[:50], start=1):
+        agreements.add(make_agreement(i, prop, day + timedelta(days=i), day + timedelta(days=i + 10)))
+    free = calendar.free_units(day + timedelta(days=20), day + timedelta(days=30), props)
+    assert [p.property_id for p in free] == list(range(1, 11)) + list(range(30, 101))
+
+
+def test_free_units_from_tracked_properties():
+    properties = PropertyRepository()
+    agreements = AgreementRepository()
+    calendar = agreements.add_index(AvailabilityCalendar())
+    properties.add_index(calendar.units)
+    for i in range(1, 6):
+        properties.add(Apartment(i, f"Адрес {i}", 40, 30000, 2))
+    agreements.add(make_agreement(1, properties.get(2), "2025-01-01", "2025-03-01"))
+    properties.remove(5)
+    free = calendar.free_units("2025-02-01", "2025-02-10")
+    assert [p.property_id for p in free] == [1, 3, 4]
+    assert [p.property_id for p in calendar.free_units("2025-03-01", "2025-04-01")] == [1, 2, 3, 4]
@@ -0,0 +1,68 @@
+import io
+import json
+import pytest
+from console_app import RentalApp, main
+from rental_service.journal import Journal
+
+COMMANDS = [
+    {"op": "add_property", "args": {"property_type": "apartment", "address": "ул. Ленина, 10",
+                                    "area": 45.0, "monthly_rate": 30000, "number_of_rooms": 2}},
+    {"op": "add_tenant", "args": {"name": "Иван", "email": "ivan@example.com", "phone": "+79991234567"}},
+    {"op": "add_agreement", "args": {"property_id": 1, "tenant_id": 1,
+                                     "start_date": "2025-01-01", "end_date": "2025-12-31"}},
+    {"op": "add_extra", "args": {"agreement_id": 1, "service_name": "Уборка", "price": 2000}},
+    {"op": "calculate_total", "args": {"agreement_id": 1, "months": 12}},
+    {"op": "update_property", "args": {"property_id": 99, "monthly_rate": 1}},
+    {"op": "update_property", "args": {"property_id": 1, "area": -5}},
+    {"op": "run"},
+    {"op": "rent_agreement", "args": {"agreement_id": 1}},
+]
+
+
+def test_batch_returns_result_per_command():
+    app = RentalApp()
+    results = list(app.run_batch(COMMANDS, chunk_size=4))
+    assert [r.line for r in results] == list(range(1, len(COMMANDS) + 1))
+    assert [r.ok for r in results] == [True, True, True, True, True, False, False, False, True]
+    assert results[0].result["property_id"] == 1
+    assert results[2].result["tenant_id"] == 1 and "tenant" not in results[2].result
+    assert results[4].result == app.properties.get(1).calculate_rental_cost(12) + 2000
+    assert results[5].error.startswith("RentalNotFoundError")
+    assert results[7].error == "ValueError: Неизвестная операция: run"
+    assert app.properties.get(1).area == 45.0
+    assert not app.properties.get(1).is_available
+
+
+def test_batch_command_line(tmp_path, capsys):
+    source = tmp_path / "ops.jsonl"
+    source.write_text(
+        "\n".join(json.dumps(c, ensure_ascii=False) for c in COMMANDS[:5]) + "\n{не json\n\n", encoding="utf-8"
+    )
+    output = tmp_path / "results.jsonl"
+    journal = tmp_path / "journal"
+    code = main(["--batch", str(source), "--output", str(output), "--journal", str(journal), "--chunk-size", "2"])
+    assert code == 1  # одна строка с ошибкой
+    results = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert len(results) == 6
+    assert results[-1]["ok"] is False and results[-1]["op"] is None
+    assert "оп/с" in capsys.readouterr().err
+
+    # Изменения пакета сохранены в журнале
+    recovered = RentalApp(journal=Journal(str(journal), fsync=False))
+    assert recovered.agreements.get(1).extras == [("Уборка", 2000)]
+    recovered.close()
+
+
+def test_batch_file_report():
+    app = RentalApp()
+    source = io.StringIO("\n".join(json.dumps(c) for c in COMMANDS))
+    report = app.run_batch_file(source, io.StringIO())
+    assert (report.total, report.failed) == (len(COMMANDS), 3)
+    assert report.ops_per_sec > 0
+
+
+def test_missing_batch_file_does_not_open_storage(tmp_path):
+    journal = tmp_path / "journal"
+    with pytest.raises(FileNotFoundError):
+        main(["--batch", str(tmp_path / "нет.jsonl"), "--journal", str(journal)])
+    assert not journal.exists()
@@ -0,0 +1,69 @@
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from datetime import date
+from rental_service.booking import BookingEngine
+from rental_service.client_base import Tenant
+from rental_service.exceptions import BookingConflictError
+from rental_service.property_base import Apartment
+from rental_service.rental_agreement import RentalAgreement
+from rental_service.rental_process import OnlineRentalProcess
+
+UNITS = 50
+CALLS = 5000
+
+
+class SlowCheckProcess(OnlineRentalProcess):
+    """Отдает GIL между проверкой и оформлением, чтобы гонка проявлялась стабильно."""
+
+    def check_availability(self, property_obj) -> bool:
+        available = super().check_availability(property_obj)
+        time.sleep(0.0001)
+        return available
+
+
+pytestmark = pytest.mark.usefixtures("quiet_notifications")
+
+
+@pytest.mark.parametrize("process_class", [OnlineRentalProcess, SlowCheckProcess])
+def test_concurrent_rentals_book_each_unit_once(process_class):
+    units = [Apartment(i, f"ул. Ленина, {i}", 40, 30000, 1) for i in range(UNITS)]
+    tenant = Tenant(1, "Иван", "ivan@example.com", "+79991234567")
+    process = process_class()
+    process.user_role = "manager"
+
+    def book(call):
+        unit = units[call // (CALLS // UNITS)]  # соседние вызовы бьют в один объект
+        return unit.property_id, process.rent_property(unit, tenant)
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(book, range(CALLS)))
+
+    successes = Counter(pid for pid, message in results if message == "Аренда успешно оформлена.")
+    assert successes == Counter({pid: 1 for pid in range(UNITS)})
+    assert sum(1 for _, message in results if message == "Недвижимость недоступна.") == CALLS - UNITS
+    assert not any(unit.is_available for unit in units)
+
+
+def test_compare_and_set_with_stale_version():
+    engine = BookingEngine()
+    apt = Apartment(1, "A", 40, 30000, 1)
+    seen = apt.version
+    apt.monthly_rate = 35000  # кто-то изменил объект после чтения
+    result = engine.try_book(apt, expected_version=seen)
+    assert not result.success and apt.is_available
+
+    result = engine.try_book(apt, expected_version=apt.version)
+    assert result.success and not apt.is_available
+    assert not engine.try_book(apt).success
+
+
+def test_agreement_rent_property_reports_conflict():
+    tenant = Tenant(1, "Иван", "ivan@example.com", "+79991234567")
+    apt = Apartment(1, "A", 40, 30000, 1)
+    first = RentalAgreement(1, tenant, apt, date(2025, 1, 1), date(2026, 1, 1))
+    second = RentalAgreement(2, tenant, apt, date(2025, 1, 1), date(2026, 1, 1))
+    first.rent_property()
+    with pytest.raises(BookingConflictError):
+        second.rent_property()
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = [
+    "rental_service.property_base",
+    "rental_service.property_factory",
+    "rental_service.rental_agreement",
+    "rental_service.rental_process",
+    "rental_service.approval_chain",
+    "rental_service.repository",
+    "rental_service.indexes",
+]
+# Бюджет на импорт пакета (мкс); переопределяется через RENTAL_IMPORT_BUDGET_US
+IMPORT_BUDGET_US = int(os.environ.get("RENTAL_IMPORT_BUDGET_US", 300_000))
+
+
+def import_times(cwd):
+    """Запускает python -X importtime; возвращает ({модуль: cumulative мкс}, суммарное время)."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(MODULES)],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    )
+    times, total = {}, 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split(":", 1)[1].split("|")
+        times[name.strip()] = int(cumulative_us)
+        if name.startswith(" ") and not name.startswith("  "):  # модуль верхнего уровня
+            total += int(cumulative_us)
+    return times, total
+
+
+def test_import_has_no_side_effects(tmp_path):
+    times, _ = import_times(tmp_path)
+    assert os.listdir(tmp_path) == []  # лог-файл не создается при импорте
+    assert "numpy" not in times  # numpy нужен только property_table
+
+
+def test_import_time_budget(tmp_path):
+    times, total = import_times(tmp_path)
+    assert total < IMPORT_BUDGET_US, f"Импорт rental_service занял {total} мкс"
@@ -0,0 +1,135 @@
+import random
+from datetime import date
+import pytest
+from rental_service.client_base import Tenant
+from rental_service.property_base import Apartment, CommercialSpace, House
+from rental_service.rental_agreement import RentalAgreement
+from rental_service.repository import PropertyRepository
+from rental_service.indexes import AddressIndex, PortfolioStats, RateIndex
+
+
+def make_repo():
+    repo = PropertyRepository()
+    index = repo.add_index(AddressIndex())
+    repo.add(Apartment(1, "пр. Ленинградский, 12", 40, 30000, 1))
+    repo.add(Apartment(2, "ул. Ленина, 10", 50, 35000, 2))
+    repo.add(House(3, "Ленина", 120, 50000, True))
+    repo.add(House(4, "ул. Садовая, 5", 100, 45000, False))
+    return repo, index
+
+
+def test_address_search_is_ranked_by_match_quality():
+    _, index = make_repo()
+    found = [p.property_id for p in index.search("ЛЕНИН")]
+    assert found == [3, 2, 1]
+    assert [p.property_id for p in index.search("ленина")] == [3, 2]
+    assert [p.property_id for p in index.search("ленин", limit=1)] == [3]
+    assert index.search("тверская") == []
+
+
+def test_short_queries_match_substrings():
+    _, index = make_repo()
+    assert {p.property_id for p in index.search("5")} == {4}
+    assert len(index.search("")) == 4
+
+
+def test_address_index_follows_setter_and_delete():
+    repo, index = make_repo()
+    prop = repo.get(4)
+    prop.address = "ул. Тверская, 1"
+    assert index.search("садовая") == []
+    assert index.search("тверская") == [prop]
+
+    repo.remove(4)
+    assert index.search("тверская") == []
+    assert len(index) == 3
+
+
+def make_rate_repo():
+    repo = PropertyRepository()
+    index = repo.add_index(RateIndex())
+    repo.add(Apartment(1, "A", 40, 30000, 1))
+    repo.add(Apartment(2, "B", 50, 20000, 2, is_available=False))
+    repo.add(House(3, "C", 120, 50000, True))
+    repo.add(House(4, "D", 100, 40000, False, is_available=False))
+    return repo, index
+
+
+def test_rate_index_min_max_and_ranges():
+    _, index = make_rate_repo()
+    assert index.lowest().property_id == 2
+    assert index.highest().property_id == 3
+    assert index.lowest(is_available=True).property_id == 1
+    assert [p.property_id for p in index.between(20000, 40000)] == [2, 1, 4]
+    assert [p.property_id for p in index.between(20000, 40000, "house", True)] == []
+    assert [p.property_id for p in index.cheapest(2, "apartment")] == [2, 1]
+    assert [p.property_id for p in index.most_expensive(2)] == [3, 4]
+
+
+def test_rate_index_percentiles_match_full_recompute():
+    _, index = make_rate_repo()
+    assert index.median() == 35000
+    assert index.percentile(0) == 20000
+    assert index.percentile(100) == 50000
+    assert index.median("house") == 45000
+    assert index.median("commercialspace") is None
+
+
+def test_rate_index_follows_setters_and_delete():
+    repo, index = make_rate_repo()
+    repo.get(3).monthly_rate = 10000
+    assert index.lowest().property_id == 3
+    repo.get(3).is_available = False
+    assert index.lowest(is_available=True).property_id == 1
+    repo.remove(3)
+    assert index.lowest().property_id == 2
+    assert len(index) == 3
+
+
+def full_recompute(properties, property_type=None):
+    units = [p for p in properties if property_type is None or type(p).__name__.lower() == property_type]
+    rented = [p for p in units if not p.is_available]
+    return (
+        len(units),
+        len(rented),
+        len(rented) / len(units) if units else 0.0,
+        sum(p.monthly_rate for p in rented),
+        sum(p.monthly_rate / p.area for p in units) / len(units) if units else 0.0,
+    )
+
+
+def test_portfolio_stats_match_full_recompute():
+    rng = random.Random(3)
+    repo = PropertyRepository()
+    stats = repo.add_index(PortfolioStats())
+    tenant = Tenant(1, "Иван", "ivan@example.com", "+79991234567")
+    classes = [
+        lambda pid: Apartment(pid, f"ул. {pid}", rng.uniform(20, 200), rng.randrange(10_000, 90_000), 2),
+        lambda pid: House(pid, f"ул. {pid}", rng.uniform(50, 300), rng.randrange(30_000, 200_000), True),
+        lambda pid: CommercialSpace(pid, f"пр. {pid}", rng.uniform(10, 500), rng.randrange(5_000, 400_000), "retail"),
+    ]
+    for step in range(3000):
+        action = rng.random()
+        if action < 0.3 or len(repo) < 5:
+            repo.add(rng.choice(classes)(repo.next_id()))
+            continue
+        prop = rng.choice(list(repo))
+        if action < 0.5:
+            prop.monthly_rate = rng.randrange(5_000, 400_000)
+        elif action < 0.6:
+            prop.area = rng.uniform(10, 500)
+        elif action < 0.75 and prop.is_available:
+            RentalAgreement(step, tenant, prop, date(2025, 1, 1), date(2026, 1, 1)).rent_property()
+        elif action < 0.85:
+            prop.is_available = True
+        else:
+            repo.remove(prop.property_id)
+
+    for property_type in (None, "apartment", "house", "commercialspace"):
+        expected = full_recompute(list(repo), property_type)
+        assert stats.totals(property_type) == pytest.approx(expected, rel=1e-9)
+        assert PortfolioStats.recompute(repo, property_type) == pytest.approx(expected, rel=1e-9)
+    assert 0 < stats.occupancy() < 1
+    assert set(stats.by_type()) == {"apartment", "house", "commercialspace"}
+    assert stats.totals("castle") == (0, 0, 0.0, 0.0, 0.0)
+    assert len(stats) == len(repo)
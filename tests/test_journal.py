@@ -0,0 +1,153 @@
+import io
+import json
+import os
+import pytest
+import console_app
+from console_app import RentalApp
+from rental_service.journal import Journal, JournalCorruptedError
+from rental_service.serialization import dump_jsonl
+
+
+def state(app):
+    buffer = io.StringIO()
+    dump_jsonl(buffer, app.properties, app.tenants, app.agreements)
+    return buffer.getvalue()
+
+
+def workload(app, count, start=0):
+    for i in range(start, start + count):
+        prop = app.add_property(
+            "apartment", address=f"ул. Ленина, {i}", area=40.0 + i, monthly_rate=20000 + i, number_of_rooms=2
+        )
+        tenant = app.add_tenant(f"Арендатор {i}", f"t{i}@example.com", f"+7999{i:07d}")
+        if i % 3 == 0:
+            app.update_property(prop.property_id, monthly_rate=25000 + i)
+        agreement = app.add_agreement(prop.property_id, tenant.tenant_id, "2025-01-01", "2025-12-31")
+        app.add_extra(agreement.agreement_id, "Уборка", 1500)
+        app.calculate_total(agreement.agreement_id, 12)
+        if i % 4 == 0:
+            app.rent_agreement(agreement.agreement_id)
+        if i % 5 == 4:
+            app.remove_extra(agreement.agreement_id, "Уборка")
+    app.import_tenant_records([
+        {"name": "Новый", "email": f"new{start}@example.com", "phone": f"8888{start:07d}"},
+        {"name": "", "email": f"T{start}@Example.com", "phone": ""},
+    ])
+
+
+def open_app(directory, **options):
+    return RentalApp(journal=Journal(str(directory), fsync=False, **options))
+
+
+def test_recovery_replays_committed_operations(tmp_path):
+    app = open_app(tmp_path)
+    workload(app, 20)
+    app.checkpoint()
+    expected = state(app)
+    app.add_property("house", address="ул. Садовая, 1", area=100, monthly_rate=50000, has_garden=True)  # не зафиксирована
+    # Сбой: процесс завершился без close()
+
+    recovered = open_app(tmp_path)
+    assert recovered.recovery.snapshot_seq == 0
+    assert recovered.recovery.replayed > 0
+    assert state(recovered) == expected
+    assert recovered.calendar.is_free(1, "2025-01-01", "2025-02-01") is False
+    assert recovered.tenants.by_email("new0@example.com") is not None
+    recovered.close()
+
+
+def test_snapshot_and_tail_match_full_replay(tmp_path):
+    full = open_app(tmp_path / "full", snapshot_every=10**9)
+    snapshotted = open_app(tmp_path / "snap", snapshot_every=25)
+    for app in (full, snapshotted):
+        for chunk in range(5):
+            workload(app, 3, start=chunk * 3)
+            app.checkpoint()
+        app.close()
+    assert len([name for name in os.listdir(tmp_path / "snap") if name.startswith("snapshot.")]) == 1
+
+    from_full = open_app(tmp_path / "full")
+    from_snapshot = open_app(tmp_path / "snap")
+    assert from_snapshot.recovery.snapshot_seq > 0
+    assert from_snapshot.recovery.replayed < from_full.recovery.replayed
+    assert state(from_snapshot) == state(from_full)
+    # ID продолжаются одинаково после восстановления
+    assert from_snapshot.add_tenant("X", "x@example.com", "+79990009999").tenant_id == \
+        from_full.add_tenant("X", "x@example.com", "+79990009999").tenant_id
+
+
+def test_torn_last_record_is_discarded(tmp_path):
+    app = open_app(tmp_path)
+    workload(app, 5)
+    app.close()
+    expected = state(open_app(tmp_path))
+
+    segment = max((name for name in os.listdir(tmp_path) if name.startswith("journal.")),
+                  key=lambda name: int(name.split(".")[1]))
+    with open(tmp_path / segment, "a", encoding="utf-8") as fp:
+        fp.write('[999,"add_tenant",{"name":"Об')  # запись оборвалась посреди строки
+
+    recovered = open_app(tmp_path)
+    assert recovered.recovery.truncated
+    assert state(recovered) == expected
+    recovered.add_tenant("После сбоя", "after@example.com", "+79995550000")
+    recovered.close()
+    again = open_app(tmp_path)
+    assert not again.recovery.truncated
+    assert again.tenants.by_email("after@example.com") is not None
+
+
+def test_corruption_before_tail_is_an_error(tmp_path):
+    app = open_app(tmp_path)
+    workload(app, 5)
+    app.close()
+    path = next(tmp_path.glob("journal.*.jsonl"))
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    lines[3] = "мусор\n"
+    path.write_text("".join(lines), encoding="utf-8")
+    with pytest.raises(JournalCorruptedError):
+        open_app(tmp_path)
+
+
+def test_unknown_operation_is_rejected(tmp_path):
+    app = open_app(tmp_path)
+    with pytest.raises(ValueError):
+        app.apply("close", {})
+    app.close()
+
+
+def test_import_is_journaled_per_chunk(tmp_path, monkeypatch):
+    monkeypatch.setattr(console_app, "IMPORT_CHUNK_SIZE", 10)
+    app = open_app(tmp_path)
+    app.add_tenant("Старый", "old@example.com", "+79990000000")
+    records = ({"name": f"Импорт {i}", "email": f"imp{i}@example.com" if i != 17 else "", "phone": ""}
+               for i in range(25))  # генератор: импорт не требует всего входа сразу
+    report = app.import_tenant_records(records)
+    assert report[:3] == (24, 0, 1)
+    assert report.errors == ["Запись 18: нет корректного email или телефона"]
+    app.close()
+
+    logged = [json.loads(line) for path in tmp_path.glob("journal.*.jsonl")
+              for line in path.read_text(encoding="utf-8").splitlines()]
+    chunks = [args for _, op, args in logged if op == "import_tenant_records"]
+    assert [len(c["records"]) for c in chunks] == [10, 10, 5]
+    assert [c["first_id"] for c in chunks] == [2, 12, 21]
+
+    recovered = open_app(tmp_path)
+    assert state(recovered) == state(app)
+    recovered.close()
+
+
+def test_snapshot_keeps_ids_of_deleted_objects(tmp_path):
+    app = open_app(tmp_path, snapshot_every=1)
+    for i in range(3):
+        app.add_property("apartment", address=f"ул. Ленина, {i}", area=40.0, monthly_rate=20000, number_of_rooms=2)
+    app.remove_property(3)
+    app.checkpoint()  # снимок без объекта с наибольшим ID
+    app.close()
+
+    recovered = open_app(tmp_path)
+    assert recovered.recovery.snapshot_seq > 0 and recovered.recovery.replayed == 0
+    prop = recovered.add_property("house", address="ул. Садовая, 1", area=100, monthly_rate=50000, has_garden=True)
+    assert prop.property_id == 4
+    recovered.close()
@@ -0,0 +1,71 @@
+import time
+import pytest
+from rental_service import metrics
+from rental_service.approval_chain import Director, FinanceDepartment, RentalManager
+from rental_service.client_base import Tenant
+from rental_service.exceptions import PermissionDeniedError
+from rental_service.property_base import Apartment, House
+from rental_service.rental_process import OnlineRentalProcess
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics.registry.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.registry.reset()
+
+
+def test_counters_histograms_and_spans():
+    apt, house = Apartment(1, "A", 40, 30000, 2), House(2, "B", 100, 50000, True)
+    for months in (1, 6, 12):
+        apt.calculate_rental_cost(months)
+    house.calculate_rental_cost(12)
+    chain = RentalManager(FinanceDepartment(Director()))
+    chain.handle_request({"type": "major"})
+
+    registry = metrics.registry
+    assert registry.counter(metrics.CALLS, op="calculate_rental_cost", type="Apartment") == 3
+    assert registry.counter(metrics.CALLS, op="calculate_rental_cost", type="House") == 1
+    assert registry.counter(metrics.CALLS, op="handle_request", type="RentalManager") == 1
+    assert registry.histogram(metrics.DURATION, op="calculate_rental_cost", type="Apartment").count == 3
+
+    with metrics.span("quote", source="api"):
+        apt.calculate_rental_cost(24)
+    inner, outer = metrics.registry.spans()[-2:]
+    assert (inner.name, inner.parent, outer.name) == ("calculate_rental_cost", "quote", "quote")
+
+
+def test_errors_counted_and_prometheus_export(tmp_path):
+    process = OnlineRentalProcess()
+    with pytest.raises(PermissionDeniedError):
+        process.rent_property(Apartment(1, "A", 40, 30000, 2), Tenant(1, "Иван", "i@example.com", "1"))
+    assert metrics.registry.counter(metrics.ERRORS, op="rent_property", type="OnlineRentalProcess") == 1
+
+    path = tmp_path / "metrics.prom"
+    text = metrics.export_prometheus(str(path))
+    assert path.read_text(encoding="utf-8") == text
+    assert "# TYPE rental_service_calls_total counter" in text
+    assert 'rental_service_errors_total{op="rent_property",type="OnlineRentalProcess"} 1' in text
+    assert 'rental_service_duration_seconds_bucket{op="rent_property",type="OnlineRentalProcess",le="+Inf"} 1' in text
+    assert metrics.snapshot()["histograms"][0]["count"] == 1
+
+
+def test_disabled_collects_nothing():
+    metrics.disable()
+    Apartment(1, "A", 40, 30000, 2).calculate_rental_cost(12)
+    with metrics.span("noop"):
+        pass
+    assert metrics.snapshot() == {"counters": [], "histograms": []}
+
+
+def test_sampling_profiler_toggles_at_runtime():
+    metrics.start_profiler(interval=0.001)
+    deadline = time.perf_counter() + 0.2
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    profiler = metrics.stop_profiler()
+    assert not profiler.running
+    assert profiler.samples and "test_sampling_profiler_toggles_at_runtime" in profiler.collapsed()
+    profiler.samples.clear()
@@ -0,0 +1,119 @@
+import io
+import logging
+import os
+import pytest
+from rental_service import mixins
+from rental_service.mixins import (
+    LoggingMixin, audit_disabled, configure_logging, flush_logs, logger, shutdown_logging,
+)
+from rental_service.property_base import Apartment
+
+
+@pytest.fixture
+def restore_logging():
+    """Возвращает настройки логирования, действовавшие до теста."""
+    saved = dict(mixins._settings)
+    yield
+    shutdown_logging()
+    if saved:
+        configure_logging(**saved)
+    else:
+        mixins._settings.clear()  # снова настройка по умолчанию при первой записи
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def capture():
+    handler = ListHandler()
+    logger.addHandler(handler)
+    return handler
+
+
+def test_log_action_defers_formatting():
+    handler = capture()
+    try:
+        Apartment(1, "ул. Ленина, 10", 45.0, 30000, 2).calculate_rental_cost(12)
+    finally:
+        logger.removeHandler(handler)
+    record = handler.records[-1]
+    assert record.args == ("Apartment", 324000.0, 12)
+    assert record.getMessage() == "Apartment - Расчет аренды 324000.0 руб. за 12 мес."
+
+
+def test_audit_disabled_skips_log_action():
+    handler = capture()
+    try:
+        with audit_disabled():
+            Apartment(1, "A", 45.0, 30000, 2).calculate_rental_cost(12)
+        LoggingMixin().log_action("Скидка 10% применена")
+    finally:
+        logger.removeHandler(handler)
+    assert [r.getMessage() for r in handler.records] == ["LoggingMixin - Скидка 10% применена"]
+
+
+def test_flush_logs_writes_pending_records(tmp_path, restore_logging):
+    log_path = tmp_path / "app.log"
+    configure_logging(filename=str(log_path), console=False)
+    try:
+        LoggingMixin().log_action("Проверка сброса очереди")
+        flush_logs()
+        assert "Проверка сброса очереди" in log_path.read_text(encoding="utf-8")
+    finally:
+        shutdown_logging()
+
+
+def test_rotating_per_process_log_file(tmp_path, restore_logging):
+    configure_logging(
+        filename=str(tmp_path / "worker.log"), console=False, max_bytes=200, backup_count=2, per_process=True
+    )
+    try:
+        for i in range(20):
+            LoggingMixin().log_action("Сообщение %s", i)
+    finally:
+        shutdown_logging()
+    names = sorted(os.listdir(tmp_path))
+    assert names[0] == f"worker.{os.getpid()}.log"
+    assert len(names) == 3  # текущий файл и две архивные копии
+
+
+def test_unwritable_log_file_falls_back_to_console(tmp_path, restore_logging):
+    blocked = tmp_path / "rental_service.log"
+    blocked.mkdir()  # файл лога не открыть
+    configure_logging(filename=str(blocked), console=False)
+    assert Apartment(1, "A", 45.0, 30000, 2).calculate_rental_cost(3) == 90000
+    flush_logs()
+    assert [type(h) for h in mixins._handlers] == [mixins._ConsoleHandler]
+
+
+def test_log_action_returns_message():
+    assert LoggingMixin().log_action("Скидка %s%% применена", 10) == "LoggingMixin - Скидка 10% применена"
+    with audit_disabled():
+        assert LoggingMixin().log_action("Без записи") == "LoggingMixin - Без записи"
+
+
+def test_console_handler_follows_stderr_and_set_stream(capsys):
+    handler = mixins._ConsoleHandler()
+    record = logging.LogRecord("rental_service", logging.INFO, __file__, 1, "в stderr", None, None)
+    handler.emit(record)
+    assert capsys.readouterr().err.endswith("в stderr\n")
+    buffer = io.StringIO()
+    assert handler.setStream(buffer) is None
+    handler.emit(record)
+    handler.flush()
+    assert buffer.getvalue() == "в stderr\n"
+
+
+def test_audit_action_does_not_format_when_disabled():
+    class Template(str):
+        def __mod__(self, args):
+            raise AssertionError("форматирование при отключенном аудите")
+
+    with audit_disabled():
+        assert LoggingMixin().audit_action(Template("Расчет %s"), 1) is None
@@ -0,0 +1,57 @@
+import queue
+import threading
+import pytest
+from datetime import date
+from rental_service.client_base import Tenant
+from rental_service.notifications import (
+    FileSink, MemorySink, NotificationDispatcher, NotificationSink, set_dispatcher,
+)
+from rental_service.property_base import Apartment
+from rental_service.rental_agreement import RentalAgreement
+
+
+class BlockingSink(NotificationSink):
+    def __init__(self):
+        self.release = threading.Event()
+
+    def send_batch(self, notifications):
+        self.release.wait()
+
+
+def test_dispatcher_batches_and_coalesces_per_tenant():
+    sink = MemorySink()
+    dispatcher = NotificationDispatcher(sink, batch_size=50, flush_interval=0.01)
+    for _ in range(3):
+        dispatcher.submit("Оплата получена", recipient=1)
+    dispatcher.submit("Оплата получена", recipient=2)
+    dispatcher.close()
+
+    assert [(n.recipient, n.message) for n in sink.notifications] == [
+        (1, "Оплата получена"),
+        (2, "Оплата получена"),
+    ]
+
+
+def test_bounded_queue_applies_backpressure():
+    sink = BlockingSink()
+    dispatcher = NotificationDispatcher(sink, max_queue=2, batch_size=1, flush_interval=0.01)
+    with pytest.raises(queue.Full):
+        for i in range(10):
+            dispatcher.submit(f"Сообщение {i}", timeout=0.05)
+    sink.release.set()
+    dispatcher.close()
+
+
+def test_booking_path_only_enqueues(tmp_path):
+    path = tmp_path / "notifications.log"
+    set_dispatcher(NotificationDispatcher(FileSink(str(path))))
+    try:
+        tenant = Tenant(7, "Иван", "ivan@example.com", "+79991234567")
+        apartment = Apartment(1, "ул. Ленина, 10", 50, 30000, 2)
+        agreement = RentalAgreement(1, tenant, apartment, date(2025, 1, 1), date(2026, 1, 1))
+        agreement.rent_property()
+    finally:
+        set_dispatcher(None)  # close() доставляет очередь до конца
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert all(line.startswith("7\t") for line in lines)
@@ -1,4 +1,5 @@
-from rental_service.approval_chain import RentalManager, FinanceDepartment, Director
+import pytest
+from rental_service.approval_chain import RentalManager, FinanceDepartment, Director, Handler, NOT_HANDLED
 from rental_service.rental_process import OnlineRentalProcess, OfflineRentalProcess
 from rental_service.property_base import Apartment
 from rental_service.client_base import Tenant
@@ -12,6 +13,63 @@ def test_chain_of_responsibility():
     assert chain.handle_request({"type": "major"}) == "Изменение одобрено директором."
 
 
+def test_compiled_chain_matches_linked_chain():
+    class LeaseDesk(Handler):
+        request_type = "lease"
+
+        def approve(self, request):
+            return f"Аренда {request['id']} одобрена."
+
+    # Второй RentalManager недостижим для "minor": первое совпадение выигрывает
+    chain = RentalManager(LeaseDesk(FinanceDepartment(RentalManager(Director(LeaseDesk())))))
+    requests = [{"type": t, "id": i} for i, t in enumerate(["minor", "lease", "financial", "major", None] * 3)]
+    compiled = chain.compile()
+    assert compiled.handle_requests(requests) == [chain.handle_request(r) for r in requests]
+    assert chain.handle_requests(requests) == compiled.handle_requests(requests)
+    assert len(compiled) == 4
+
+    no_fallback = FinanceDepartment(RentalManager())
+    assert no_fallback.handle_request({"type": "major"}) == NOT_HANDLED
+    assert no_fallback.compile().handle_request({"type": "major"}) == NOT_HANDLED
+
+
+def test_legacy_handler_overriding_handle_request():
+    class LegalDepartment(Handler):
+        """Звено в старом стиле: маршрутизирует само, approve не переопределяет."""
+
+        def handle_request(self, request):
+            if request.get("type") == "legal":
+                return "Изменение одобрено юристами."
+            if self.next_handler:
+                return self.next_handler.handle_request(request)
+            return NOT_HANDLED
+
+    chain = RentalManager(LegalDepartment(FinanceDepartment(Director())))
+    requests = [{"type": t} for t in ["minor", "legal", "financial", "major"]]
+    expected = [
+        "Изменение одобрено менеджером.", "Изменение одобрено юристами.",
+        "Изменение одобрено финансовым отделом.", "Изменение одобрено директором.",
+    ]
+    assert [chain.handle_request(r) for r in requests] == expected
+    assert chain.compile().handle_requests(requests) == expected
+    assert LegalDepartment().handle_request({"type": "major"}) == NOT_HANDLED
+
+
+def test_handler_without_approve_is_rejected_at_definition():
+    with pytest.raises(TypeError):
+        class Forgetful(Handler):
+            request_type = "minor"
+    with pytest.raises(TypeError):
+        Handler()
+
+
+def test_long_chain_does_not_recurse():
+    chain = Director()
+    for _ in range(5000):
+        chain = FinanceDepartment(chain)
+    assert chain.handle_request({"type": "major"}) == "Изменение одобрено директором."
+
+
 def test_online_rental_process():
     process = OnlineRentalProcess()
     process.user_role = "manager"
@@ -0,0 +1,53 @@
+import pytest
+from rental_service.mixins import audit_disabled
+from rental_service.portfolio import PortfolioPricer
+from rental_service.property_base import Apartment, CommercialSpace, House
+from rental_service.property_table import PropertyTable
+
+
+def make_portfolio(count):
+    for pid in range(count):
+        kind = pid % 4
+        if kind == 0:
+            yield Apartment(pid, f"Адрес {pid}", 40, 20000 + pid, 2, pid % 3 != 0)
+        elif kind == 1:
+            yield House(pid, f"Адрес {pid}", 120, 50000 + pid, pid % 2 == 1, pid % 5 != 0)
+        elif kind == 2:
+            yield CommercialSpace(pid, f"Адрес {pid}", 200, 90000 + pid, "Retail", True)
+        else:
+            yield CommercialSpace(pid, f"Адрес {pid}", 200, 70000 + pid, "office", False)
+
+
+def expected(portfolio, horizons):
+    by_type, by_availability = {}, {False: [0.0] * len(horizons), True: [0.0] * len(horizons)}
+    with audit_disabled():
+        for prop in portfolio:
+            row = by_type.setdefault(type(prop).__name__.lower(), [0.0] * len(horizons))
+            for j, months in enumerate(horizons):
+                cost = prop.calculate_rental_cost(months)
+                row[j] += cost
+                by_availability[prop.is_available][j] += cost
+    return by_type, by_availability
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reprice_matches_per_object_sums(workers):
+    portfolio = list(make_portfolio(2000))
+    horizons = (1, 12, 36)
+    by_type, by_availability = expected(portfolio, horizons)
+
+    report = PortfolioPricer(max_workers=workers).reprice(portfolio, horizons)
+    assert report.units == 2000
+    assert report.count_by_type == {"apartment": 500, "house": 500, "commercialspace": 1000}
+    for name, row in by_type.items():
+        assert report.by_type[name] == pytest.approx(row)
+    for flag, row in by_availability.items():
+        assert report.by_availability[flag] == pytest.approx(row)
+    assert report.total == pytest.approx([a + b for a, b in zip(*by_availability.values())])
+
+
+def test_reprice_accepts_property_table():
+    portfolio = list(make_portfolio(300))
+    pricer = PortfolioPricer(max_workers=1)
+    from_table = pricer.reprice(PropertyTable.from_properties(portfolio), (6, 24))
+    assert from_table == pricer.reprice(portfolio, (6, 24))
@@ -0,0 +1,70 @@
+import pytest
+from rental_service.pricing import PricingCache
+from rental_service.property_base import Apartment, CommercialSpace, House
+
+
+def test_hits_misses_and_setter_invalidation():
+    cache = PricingCache(maxsize=10)
+    apt = Apartment(1, "A", 40, 30000, 2)
+    assert cache.quote(apt, 12) == apt.calculate_rental_cost(12)
+    assert cache.quote(apt, 12) == 30000 * 12 * 0.9
+    assert cache.stats()[:2] == (1, 1)
+
+    apt.monthly_rate = 40000
+    assert (1, 12) not in cache
+    assert cache.quote(apt, 12) == 40000 * 12 * 0.9
+    apt.is_available = False  # на цену не влияет — запись остается
+    assert (1, 12) in cache
+    apt.area = 45
+    stats = cache.stats()
+    assert stats.invalidations == 2 and stats.size == 0
+    assert stats.hit_rate == pytest.approx(1 / 3)
+
+
+def test_lru_eviction_and_warm():
+    cache = PricingCache(maxsize=4)
+    portfolio = [
+        Apartment(1, "A", 40, 30000, 2),
+        House(2, "B", 120, 80000, True),
+        CommercialSpace(3, "C", 200, 150000, "Retail"),
+    ]
+    assert cache.warm(portfolio, horizons=(6, 12)) == 6
+    assert len(cache) == 4 and cache.stats().evictions == 2
+    assert (1, 6) not in cache and (3, 12) in cache
+    assert cache.stats().misses == 0
+    assert cache.quote(portfolio[2], 12) == 150000 * 12 * 1.2
+
+    # Вытесненный объект больше не получает кэш в наблюдатели
+    portfolio[0].monthly_rate = 1
+    assert cache.stats().invalidations == 0
+
+
+def test_price_computed_during_change_is_not_stored():
+    class RacyApartment(Apartment):
+        """Ставку меняют (как бы из другого потока), пока считается цена."""
+
+        def calculate_rental_cost(self, months):
+            cost = super().calculate_rental_cost(months)
+            if self.monthly_rate == 30000:
+                self.monthly_rate = 35000
+            return cost
+
+    cache = PricingCache()
+    apt = RacyApartment(1, "A", 40, 30000, 2)
+    cache.quote(apt, 12)
+    assert (1, 12) not in cache
+    assert cache.quote(apt, 12) == 35000 * 12 * 0.9
+    assert (1, 12) in cache
+
+
+def test_object_with_same_id_replaces_all_old_entries():
+    cache = PricingCache()
+    old = Apartment(1, "A", 40, 30000, 2)
+    new = Apartment(1, "A", 40, 50000, 2)
+    cache.quote(old, 6)
+    cache.quote(old, 12)
+    assert cache.quote(new, 12) == 50000 * 12 * 0.9
+    assert (1, 6) not in cache  # цена старого объекта не осталась без наблюдения
+    assert cache.quote(new, 6) == new.calculate_rental_cost(6)
+    new.monthly_rate = 60000
+    assert len(cache) == 0
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from rental_service.property_base import Apartment, House, CommercialSpace
 from rental_service.property_factory import PropertyFactory
@@ -46,3 +47,58 @@ def test_serialization_roundtrip():
     assert data["type"] == "Apartment"
     json_str = apt.to_json()
     assert "Казанская" in json_str
+
+
+def test_slots_layout_keeps_validation():
+    apt = Apartment(1, "ул. Ленина, 10", 45.0, 30000, 2)
+    assert not hasattr(apt, "__dict__")
+    with pytest.raises(AttributeError):
+        apt.unknown_field = 1
+    with pytest.raises(ValueError):
+        apt.area = -5
+    apt.monthly_rate = 32000
+    assert apt.to_dict()["monthly_rate"] == 32000
+
+
+def test_factory_create_many_keeps_order_and_collects_errors():
+    records = [
+        {"type": "Apartment", "property_id": 1, "address": "ул. Ленина, 1", "area": 40.0,
+         "monthly_rate": 30000, "number_of_rooms": 2},
+        {"type": "house", "property_id": 2, "address": "ул. Садовая, 5", "area": 120,
+         "monthly_rate": 50000, "has_garden": True, "is_available": False},
+        {"type": "house", "property_id": 3, "address": "", "area": 100, "monthly_rate": 1, "has_garden": False},
+        {"type": "apartment", "property_id": 4, "address": "ул. Мира, 2", "area": -1,
+         "monthly_rate": 1, "number_of_rooms": 1},
+        {"type": "commercialspace", "property_id": 5, "address": "пр. Бизнес, 1", "area": 10,
+         "monthly_rate": "много", "business_type": "retail"},
+        {"type": "castle", "property_id": 6},
+        {"type": "apartment", "property_id": 7, "address": "ул. Мира, 3", "area": 30, "monthly_rate": 1},
+        {"type": "commercialspace", "property_id": 8, "address": "пр. Бизнес, 2", "area": 10,
+         "monthly_rate": 0, "business_type": "office"},
+    ]
+    results = list(PropertyFactory.create_many(iter(records), chunk_size=3))
+    assert [r.row for r in results] == list(range(1, 9))
+    created = [r.property for r in results if r.error is None]
+    assert [p.property_id for p in created] == [1, 2, 8]
+    assert isinstance(created[1], House) and created[1].is_available is False
+    assert created[0].is_available is True  # значение по умолчанию
+    errors = {r.row: r.error for r in results if r.error}
+    assert errors[3] == "Адрес не может быть пустым"
+    assert errors[4] == "Площадь должна быть положительным числом"
+    assert errors[5].startswith("Ставка должна быть числом")
+    assert "castle" in errors[6]
+    assert errors[7] == "Нет поля: number_of_rooms"
+
+
+def test_factory_create_many_accepts_numpy_scalars_and_rejects_bool():
+    records = [
+        {"type": "apartment", "property_id": 1, "address": "ул. Ленина, 1", "area": np.float64(40.5),
+         "monthly_rate": np.int64(30000), "number_of_rooms": 2},
+        {"type": "apartment", "property_id": 2, "address": " ", "area": 30, "monthly_rate": 1, "number_of_rooms": 1},
+        {"type": "apartment", "property_id": 3, "address": "ул. Мира, 3", "area": True,
+         "monthly_rate": 1, "number_of_rooms": 1},
+    ]
+    results = list(PropertyFactory.create_many(records))
+    assert results[0].error is None and results[0].property.area == 40.5
+    assert results[1].error is None  # как сеттер: адрес из пробелов не пустой
+    assert results[2].error == "Площадь должна быть числом, получено True"
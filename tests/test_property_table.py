@@ -0,0 +1,43 @@
+import numpy as np
+from rental_service.property_base import Apartment, House, CommercialSpace
+from rental_service.property_table import PropertyTable
+
+
+def make_properties():
+    return [
+        Apartment(1, "ул. Ленина, 10", 45.0, 30000, 2),
+        Apartment(2, "ул. Мира, 3", 33.3, 27777.7, 1, is_available=False),
+        House(3, "ул. Садовая, 5", 120, 50000, True),
+        House(4, "ул. Полевая, 1", 90, 41234.56, False),
+        CommercialSpace(5, "ул. Бизнес-центр", 200, 100000, "Retail"),
+        CommercialSpace(6, "пр. Офисный, 7", 150, 80000.1, "office"),
+    ]
+
+
+def test_batch_cost_matches_per_object_methods():
+    properties = make_properties()
+    table = PropertyTable.from_properties(properties)
+    for months in (1, 11, 12, 36):
+        expected = [p.calculate_rental_cost(months) for p in properties]
+        assert table.calculate_rental_cost(months).tolist() == expected
+
+    per_row = np.array([12, 1, 6, 36, 3, 24])
+    expected = [p.calculate_rental_cost(int(m)) for p, m in zip(properties, per_row)]
+    assert table.calculate_rental_cost(per_row).tolist() == expected
+
+
+def test_quote_matrix_for_several_horizons():
+    properties = make_properties()
+    table = PropertyTable.from_properties(properties)
+    matrix = table.quote([6, 12, 36])
+    assert matrix.shape == (6, 3)
+    assert matrix[0].tolist() == [properties[0].calculate_rental_cost(m) for m in (6, 12, 36)]
+
+
+def test_roundtrip_to_properties():
+    properties = make_properties()
+    restored = PropertyTable.from_properties(properties).to_properties()
+    assert [p.to_dict() for p in restored] == [p.to_dict() for p in properties]
+    assert restored[0].number_of_rooms == 2
+    assert restored[2].has_garden is True
+    assert restored[4].business_type == "Retail"
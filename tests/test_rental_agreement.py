@@ -32,3 +32,25 @@ def test_rent_property_and_remove_extra():
     agreement.rent_property()
 
     assert apartment.is_available is False
+
+
+def test_extras_running_sum_and_memoized_base(monkeypatch):
+    tenant = Tenant(3, "Петр Петров", "petr@example.com", "+79990000000")
+    apartment = Apartment(3, "ул. Мира, 1", 60, 40000, 3)
+    agreement = RentalAgreement(3, tenant, apartment, date(2025, 1, 1), date(2026, 1, 1))
+    for i in range(1000):
+        agreement.add_extra(f"Услуга {i % 100}", 10.5)
+    agreement.remove_extra("Услуга 7")
+    assert len(agreement.extras) == 990
+    assert agreement.calculate_total(12) == apartment.calculate_rental_cost(12) + sum(p for _, p in agreement.extras)
+
+    calls = []
+    original = Apartment.calculate_rental_cost
+    monkeypatch.setattr(Apartment, "calculate_rental_cost", lambda self, m: calls.append(m) or original(self, m))
+    agreement.calculate_total(12)
+    agreement.calculate_total(12)
+    assert calls == []  # объект не менялся — база из кэша
+
+    apartment.monthly_rate = 50000
+    assert agreement.calculate_total(12) == 50000 * 12 * 0.9 + agreement.extras_total
+    assert calls == [12]
@@ -0,0 +1,48 @@
+from rental_service.property_base import Apartment, House
+from rental_service.client_base import Tenant
+from rental_service.repository import PropertyRepository, TenantRepository
+
+
+def test_lookup_and_delete_by_id():
+    repo = PropertyRepository()
+    apt = repo.add(Apartment(repo.next_id(), "ул. Ленина, 10", 50, 30000, 2))
+    house = repo.add(House(repo.next_id(), "ул. Садовая, 5", 120, 50000, True))
+
+    assert repo.get(apt.property_id) is apt
+    assert repo.remove(apt.property_id) is apt
+    assert repo.get(apt.property_id) is None
+    assert repo.remove(apt.property_id) is None
+    assert list(repo) == [house]
+
+
+def test_ids_are_not_reused_after_delete():
+    repo = PropertyRepository()
+    first = repo.add(Apartment(repo.next_id(), "A", 40, 30000, 1))
+    second = repo.add(Apartment(repo.next_id(), "B", 40, 30000, 1))
+    repo.remove(second.property_id)
+
+    third_id = repo.next_id()
+    assert third_id not in (first.property_id, second.property_id)
+
+
+def test_type_and_availability_indexes_follow_setters():
+    repo = PropertyRepository()
+    apt = repo.add(Apartment(1, "A", 40, 30000, 1))
+    repo.add(House(2, "B", 100, 50000, False))
+
+    assert repo.by_type("Apartment") == [apt]
+    assert len(repo.by_availability(True)) == 2
+
+    apt.is_available = False
+    assert repo.find("apartment", is_available=True) == []
+    assert repo.find("apartment", is_available=False) == [apt]
+
+    repo.remove(1)
+    apt.is_available = True
+    assert repo.by_availability(True)[0].property_id == 2
+
+
+def test_tenant_repository_reserves_external_ids():
+    repo = TenantRepository()
+    repo.add(Tenant(10, "Иван", "ivan@example.com", "+79990000000"))
+    assert repo.next_id() == 11
@@ -0,0 +1,66 @@
+import io
+import pytest
+from datetime import date
+from rental_service.client_base import Tenant
+from rental_service.exceptions import RentalNotFoundError
+from rental_service.property_base import Apartment, House, CommercialSpace, Property
+from rental_service.rental_agreement import RentalAgreement
+from rental_service.repository import PropertyRepository, TenantRepository, AgreementRepository
+from rental_service.serialization import dump_jsonl, load_jsonl, load_into
+
+
+def make_data():
+    properties = [
+        Apartment(1, "ул. Ленина, 10", 45.0, 30000, 2),
+        House(2, "ул. Садовая, 5", 120, 50000, True, is_available=False),
+        CommercialSpace(3, "ул. Бизнес-центр", 200, 100000, "retail"),
+    ]
+    tenant = Tenant(1, "Иван", "ivan@example.com", "+79991234567")
+    agreement = RentalAgreement(1, tenant, properties[1], date(2025, 1, 1), date(2026, 1, 1))
+    agreement.add_extra("Уборка", 2000)
+    agreement.calculate_total(12)
+    return properties, [tenant], [agreement]
+
+
+def test_from_dict_restores_subclass_fields():
+    house = House(2, "ул. Садовая, 5", 120, 50000, True, is_available=False)
+    restored = Property.from_dict(house.to_dict())
+    assert isinstance(restored, House)
+    assert restored.has_garden is True
+    assert restored.is_available is False
+
+
+def test_jsonl_roundtrip_resolves_references():
+    properties, tenants, agreements = make_data()
+    buffer = io.StringIO()
+    assert dump_jsonl(buffer, properties, tenants, agreements) == 5
+
+    buffer.seek(0)
+    loaded = list(load_jsonl(buffer))
+    assert [p.to_dict() for p in loaded[:3]] == [p.to_dict() for p in properties]
+    agreement = loaded[4]
+    assert agreement.property_ is loaded[1]
+    assert agreement.tenant is loaded[3]
+    assert agreement.to_dict() == agreements[0].to_dict()
+    assert agreement.start_date == date(2025, 1, 1)
+
+
+def test_load_into_repositories():
+    properties, tenants, agreements = make_data()
+    buffer = io.StringIO()
+    dump_jsonl(buffer, properties, tenants, agreements)
+    buffer.seek(0)
+
+    repos = PropertyRepository(), TenantRepository(), AgreementRepository()
+    assert load_into(buffer, *repos) == 5
+    assert repos[2].get(1).property_ is repos[0].get(2)
+    assert repos[0].by_type("house")[0].has_garden
+
+
+def test_agreement_with_unknown_reference_is_rejected():
+    _, _, agreements = make_data()
+    buffer = io.StringIO()
+    dump_jsonl(buffer, agreements=agreements)
+    buffer.seek(0)
+    with pytest.raises(RentalNotFoundError):
+        list(load_jsonl(buffer))
@@ -0,0 +1,155 @@
+import sqlite3
+import threading
+import pytest
+from datetime import date
+from console_app import RentalApp
+from rental_service.client_base import Tenant
+from rental_service.property_base import Apartment, House, CommercialSpace
+from rental_service.rental_agreement import RentalAgreement
+from rental_service.repository import PropertyRepository, TenantRepository, AgreementRepository
+from rental_service import storage as storage_module
+from rental_service.storage import SQLiteStorage
+
+
+def attached(path):
+    storage = SQLiteStorage(path, batch_size=2)
+    repos = PropertyRepository(), TenantRepository(), AgreementRepository()
+    storage.attach(*repos)
+    return storage, repos
+
+
+def test_repositories_persist_between_runs(tmp_path):
+    path = str(tmp_path / "rental.db")
+    storage, (properties, tenants, agreements) = attached(path)
+    apt = properties.add(Apartment(properties.next_id(), "ул. Ленина, 10", 45.0, 30000, 2))
+    properties.add(House(properties.next_id(), "ул. Садовая, 5", 120, 50000, True))
+    properties.add(CommercialSpace(properties.next_id(), "ул. Бизнес, 1", 200, 100000, "retail"))
+    tenant = tenants.add(Tenant(tenants.next_id(), "Иван", "ivan@example.com", "+79991234567"))
+    agreement = agreements.add(RentalAgreement(1, tenant, apt, date(2025, 1, 1), date(2026, 1, 1)))
+    agreement.add_extra("Уборка", 2000)
+    agreement.calculate_total(12)
+    apt.monthly_rate = 31000
+    properties.remove(2)
+    storage.close()
+
+    storage, (properties, tenants, agreements) = attached(path)
+    assert sorted(p.property_id for p in properties) == [1, 3]
+    assert properties.get(1).monthly_rate == 31000
+    assert properties.get(1).number_of_rooms == 2
+    assert properties.get(3).business_type == "retail"
+    restored = agreements.get(1)
+    assert restored.property_ is properties.get(1)
+    assert restored.extras == [("Уборка", 2000)]
+    assert restored.start_date == date(2025, 1, 1)
+    assert properties.next_id() == 4  # новые ID продолжаются после сохраненных
+    storage.close()
+
+
+def test_indexed_queries_and_pooled_readers(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "rental.db"), pool_size=2, batch_size=100)
+    storage.save_properties(
+        Apartment(i, f"ул. Ленина, {i}", 40, 10000 + i * 100, 1, is_available=i % 2 == 0) for i in range(1, 501)
+    )
+    found = storage.find_properties("apartment", is_available=True, min_rate=20000, max_rate=30000)
+    assert found and all(p.is_available and 20000 <= p.monthly_rate <= 30000 for p in found)
+
+    counts = []
+    threads = [threading.Thread(target=lambda: counts.append(storage.count("properties"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counts == [500] * 8
+    storage.close()
+
+
+def test_agreement_changes_after_flush_are_saved(tmp_path):
+    path = str(tmp_path / "rental.db")
+    app = RentalApp(SQLiteStorage(path))
+    prop = app.add_property("apartment", address="ул. Ленина, 10", area=45.0, monthly_rate=30000, number_of_rooms=2)
+    tenant = app.add_tenant("Иван", "ivan@example.com", "+79991234567")
+    agreement = app.add_agreement(prop.property_id, tenant.tenant_id, "2025-01-01", "2025-12-31")
+    app.checkpoint()
+    app.add_extra(agreement.agreement_id, "Уборка", 2000)
+    total = app.calculate_total(agreement.agreement_id, 12)
+    app.checkpoint()
+    with pytest.raises(ValueError):
+        app.remove_property(prop.property_id)  # по объекту есть договор
+    app.close()
+
+    restarted = RentalApp(SQLiteStorage(path))
+    restored = restarted.agreements.get(agreement.agreement_id)
+    assert restored.extras == [("Уборка", 2000)]
+    assert restored.total_cost == total
+    restarted.close()
+
+
+def test_orphan_agreement_is_skipped_on_load(tmp_path):
+    path = str(tmp_path / "rental.db")
+    storage, (properties, tenants, agreements) = attached(path)
+    apt = properties.add(Apartment(1, "ул. Ленина, 10", 45.0, 30000, 2))
+    tenant = tenants.add(Tenant(1, "Иван", "ivan@example.com", "+79991234567"))
+    agreements.add(RentalAgreement(1, tenant, apt, date(2025, 1, 1), date(2026, 1, 1)))
+    properties.remove(1)  # старая версия позволяла удалить объект с договором
+    storage.close()
+
+    storage, (properties, tenants, agreements) = attached(path)
+    assert agreements.get(1) is None
+    assert tenants.get(1) is not None
+    storage.close()
+
+
+def test_duplicate_contacts_from_old_database_are_loaded(tmp_path):
+    path = str(tmp_path / "rental.db")
+    storage = SQLiteStorage(path)
+    storage.save_tenants([
+        Tenant(1, "Иван", "ivan@example.com", "+79991234567"),
+        Tenant(2, "Иван (дубль)", "Ivan@Example.com", "+79990000000"),
+    ])
+    storage.close()
+
+    storage, (properties, tenants, agreements) = attached(path)
+    assert len(tenants) == 2
+    assert tenants.by_email("ivan@example.com").tenant_id == 1
+    assert tenants.by_phone("+79990000000").tenant_id == 2  # свободный контакт проиндексирован
+    tenants.remove(2)
+    assert tenants.by_email("ivan@example.com").tenant_id == 1
+    storage.close()
+
+
+def test_failed_flush_rolls_back_and_keeps_changes(tmp_path, monkeypatch):
+    storage, (properties, tenants, agreements) = attached(str(tmp_path / "rental.db"))
+    storage.batch_size = 100
+    properties.add(Apartment(1, "ул. Ленина, 10", 45.0, 30000, 2))
+    tenants.add(Tenant(1, "Иван", "ivan@example.com", "+79991234567"))
+
+    def broken(tenant):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(storage_module, "tenant_row", broken)
+    with pytest.raises(sqlite3.OperationalError):
+        storage.flush()
+    assert storage.count("properties") == 0  # объект из того же пакета не записан
+
+    monkeypatch.undo()
+    storage.flush()
+    assert storage.count("properties") == 1 and storage.count("tenants") == 1
+    storage.close()
+
+
+def test_in_memory_database_is_rejected():
+    with pytest.raises(ValueError):
+        SQLiteStorage(":memory:")
+
+
+def test_ids_of_deleted_objects_are_not_reused_after_reload(tmp_path):
+    path = str(tmp_path / "rental.db")
+    storage, (properties, tenants, agreements) = attached(path)
+    for pid in (1, 2, 3):
+        properties.add(Apartment(properties.next_id(), f"ул. Ленина, {pid}", 45.0, 30000, 2))
+    properties.remove(3)
+    storage.close()
+
+    storage, (properties, tenants, agreements) = attached(path)
+    assert properties.next_id() == 4
+    storage.close()
@@ -0,0 +1,50 @@
+import pytest
+from rental_service.client_base import Tenant, normalize_email, normalize_phone
+from rental_service.repository import TenantRepository
+
+
+def test_normalization():
+    assert normalize_email("  Ivan@Example.COM ") == "ivan@example.com"
+    assert normalize_email("not-an-email") is None
+    assert normalize_phone("8 (999) 123-45-67") == "79991234567"
+    assert normalize_phone("+7 999 123 45 67") == "79991234567"
+    assert normalize_phone("9991234567") == "79991234567"
+    assert normalize_phone("12-34") is None
+
+
+def test_lookup_and_duplicate_check():
+    tenants = TenantRepository()
+    ivan = tenants.add(Tenant(1, "Иван", "Ivan@example.com", "+7 999 123-45-67"))
+    assert tenants.by_email("ivan@EXAMPLE.com") is ivan
+    assert tenants.by_phone("89991234567") is ivan
+    assert tenants.find(phone="9991234567") is ivan
+    with pytest.raises(ValueError):
+        tenants.add(Tenant(2, "Двойник", "IVAN@example.com", ""))
+    assert 2 not in tenants
+
+    tenants.remove(1)
+    assert tenants.by_email("ivan@example.com") is None
+    tenants.add(Tenant(2, "Иван", "ivan@example.com", ""))
+
+
+def test_import_inserts_merges_and_rejects():
+    tenants = TenantRepository()
+    tenants.add(Tenant(1, "Мария", "maria@example.com", ""))
+    tenants.add(Tenant(2, "Петр", "", "+79990000000"))
+    records = [
+        {"name": "Иван", "email": "ivan@example.com", "phone": "8 999 111-22-33"},
+        {"name": "Иван И.", "email": " IVAN@example.com", "phone": ""},        # дубль по email
+        {"name": "", "email": "", "phone": "+7 (999) 111-22-33"},            # дубль по телефону
+        {"name": "Мария", "email": "maria@example.com", "phone": "89995556677"},  # дополняет телефон
+        {"name": "Кто-то", "email": "maria@example.com", "phone": "+79990000000"},  # разные арендаторы
+        {"name": "Без контактов", "email": "нет", "phone": "123"},
+    ]
+    report = tenants.import_tenants(iter(records))
+    assert report[:3] == (1, 3, 2)
+    assert len(report.errors) == 2 and report.errors[0].startswith("Запись 5")
+
+    ivan = tenants.by_phone("79991112233")
+    assert ivan is tenants.by_email("ivan@example.com") and ivan.tenant_id == 3
+    assert tenants.by_phone("+7 999 555-66-77") is tenants[1]
+    assert tenants[1].phone == "79995556677"
+    assert len(tenants) == 3